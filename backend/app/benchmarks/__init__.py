@@ -0,0 +1,35 @@
+"""
+Benchmarks and checks, one module each. Run them from backend/ with the
+same environment as the API (`python -m app.benchmarks` prints this list).
+
+Need MongoDB (MONGODB_URI / MONGODB_DB; use a disposable database):
+
+    python -m app.benchmarks.query_plans
+        Explains the student notice feeds and /slots/available; fails on a
+        COLLSCAN or in-memory SORT. Builds the declared indexes first.
+
+    python -m app.benchmarks.booking_load_test [--bookings 1000] [--seats 10]
+        Concurrent bookings against one slot; fails on any overbooking.
+
+    python -m app.benchmarks.available_slots_benchmark [--slots 10000] [--runs 5]
+        Mongo commands and latency of /slots/available before and after the
+        aggregation rewrite; fails if the two list different slots.
+
+    python -m app.benchmarks.notice_search_benchmark [--notices 100000] [--max-p95-ms 50]
+        Seeds synthetic notices and times ranked search; fails above the p95 budget.
+
+No database needed:
+
+    python -m app.benchmarks.import_benchmark [--runs 5] [--max-seconds 3]
+        Cold import time of app.main; fails if an AI/ML library loads at import.
+
+    python -m app.benchmarks.extractive_benchmark [FOLDER]
+        Tokens the extractive pre-filter sends to the LLM per summary type.
+
+    python -m app.benchmarks.pptx_benchmark [FOLDER] [--runs 3]
+        Throughput and peak memory of python-pptx vs unstructured extraction.
+
+query_plans, booking_load_test, available_slots_benchmark,
+notice_search_benchmark and import_benchmark exit non-zero when their
+check fails, so they can gate CI; the others only report.
+"""
@@ -0,0 +1,4 @@
+import app.benchmarks
+
+if __name__ == "__main__":
+    print(app.benchmarks.__doc__)
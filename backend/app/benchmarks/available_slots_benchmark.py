@@ -0,0 +1,155 @@
+"""
+Before/after benchmark for /slots/available.
+
+Run against a disposable database:
+
+    python -m app.benchmarks.available_slots_benchmark [--slots 10000] [--faculty 200] [--runs 5]
+
+Seeds `--slots` slots (half in the past, a fifth of the rest full, a few
+owned by deleted faculty accounts) and compares:
+
+    before  the original endpoint: load every slot, filter by time and
+            capacity in Python, one users.find_one per available slot
+    page    SlotRepo.get_available_page for the first page (what the
+            endpoint now serves per request)
+    all     every page, following next_cursor to the end
+
+Reports Mongo commands sent (find/aggregate/getMore, counted with a
+pymongo CommandListener) and median latency for each. The seeded slots and
+users are deleted afterwards.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from bson import ObjectId
+from pymongo import monitoring
+
+from app.repositories.slot_repo import SlotRepo
+from app.utils.pagination import PageParams
+
+COUNTED_COMMANDS = {"find", "aggregate", "getMore"}
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name in COUNTED_COMMANDS:
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def seed(db, slots: int, faculty: int, run_id: str):
+    now = datetime.utcnow()
+    faculty_ids = [ObjectId() for _ in range(faculty)]
+    await db["users"].insert_many([
+        {"_id": fid, "email": f"faculty{i}.{run_id}@example.com", "full_name": f"Faculty {i}", "role": "faculty",
+         "benchmark": run_id}
+        for i, fid in enumerate(faculty_ids)
+    ])
+    docs = []
+    for i in range(slots):
+        start = now + timedelta(hours=i - slots // 2)
+        max_students = 5
+        docs.append({
+            # Every 50th slot belongs to an account that no longer exists
+            "faculty_id": ObjectId() if i % 50 == 0 else faculty_ids[i % faculty],
+            "title": f"Slot {i}",
+            "location": "Room 1",
+            "start_time": start,
+            "end_time": start + timedelta(minutes=30),
+            "max_students": max_students,
+            "booked_count": max_students if i % 5 == 0 else i % max_students,
+            "benchmark": run_id,
+        })
+    await db["faculty_slots"].insert_many(docs, ordered=False)
+
+
+async def legacy_available(db) -> List[dict]:
+    """The endpoint before the aggregation rewrite, kept here for comparison."""
+    now = datetime.utcnow()
+    available = []
+    for s in await db["faculty_slots"].find().to_list(length=None):
+        booked_count = s.get("booked_count", len(s.get("booked_by", [])))
+        if booked_count >= s.get("max_students", 0) or s["start_time"] <= now:
+            continue
+        faculty_doc = await db["users"].find_one({"_id": s["faculty_id"]})
+        if not faculty_doc:
+            continue
+        available.append({
+            "id": str(s["_id"]),
+            "faculty": {"id": str(faculty_doc["_id"]), "full_name": faculty_doc.get("full_name")},
+        })
+    return available
+
+
+async def all_pages(repo: SlotRepo) -> List[dict]:
+    items, cursor = [], None
+    while True:
+        page = await repo.get_available_page(PageParams(limit=100, cursor=cursor))
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return items
+
+
+async def measure(name: str, counter: CommandCounter, runs: int, fn) -> dict:
+    times, commands, size = [], 0, 0
+    for _ in range(runs):
+        before = counter.count
+        started = time.perf_counter()
+        result = await fn()
+        times.append((time.perf_counter() - started) * 1000)
+        commands = counter.count - before
+        size = len(result["items"]) if isinstance(result, dict) else len(result)
+    print(f"{name:>6}: {size:>5} slots, {commands:>5} Mongo commands, median {statistics.median(times):8.1f} ms")
+    return {"commands": commands, "ms": statistics.median(times), "slots": size}
+
+
+async def _main() -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from app.core.config import settings
+    from app.db.init_indexes import ensure_indexes
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slots", type=int, default=10_000)
+    parser.add_argument("--faculty", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(settings.MONGODB_URI, event_listeners=[counter])
+    db = client[settings.MONGODB_DB]
+    run_id = str(ObjectId())
+    await ensure_indexes(db)
+    try:
+        await seed(db, args.slots, args.faculty, run_id)
+        repo = SlotRepo(db)
+        before = await measure("before", counter, args.runs, lambda: legacy_available(db))
+        await measure("page", counter, args.runs, lambda: repo.get_available_page(PageParams(limit=20, cursor=None)))
+        after = await measure("all", counter, args.runs, lambda: all_pages(repo))
+    finally:
+        await db["faculty_slots"].delete_many({"benchmark": run_id})
+        await db["users"].delete_many({"benchmark": run_id})
+        client.close()
+    if before["slots"] != after["slots"]:
+        print(f"available slots benchmark FAILED: before listed {before['slots']}, after {after['slots']}")
+        return 1
+    print("available slots benchmark OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
@@ -0,0 +1,65 @@
+"""
+Concurrency check for slot booking.
+
+Run against a disposable database:
+
+    python -m app.benchmarks.booking_load_test [--bookings 1000] [--seats 10]
+
+Creates one slot, fires every booking concurrently from distinct students and
+exits non-zero unless exactly `seats` of them succeed and both the stored
+bookings and the slot's seat counter agree. The slot and its bookings are
+deleted afterwards.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.repositories.slot_repo import BookingOutcome
+from app.services.slot_services import build_slot_service
+
+
+async def run_booking_load_test(db, bookings: int, seats: int) -> Counter:
+    """Returns how many bookings ended with each BookingOutcome."""
+    service = build_slot_service(db)
+    repo = service.repo
+    start = datetime.utcnow() + timedelta(days=1)
+    slot = await repo.create_slot(
+        str(ObjectId()),
+        {"title": "booking load test", "start_time": start, "end_time": start + timedelta(hours=1), "max_students": seats},
+    )
+    try:
+        results = await asyncio.gather(*(service.try_book(slot["id"], str(ObjectId())) for _ in range(bookings)))
+        outcomes = Counter(results)
+        stored = await repo.get_slot_by_id(slot["id"])
+        outcomes["stored_bookings"] = await service.bookings.collection.count_documents({"slot_id": ObjectId(slot["id"])})
+        outcomes["seat_counter"] = stored["booked_count"]
+        return outcomes
+    finally:
+        await repo.collection.delete_one({"_id": ObjectId(slot["id"])})
+        await service.bookings.delete_for_slot(slot["id"])
+
+
+async def _main() -> int:
+    from app.db.session import get_db
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=1000)
+    parser.add_argument("--seats", type=int, default=10)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    outcomes = await run_booking_load_test(get_db(), args.bookings, args.seats)
+    elapsed = time.perf_counter() - started
+    print(f"{args.bookings} bookings in {elapsed:.2f}s: {dict(outcomes)}")
+    ok = all(outcomes[key] == args.seats for key in (BookingOutcome.BOOKED, "stored_bookings", "seat_counter"))
+    print("booking load test OK" if ok else "booking load test FAILED: slot was overbooked or underbooked")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
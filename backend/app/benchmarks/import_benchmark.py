@@ -0,0 +1,66 @@
+"""
+Cold-start check for the API.
+
+    python -m app.benchmarks.import_benchmark [--runs 5] [--max-seconds 3]
+
+Imports app.main in fresh interpreters and exits non-zero if the slowest
+import exceeds --max-seconds or if any AI/ML library (torch, transformers,
+langchain, ...) was imported along the way. Models must load lazily, on
+first use or in the MODEL_WARMUP task, never at import.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# Libraries that mean a model (or its framework) is being loaded at import
+HEAVY_MODULES = [
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "faiss",
+    "langchain_huggingface",
+    "langchain_groq",
+    "langchain_community",
+    "langchain_core",
+]
+
+_PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import() -> dict:
+    """Import app.main in a new interpreter; returns {"seconds": float, "heavy": [module, ...]}."""
+    out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    results = [measure_import() for _ in range(args.runs)]
+    times = sorted(r["seconds"] for r in results)
+    heavy = sorted({m for r in results for m in r["heavy"]})
+    print(f"import app.main over {args.runs} runs: min {times[0]:.2f}s, median {times[len(times) // 2]:.2f}s, max {times[-1]:.2f}s")
+    ok = True
+    if times[-1] > args.max_seconds:
+        print(f"import benchmark FAILED: slowest import took more than {args.max_seconds:.2f}s")
+        ok = False
+    if heavy:
+        print(f"import benchmark FAILED: imported at startup: {', '.join(heavy)}")
+        ok = False
+    if ok:
+        print("import benchmark OK")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
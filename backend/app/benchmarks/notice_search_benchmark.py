@@ -0,0 +1,117 @@
+"""
+Latency benchmark for notice search.
+
+Run against a disposable database:
+
+    python -m app.benchmarks.notice_search_benchmark [--notices 100000] [--queries 500] [--max-p95-ms 50]
+
+Seeds `--notices` synthetic notices (Zipf-distributed vocabulary, every
+category, a mix of all-year and targeted notices), builds the declared
+indexes, then times NoticeRepository.search_page for random one- and
+two-word queries: a third unfiltered, a third by category, a third by
+year, and every fifth one fetching the second page through its cursor.
+Exits non-zero if the p95 exceeds --max-p95-ms. The seeded notices are
+deleted afterwards.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from bson import ObjectId
+
+from app.repositories.notice_repo import ALL_YEARS, NoticeRepository
+from app.schemas.notice import NoticeCategory
+from app.utils.pagination import PageParams
+
+VOCABULARY_SIZE = 5000
+INSERT_BATCH = 5000
+
+
+def _words(rng: random.Random, vocabulary: List[str], weights: List[float], count: int) -> str:
+    return " ".join(rng.choices(vocabulary, weights, k=count))
+
+
+async def seed_notices(repo: NoticeRepository, count: int, faculty_id: ObjectId, rng: random.Random) -> List[str]:
+    """Insert `count` notices owned by `faculty_id`; returns the vocabulary."""
+    vocabulary = [f"term{i}" for i in range(VOCABULARY_SIZE)]
+    # Zipf-like: a few words are everywhere, most are rare, as in real notices
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+    categories = [c.value for c in NoticeCategory]
+    now = datetime.utcnow()
+    for start in range(0, count, INSERT_BATCH):
+        docs = []
+        for i in range(start, min(start + INSERT_BATCH, count)):
+            years = sorted(rng.sample(range(1, 5), rng.randint(1, 2))) if rng.random() < 0.4 else [ALL_YEARS]
+            docs.append({
+                "faculty_id": faculty_id,
+                "title": _words(rng, vocabulary, weights, rng.randint(4, 10)),
+                "content": _words(rng, vocabulary, weights, rng.randint(40, 200)),
+                "category": rng.choice(categories),
+                "target_years": years,
+                "created_at": now - timedelta(minutes=i),
+            })
+        await repo.collection.insert_many(docs, ordered=False)
+    return vocabulary
+
+
+async def run_search_benchmark(db, notices: int, queries: int, seed: int = 0) -> List[float]:
+    """Returns per-query latencies in milliseconds."""
+    from app.db.init_indexes import ensure_indexes
+
+    rng = random.Random(seed)
+    repo = NoticeRepository(db)
+    faculty_id = ObjectId()
+    await ensure_indexes(db)
+    try:
+        started = time.perf_counter()
+        vocabulary = await seed_notices(repo, notices, faculty_id, rng)
+        print(f"Seeded {notices} notices in {time.perf_counter() - started:.1f}s")
+
+        categories = [c.value for c in NoticeCategory]
+        latencies = []
+        for n in range(queries):
+            # Mostly mid-frequency words: the common ones match nearly everything
+            text = " ".join(rng.choice(vocabulary[20:2000]) for _ in range(rng.randint(1, 2)))
+            category = rng.choice(categories) if n % 3 == 1 else None
+            year = rng.randint(1, 4) if n % 3 == 2 else None
+            params = PageParams(limit=20, cursor=None)
+            started = time.perf_counter()
+            page = await repo.search_page(text, params, category=category, year=year)
+            if n % 5 == 0 and page["next_cursor"]:
+                await repo.search_page(
+                    text, PageParams(limit=20, cursor=page["next_cursor"]), category=category, year=year
+                )
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies
+    finally:
+        await repo.collection.delete_many({"faculty_id": faculty_id})
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _main() -> int:
+    from app.db.session import get_db
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notices", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--max-p95-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    latencies = await run_search_benchmark(get_db(), args.notices, args.queries)
+    p50, p95 = percentile(latencies, 0.50), percentile(latencies, 0.95)
+    print(f"{args.queries} searches: p50 {p50:.1f} ms, p95 {p95:.1f} ms, max {max(latencies):.1f} ms")
+    ok = p95 <= args.max_p95_ms
+    print("notice search benchmark OK" if ok else f"notice search benchmark FAILED: p95 above {args.max_p95_ms:.0f} ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
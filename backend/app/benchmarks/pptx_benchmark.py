@@ -0,0 +1,94 @@
+"""
+Benchmark for slide deck extraction.
+
+    python -m app.benchmarks.pptx_benchmark [FOLDER] [--runs 3]
+
+Extracts every .pptx in FOLDER (default: uploads/resources) with the
+python-pptx extractor and with the unstructured loader it replaced, each
+run in a fresh interpreter so that import cost and peak memory belong to
+that extractor alone. Every run extracts the folder twice: the first pass
+includes loading the extractor's libraries (cold), throughput (decks and
+slides per second) comes from the second. Peak RSS covers both passes.
+Legacy .ppt files are listed but not timed; only unstructured can read them.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+EXTRACTORS = {
+    "python-pptx": "extract_pptx_slides",
+    "unstructured": "extract_ppt_unstructured",
+}
+
+_PROBE = """
+import json, resource, sys, time
+name, paths = sys.argv[1], json.loads(sys.argv[2])
+import app.utils.document_text as document_text
+extract = getattr(document_text, name)
+started = time.perf_counter()
+for path in paths:
+    extract(path)
+warm = time.perf_counter()
+slides = chars = 0
+for path in paths:
+    texts = extract(path)
+    slides += len(texts)
+    chars += sum(len(t) for t in texts)
+finished = time.perf_counter()
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is in KiB on Linux and in bytes on macOS
+peak_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+print(json.dumps({"cold_seconds": warm - started, "seconds": finished - warm,
+                  "slides": slides, "chars": chars, "peak_rss_mb": peak_mb}))
+"""
+
+
+def measure(function: str, paths: list) -> dict:
+    """Run one extractor over all paths in a new interpreter; raises RuntimeError if it cannot run."""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, function, json.dumps(paths)], capture_output=True, text=True
+    )
+    if out.returncode != 0:
+        lines = out.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"exit status {out.returncode}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", nargs="?", default="uploads/resources")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--extractors", nargs="+", default=list(EXTRACTORS), choices=list(EXTRACTORS))
+    args = parser.parse_args()
+
+    names = sorted(os.listdir(args.folder))
+    paths = [os.path.join(args.folder, n) for n in names if n.lower().endswith(".pptx")]
+    legacy = [n for n in names if n.lower().endswith(".ppt")]
+    if legacy:
+        print(f"Skipping {len(legacy)} legacy .ppt deck(s); they always go through unstructured")
+    if not paths:
+        print(f"No .pptx decks in {args.folder}")
+        return 1
+    size_mb = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+    print(f"{len(paths)} deck(s), {size_mb:.1f} MB, best of {args.runs} run(s)")
+
+    for name in args.extractors:
+        try:
+            # Fastest run: the others mostly measure the machine's noise
+            result = min((measure(EXTRACTORS[name], paths) for _ in range(args.runs)), key=lambda r: r["seconds"])
+        except RuntimeError as e:
+            print(f"{name:>12}: unavailable ({e})")
+            continue
+        seconds = max(result["seconds"], 1e-9)
+        print(
+            f"{name:>12}: {len(paths) / seconds:.1f} decks/s, {result['slides'] / seconds:.0f} slides/s "
+            f"({result['slides']} slides, {result['chars']} chars in {seconds:.2f}s), "
+            f"cold pass {result['cold_seconds']:.2f}s, peak RSS {result['peak_rss_mb']:.0f} MB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
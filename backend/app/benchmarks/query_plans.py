@@ -0,0 +1,125 @@
+"""
+Explain-plan checks for hot queries.
+
+Run against a database with indexes built:
+
+    python -m app.benchmarks.query_plans
+
+Exits non-zero if any notice feed variant or the /slots/available pipeline
+is not served by an index scan or needs an in-memory SORT stage. Each is
+checked for its first page and for a later page, whose keyset $or on
+(created_at / start_time, _id) is the likelier one to lose the index.
+"""
+import asyncio
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+
+from app.repositories.notice_repo import NOTICE_PROJECTION, NoticeRepository
+from app.repositories.slot_repo import SlotRepo
+from app.schemas.notice import NoticeCategory
+from app.utils.pagination import PageParams, encode_cursor, keyset_query
+
+FORBIDDEN_STAGES = {"COLLSCAN", "SORT"}
+
+
+def plan_stages(plan: dict) -> List[str]:
+    """Flatten the stage names of an explain() winning plan (classic and SBE formats)."""
+    if "queryPlan" in plan:
+        plan = plan["queryPlan"]
+    stages = [plan.get("stage")] if plan.get("stage") else []
+    if "inputStage" in plan:
+        stages += plan_stages(plan["inputStage"])
+    for child in plan.get("inputStages", []):
+        stages += plan_stages(child)
+    return stages
+
+
+def query_planner(explain: dict) -> dict:
+    """queryPlanner section of a find() or aggregate explain (the latter nests it in $cursor)."""
+    if "queryPlanner" in explain:
+        return explain["queryPlanner"]
+    for stage in explain.get("stages", []):
+        if "$cursor" in stage:
+            return stage["$cursor"]["queryPlanner"]
+    raise ValueError("explain output has no queryPlanner")
+
+
+def plan_problems(explain: dict) -> List[str]:
+    stages = plan_stages(query_planner(explain)["winningPlan"])
+    problems = [f"uses {stage}" for stage in stages if stage in FORBIDDEN_STAGES]
+    if "IXSCAN" not in stages:
+        problems.append("no IXSCAN")
+    return problems
+
+
+def page_two_cursor(page: dict) -> str:
+    """The first page's next_cursor, or a made-up one when the collection is too small to have one."""
+    return page["next_cursor"] or encode_cursor(datetime.utcnow(), ObjectId())
+
+
+async def explain_notice_page(repo: NoticeRepository, query: dict, cursor: Optional[str]) -> dict:
+    """Explain the find() paginate() runs for one page of `query`, newest first."""
+    return await (
+        repo.collection.find(keyset_query(query, "created_at", -1, cursor), NOTICE_PROJECTION)
+        .sort([("created_at", -1), ("_id", -1)])
+        .limit(21)
+        .explain()
+    )
+
+
+async def check_notice_feed_plans(db, years=range(1, 5)) -> Dict[str, List[str]]:
+    """Explain every notice feed variant, page 1 and 2; returns {variant: problems} for the failing ones."""
+    repo = NoticeRepository(db)
+    params = PageParams(limit=20, cursor=None)
+    variants = []
+    # /notices/all?category=
+    for category in [c.value for c in NoticeCategory]:
+        page = await repo.list_page(params, category=category)
+        variants.append((f"all category={category}", {"category": category}, page_two_cursor(page)))
+    # /notices/student-feed
+    for year in years:
+        for category in [None] + [c.value for c in NoticeCategory]:
+            page = await repo.feed_page(year, params, category)
+            variants.append((f"year={year} category={category}", repo.feed_query(year, category), page_two_cursor(page)))
+
+    failures = {}
+    for variant, query, cursor in variants:
+        for label, page_cursor in (("page 1", None), ("page 2", cursor)):
+            problems = plan_problems(await explain_notice_page(repo, query, page_cursor))
+            if problems:
+                failures[f"{variant} {label}"] = problems
+    return failures
+
+
+async def check_available_slots_plan(db) -> Dict[str, List[str]]:
+    """Explain the /slots/available aggregation, page 1 and 2; returns {page: problems} for the failing ones."""
+    first = await SlotRepo(db).get_available_page(PageParams(limit=20, cursor=None))
+    failures = {}
+    for label, cursor in (("page 1", None), ("page 2", page_two_cursor(first))):
+        pipeline = SlotRepo.available_pipeline(PageParams(limit=20, cursor=cursor), datetime.utcnow())
+        explain = await db.command({"aggregate": "faculty_slots", "pipeline": pipeline, "explain": True})
+        problems = plan_problems(explain)
+        if problems:
+            failures[f"slots available {label}"] = problems
+    return failures
+
+
+async def _main() -> int:
+    from app.db.init_indexes import ensure_indexes
+    from app.db.session import get_db
+
+    db = get_db()
+    await ensure_indexes(db)
+    failures = await check_notice_feed_plans(db)
+    failures.update(await check_available_slots_plan(db))
+    for variant, problems in failures.items():
+        print(f"FAIL {variant}: {', '.join(problems)}")
+    print("query plans OK" if not failures else f"{len(failures)} query plan(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
@@ -14,6 +14,88 @@ class Settings(BaseSettings):
     # SMTP settings for email
     SMTP_EMAIL: str
     SMTP_PASSWORD: str
+    SMTP_HOST: str = "smtp.gmail.com"
+    SMTP_PORT: int = 465
+    SMTP_USE_TLS: bool = True  # implicit TLS (port 465); disable for a local SMTP sink
+    SMTP_START_TLS: bool = False  # set with SMTP_USE_TLS=false for port 587
+    SMTP_TIMEOUT_SECONDS: float = 10
+    SMTP_POOL_SIZE: int = 2
+
+    # Email outbox delivery
+    EMAIL_RATE_LIMIT_PER_SECOND: float = 5
+    EMAIL_DISPATCH_BATCH_SIZE: int = 20
+    EMAIL_POLL_INTERVAL_SECONDS: float = 5
+    EMAIL_MAX_ATTEMPTS: int = 6
+    EMAIL_RETRY_BASE_SECONDS: float = 30
+    EMAIL_RETRY_MAX_SECONDS: float = 3600
+    EMAIL_SEND_LEASE_SECONDS: int = 120
+
+    # Notice notifications
+    NOTICE_EMAIL_BATCH_SIZE: int = 50  # Bcc recipients per outbox message
+    NOTICE_DIGEST_HOUR_UTC: int = 2
+
+    # Keyset pagination for list endpoints
+    PAGE_SIZE_DEFAULT: int = 20
+    PAGE_SIZE_MAX: int = 100
+
+    # Notice feed ETag / response cache
+    NOTICE_FEED_CACHE_ENTRIES: int = 512
+    NOTICE_WATERMARK_REFRESH_SECONDS: float = 2
+
+    # Notice push events (SSE)
+    # "mongo" broadcasts across workers via a capped collection; "memory" is single-process
+    NOTICE_EVENTS_BROADCAST: str = "mongo"
+    NOTICE_EVENTS_BUFFER: int = 1000
+    NOTICE_EVENTS_QUEUE_SIZE: int = 100
+    NOTICE_EVENTS_KEEPALIVE_SECONDS: float = 15
+    NOTICE_EVENTS_RETRY_MS: int = 3000
+
+    # Recurring slot creation
+    SLOT_RECURRENCE_MAX_INSTANCES: int = 200
+
+    # Waitlist promotion: a crashed worker's claim on a waiter expires after this
+    SLOT_WAITLIST_CLAIM_SECONDS: int = 60
+
+    # iCalendar (.ics) slot feeds
+    CALENDAR_TOKEN_EXPIRE_DAYS: int = 365  # feed URLs embed a long-lived, calendar-only token
+    CALENDAR_FEED_PAST_DAYS: int = 30  # how far back a student's bookings feed reaches
+    CALENDAR_FEED_CACHE_ENTRIES: int = 1024
+    CALENDAR_WATERMARK_REFRESH_SECONDS: float = 5
+
+    # AI models per use case (see app/utils/model_registry.py); use cases
+    # configured with the same model (and temperature) share one instance
+    MODEL_WARMUP: bool = False  # load models in the background at startup instead of on first use
+    CHATBOT_EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"  # must match vector_db
+    CHATBOT_LLM_MODEL: str = "openai/gpt-oss-20b"
+    CHATBOT_LLM_TEMPERATURE: float = 0.2
+    GRADING_LLM_MODEL: str = "openai/gpt-oss-20b"
+    GRADING_LLM_TEMPERATURE: float = 0.2
+
+    # Document summarization (changing the model or SUMMARY_PROMPT_VERSION invalidates stored summaries)
+    SUMMARY_LLM_MODEL: str = "llama-3.3-70b-versatile"
+    SUMMARY_LLM_TEMPERATURE: float = 0
+    SUMMARY_PROMPT_VERSION: int = 3  # bump when prompts or the pipeline change
+    # Extractive pre-filter: LLM input budget (estimated tokens) per summary type
+    SUMMARY_INPUT_TOKENS_SHORT: int = 3000
+    SUMMARY_INPUT_TOKENS_MEDIUM: int = 6000
+    SUMMARY_INPUT_TOKENS_LONG: int = 12000
+    SUMMARY_MAP_GROUP_CHARS: int = 12000  # text per map-reduce LLM call (~3k tokens)
+    SUMMARY_LLM_CONCURRENCY: int = 4  # concurrent LLM calls per summary
+    SUMMARY_PROCESS_WORKERS: int = 0  # 0 = one process per CPU core
+    SUMMARY_JOB_MAX_QUEUE: int = 32  # unfinished jobs per API worker before 429
+    SUMMARY_JOB_TIMEOUT_SECONDS: int = 900
+    SUMMARY_JOB_POLL_SECONDS: float = 1
+    PDF_EXTRACT_BATCH_PAGES: int = 8  # PDF pages per parallel extraction task
+
+    # Hot/cold archival (archive collections are read only on request)
+    ARCHIVE_NOTICES_AFTER_DAYS: int = 365
+    ARCHIVE_SLOTS_AFTER_HOURS: int = 24  # grace period after a slot's end_time
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_INTERVAL_HOURS: float = 6
+
+    # Data migrations
+    MIGRATION_BATCH_SIZE: int = 500
+    MIGRATION_LOCK_TIMEOUT_SECONDS: int = 300
 
     # AI/LLM settings for resource summarization
     GROQ_API_KEY: str = ""
@@ -1,21 +1,68 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 
 from bson import ObjectId
 
 from app.db.session import get_db
 from app.repositories.user_repo import UserRepository
-from app.core.security import decode_access_token
+from app.core.security import CALENDAR_TOKEN_SCOPE, decode_access_token
 from app.schemas.user import UserInDB
 from app.constants.roles import UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 
 def get_user_repo(db=Depends(get_db)) -> UserRepository:
     return UserRepository(db)
 
 
+def _decode_token_or_401(token: Optional[str]) -> dict:
+    try:
+        payload = decode_access_token(token) if token else None
+    except Exception:
+        payload = None
+    # Calendar tokens sit in feed URLs, so they must not work as API credentials
+    if not payload or payload.get("sub") is None or payload.get("scope") == CALENDAR_TOKEN_SCOPE:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    """
+    Validate the bearer token without loading the user from Mongo.
+    For hot read-only endpoints; use get_current_user when the account must exist.
+    """
+    return _decode_token_or_401(token)
+
+
+def get_stream_token_payload(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None, description="Bearer token, for clients that cannot set headers (EventSource)"),
+) -> dict:
+    """Like get_token_payload, but also accepts the token as a query parameter."""
+    return _decode_token_or_401(token or access_token)
+
+
+def get_calendar_token_payload(
+    token: str = Query(..., description="Calendar token from /slots/calendar/links"),
+) -> dict:
+    """Validate a calendar-scoped token passed in the feed URL."""
+    try:
+        payload = decode_access_token(token)
+    except Exception:
+        payload = None
+    if not payload or payload.get("sub") is None or payload.get("scope") != CALENDAR_TOKEN_SCOPE:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid calendar token")
+    return payload
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     user_repo: UserRepository = Depends(get_user_repo),
@@ -29,7 +76,7 @@ async def get_current_user(
         payload = decode_access_token(token)
         user_id: str = payload.get("sub")
         role: str = payload.get("role")
-        if user_id is None:
+        if user_id is None or payload.get("scope") == CALENDAR_TOKEN_SCOPE:
             raise credentials_exception
     except Exception:
         raise credentials_exception
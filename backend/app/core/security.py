@@ -59,6 +59,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+# Tokens with this scope only authorize calendar feeds; they are refused as bearer tokens
+CALENDAR_TOKEN_SCOPE = "calendar"
+
+
+def create_calendar_token(user_id: str, role: str) -> str:
+    """Long-lived token for .ics subscription URLs, which calendar apps poll without headers."""
+    return create_access_token(
+        {"sub": user_id, "role": role, "scope": CALENDAR_TOKEN_SCOPE},
+        expires_delta=timedelta(days=settings.CALENDAR_TOKEN_EXPIRE_DAYS),
+    )
+
+
 def decode_access_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -0,0 +1,47 @@
+"""
+Hot/cold tiering helpers.
+
+Old documents are moved from a hot collection into an `<name>_archive`
+collection so the indexes and working set of the hot one stay small. A move
+copies a batch into the archive (upsert by _id) before deleting it from the
+hot collection, so an interrupted run leaves at worst a duplicate that the
+next run cleans up, never a lost document. Documents that stopped matching
+between the read and the delete stay hot and their archive copies are
+removed again, so readers merging both tiers never see one twice.
+"""
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+
+from pymongo import ReplaceOne
+
+
+async def move_to_archive(
+    source,
+    archive,
+    query: dict,
+    batch_size: int,
+    on_batch: Optional[Callable[[List[dict]], Awaitable[None]]] = None,
+) -> int:
+    """Move every document matching `query` from `source` to `archive`. Returns the number moved."""
+    moved = 0
+    while True:
+        docs = await source.find(query).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not docs:
+            return moved
+        archived_at = datetime.utcnow()
+        await archive.bulk_write(
+            [ReplaceOne({"_id": doc["_id"]}, {**doc, "archived_at": archived_at}, upsert=True) for doc in docs],
+            ordered=False,
+        )
+        ids = [doc["_id"] for doc in docs]
+        # Re-check `query` so a document changed since the read stays hot
+        result = await source.delete_many({"$and": [query, {"_id": {"$in": ids}}]})
+        moved += result.deleted_count
+        kept = set()
+        if result.deleted_count < len(docs):
+            kept = {doc["_id"] for doc in await source.find({"_id": {"$in": ids}}, {"_id": 1}).to_list(length=None)}
+            await archive.delete_many({"_id": {"$in": list(kept)}})
+        if on_batch is not None:
+            await on_batch([doc for doc in docs if doc["_id"] not in kept])
+        if len(docs) < batch_size:
+            return moved
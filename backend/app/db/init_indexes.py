@@ -1,11 +1,74 @@
-from pymongo import ASCENDING
-
-def create_indexes(db):
-    # unique index on faculty_profiles.user_id
-    db["faculty_profiles"].create_index([("user_id", ASCENDING)], unique=True)
-    db["notices"].create_index([("category", ASCENDING)])
-    # Indexing array field for $in queries: works fine without special config
-    db["notices"].create_index([("target_years", ASCENDING)])
-    db["faculty_slots"].create_index([("faculty_id", ASCENDING)])
-    db["faculty_slots"].create_index([("start_time", ASCENDING)])
-    db["faculty_slots"].create_index([("created_at", DESCENDING)])
\ No newline at end of file
+"""
+Index manager.
+Each repository declares the indexes its queries rely on in an `INDEXES`
+class attribute; ensure_indexes() creates whichever are missing at startup.
+"""
+import logging
+from typing import Dict, List
+
+from pymongo.errors import OperationFailure
+
+from app.repositories.email_outbox_repo import EmailOutboxRepository
+from app.repositories.faculty_repo import FacultyRepo
+from app.repositories.notice_repo import NoticeRepository
+from app.repositories.otp_repo import OTPRepository
+from app.repositories.page_text_repo import PageTextRepository
+from app.repositories.resource_repo import ResourceRepo
+from app.repositories.slot_booking_repo import SlotBookingRepository
+from app.repositories.slot_repo import SlotRepo
+from app.repositories.slot_waitlist_repo import SlotWaitlistRepository
+from app.repositories.summary_job_repo import SummaryJobRepository
+from app.repositories.summary_repo import SummaryRepository
+from app.repositories.user_repo import UserRepository
+from app.repositories.watermark_repo import CalendarWatermarkRepository, NoticeWatermarkRepository
+
+logger = logging.getLogger(__name__)
+
+# Repositories backed by MongoDB (assignments still use JSON storage)
+INDEXED_REPOSITORIES = [
+    UserRepository,
+    OTPRepository,
+    FacultyRepo,
+    NoticeRepository,
+    SlotRepo,
+    SlotBookingRepository,
+    SlotWaitlistRepository,
+    ResourceRepo,
+    SummaryRepository,
+    SummaryJobRepository,
+    PageTextRepository,
+    EmailOutboxRepository,
+    NoticeWatermarkRepository,
+    CalendarWatermarkRepository,
+]
+
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create declared indexes that do not exist yet. Returns the names created per collection.
+    Failures are logged per index so one bad definition does not block the others.
+    """
+    created: Dict[str, List[str]] = {}
+    for repo_cls in INDEXED_REPOSITORIES:
+        repo = repo_cls(db)
+        targets = [(repo.collection, repo_cls.INDEXES)]
+        # Repositories with an archive tier declare its (smaller) index set separately
+        if hasattr(repo_cls, "ARCHIVE_INDEXES"):
+            targets.append((repo.archive, repo_cls.ARCHIVE_INDEXES))
+        for collection, indexes in targets:
+            existing = await collection.index_information()
+            for index in indexes:
+                name = index.document["name"]
+                if name in existing:
+                    continue
+                # One at a time: an index that already exists under another name
+                # (e.g. created by hand) must not block the rest
+                try:
+                    await collection.create_indexes([index])
+                except OperationFailure as e:
+                    logger.error(f"Failed to create index {name} on {collection.name}: {e}")
+                    continue
+                created.setdefault(collection.name, []).append(name)
+            if collection.name in created:
+                logger.info(f"Created indexes on {collection.name}: {created[collection.name]}")
+    return created
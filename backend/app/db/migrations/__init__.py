@@ -0,0 +1,22 @@
+"""
+Registered data migrations, applied in version order by MigrationRunner.
+Add new migrations as mNNNN_<name>.py modules and append them here.
+"""
+from app.db.migrations.runner import MigrationRunner
+from app.db.migrations.m0001_native_datetimes import NativeDatetimes
+from app.db.migrations.m0002_student_admission_year import StudentAdmissionYear
+from app.db.migrations.m0003_notice_all_years_sentinel import NoticeAllYearsSentinel
+from app.db.migrations.m0004_slot_bookings import SlotBookings
+from app.db.migrations.m0005_notice_feed_indexes import NoticeFeedIndexes
+
+MIGRATIONS = [
+    NativeDatetimes(),
+    StudentAdmissionYear(),
+    NoticeAllYearsSentinel(),
+    SlotBookings(),
+    NoticeFeedIndexes(),
+]
+
+
+async def run_migrations(db):
+    return await MigrationRunner(db, MIGRATIONS).run_pending()
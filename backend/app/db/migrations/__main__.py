@@ -0,0 +1,15 @@
+"""
+Run pending migrations from the command line:
+
+    python -m app.db.migrations
+"""
+import asyncio
+import logging
+
+from app.db.migrations import run_migrations
+from app.db.session import get_db
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    applied = asyncio.run(run_migrations(get_db()))
+    print(f"Applied migrations: {applied or 'none'}")
@@ -0,0 +1,46 @@
+"""
+Convert ISO-string timestamps to native BSON datetimes (naive UTC).
+"""
+import logging
+
+from app.db.migrations.runner import Migration, MigrationContext
+from app.utils.datetime_utils import to_utc_naive
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FIELDS = {
+    "notices": ["created_at"],
+    "faculty_slots": ["start_time", "end_time", "created_at"],
+    "resources": ["created_at"],
+    "faculty_profiles": ["created_at", "updated_at"],
+}
+
+
+def _string_fields_to_datetime(fields):
+    def transform(doc: dict):
+        updates = {}
+        for field in fields:
+            value = doc.get(field)
+            if not isinstance(value, str):
+                continue
+            try:
+                updates[field] = to_utc_naive(value)
+            except ValueError:
+                logger.warning(f"Skipping unparseable {field}={value!r} on {doc['_id']}")
+        return {"$set": updates} if updates else None
+
+    return transform
+
+
+class NativeDatetimes(Migration):
+    version = 1
+    name = "native_datetimes"
+
+    async def run(self, ctx: MigrationContext):
+        for collection_name, fields in TIMESTAMP_FIELDS.items():
+            query = {"$or": [{field: {"$type": "string"}} for field in fields]}
+            projection = {field: 1 for field in fields}
+            updated = await ctx.update_in_batches(
+                collection_name, query, _string_fields_to_datetime(fields), projection
+            )
+            logger.info(f"Converted timestamps on {updated} {collection_name} document(s)")
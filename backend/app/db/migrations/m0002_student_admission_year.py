@@ -0,0 +1,26 @@
+"""
+Store admission_year on student accounts created before it was recorded at registration.
+"""
+from app.db.migrations.runner import Migration, MigrationContext
+from app.utils.student_year import extract_admission_year
+
+
+def _admission_year(doc: dict):
+    try:
+        admission_year = extract_admission_year(doc["email"])
+    except ValueError:
+        admission_year = None
+    return {"$set": {"admission_year": admission_year}}
+
+
+class StudentAdmissionYear(Migration):
+    version = 2
+    name = "student_admission_year"
+
+    async def run(self, ctx: MigrationContext):
+        await ctx.update_in_batches(
+            "users",
+            {"role": "student", "admission_year": {"$exists": False}},
+            _admission_year,
+            {"email": 1},
+        )
@@ -0,0 +1,18 @@
+"""
+Replace null/empty target_years on notices with the explicit [ALL_YEARS] sentinel.
+"""
+from app.db.migrations.runner import Migration, MigrationContext
+from app.repositories.notice_repo import ALL_YEARS
+
+
+class NoticeAllYearsSentinel(Migration):
+    version = 3
+    name = "notice_all_years_sentinel"
+
+    async def run(self, ctx: MigrationContext):
+        await ctx.update_in_batches(
+            "notices",
+            {"$or": [{"target_years": None}, {"target_years": {"$size": 0}}]},
+            lambda doc: {"$set": {"target_years": [ALL_YEARS]}},
+            {"_id": 1},
+        )
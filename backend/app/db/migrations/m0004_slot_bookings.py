@@ -0,0 +1,89 @@
+"""
+Move bookings out of the booked_by arrays on slots into slot_bookings, and
+replace each array with a booked_count counter.
+
+Safe to run while the API serves bookings: the counter reserve_seat keeps
+is never overwritten, and an array changed by a concurrent cancel makes the
+slot be redone rather than retired.
+"""
+from typing import List
+
+from pymongo import UpdateOne
+
+from app.db.migrations.runner import Migration, MigrationContext
+
+
+class SlotBookings(Migration):
+    version = 4
+    name = "slot_bookings"
+
+    async def run(self, ctx: MigrationContext):
+        bookings = ctx.db["slot_bookings"]
+
+        def upserts(slot: dict, student_ids: List) -> List[UpdateOne]:
+            return [
+                UpdateOne(
+                    {"slot_id": slot["_id"], "student_id": student_id},
+                    {"$setOnInsert": {
+                        "faculty_id": slot["faculty_id"],
+                        "title": slot.get("title"),
+                        "location": slot.get("location"),
+                        "start_time": slot["start_time"],
+                        "end_time": slot["end_time"],
+                        # Booking time was never recorded; creation time keeps the order sensible
+                        "booked_at": slot.get("created_at"),
+                    }},
+                    upsert=True,
+                )
+                for student_id in student_ids
+            ]
+
+        def retire_array(slot: dict) -> UpdateOne:
+            # Only while booked_by is exactly what was copied: the live counter
+            # (which reserve_seat may have moved meanwhile) is kept, never recounted
+            return UpdateOne(
+                {"_id": slot["_id"], "booked_by": slot["booked_by"]},
+                [
+                    {"$set": {"booked_count": {"$ifNull": ["$booked_count", {"$size": "$booked_by"}]}}},
+                    {"$project": {"booked_by": 0}},
+                ],
+            )
+
+        async def move_bookings(collection_name: str, slots: List[dict]) -> int:
+            slots_collection = ctx.db[collection_name]
+            ops = [op for slot in slots for op in upserts(slot, slot["booked_by"])]
+            if ops:
+                await bookings.bulk_write(ops, ordered=False)
+            res = await slots_collection.bulk_write([retire_array(slot) for slot in slots], ordered=False)
+            if res.modified_count == len(slots):
+                return len(slots)
+            # Some legacy bookings were cancelled between the read and the update
+            # (take_legacy_booking); redo those slots one by one
+            for slot in slots:
+                while True:
+                    fresh = await slots_collection.find_one({"_id": slot["_id"], "booked_by": {"$exists": True}})
+                    if fresh is None:
+                        break
+                    gone = [s for s in slot["booked_by"] if s not in fresh["booked_by"]]
+                    if gone:
+                        # Rows this migration created for them (booked_at marks them) are not bookings
+                        await bookings.delete_many({
+                            "slot_id": slot["_id"],
+                            "student_id": {"$in": gone},
+                            "booked_at": slot.get("created_at"),
+                        })
+                    slot = fresh
+                    new_ops = upserts(slot, slot["booked_by"])
+                    if new_ops:
+                        await bookings.bulk_write(new_ops, ordered=False)
+                    if (await slots_collection.bulk_write([retire_array(slot)])).modified_count:
+                        break
+            return len(slots)
+
+        # Upsert by the unique (slot_id, student_id) key, so re-running a batch is harmless
+        for collection_name in ("faculty_slots", "faculty_slots_archive"):
+            await ctx.process_in_batches(
+                collection_name,
+                {"booked_by": {"$exists": True}},
+                lambda slots, name=collection_name: move_bookings(name, slots),
+            )
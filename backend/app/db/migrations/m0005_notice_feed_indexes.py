@@ -0,0 +1,35 @@
+"""
+Drop the notice feed indexes superseded by their (..., created_at, _id)
+versions, which keyset-paginated feeds need to avoid an in-memory sort.
+Each replacement is built first, so feeds are never left without an index.
+"""
+from pymongo.errors import OperationFailure
+
+from app.db.migrations.runner import Migration, MigrationContext
+from app.repositories.notice_repo import NoticeRepository
+
+SUPERSEDED = {
+    "category_created_at": "category_created_at_id",
+    "target_years_created_at": "target_years_created_at_id",
+    "category_target_years_created_at": "category_target_years_created_at_id",
+}
+
+
+class NoticeFeedIndexes(Migration):
+    version = 5
+    name = "notice_feed_indexes"
+
+    async def run(self, ctx: MigrationContext):
+        notices = ctx.db["notices"]
+        declared = {index.document["name"]: index for index in NoticeRepository.INDEXES}
+        existing = await notices.index_information()
+        for old, new in SUPERSEDED.items():
+            if old not in existing:
+                continue
+            if new not in existing:
+                await notices.create_indexes([declared[new]])
+            try:
+                await notices.drop_index(old)
+            except OperationFailure:
+                # Already dropped by another worker
+                pass
@@ -0,0 +1,186 @@
+"""
+Versioned, resumable data migrations.
+
+Each migration runs in the background against the live database, processing
+documents in _id order in batches and checkpointing after every batch in the
+`schema_migrations` collection. A migration interrupted by a restart resumes
+from its last checkpoint, and transforms are written to be idempotent so
+documents written concurrently by the API are always safe to revisit.
+"""
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MigrationStatus:
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Migration:
+    """Base class: subclasses set `version`/`name` and implement `run`."""
+
+    version: int = 0
+    name: str = ""
+
+    async def run(self, ctx: "MigrationContext"):
+        raise NotImplementedError
+
+
+class MigrationContext:
+    """Gives a running migration access to the database and its checkpoints."""
+
+    def __init__(self, db, state_collection, version: int, owner: str, checkpoints: Dict[str, Any], batch_size: int):
+        self.db = db
+        self._state = state_collection
+        self.version = version
+        self.owner = owner
+        self.checkpoints = checkpoints
+        self.batch_size = batch_size
+
+    async def save_checkpoint(self, key: str, value: Any):
+        self.checkpoints[key] = value
+        await self._state.update_one(
+            {"_id": self.version, "owner": self.owner},
+            {"$set": {f"checkpoints.{key}": value, "heartbeat_at": datetime.utcnow()}},
+        )
+
+    async def update_in_batches(
+        self,
+        collection_name: str,
+        query: dict,
+        transform: Callable[[dict], Optional[dict]],
+        projection: Optional[dict] = None,
+    ) -> int:
+        """
+        Walk documents matching `query` in _id order, apply `transform` (which returns
+        an update document or None to skip) and bulk-write one batch at a time.
+        Returns the number of documents updated.
+        """
+        collection = self.db[collection_name]
+
+        async def write(docs: List[dict]) -> int:
+            ops = []
+            for doc in docs:
+                update = transform(doc)
+                if update:
+                    ops.append(UpdateOne({"_id": doc["_id"]}, update))
+            if ops:
+                await collection.bulk_write(ops, ordered=False)
+            return len(ops)
+
+        return await self.process_in_batches(collection_name, query, write, projection)
+
+    async def process_in_batches(
+        self,
+        collection_name: str,
+        query: dict,
+        handler: Callable[[List[dict]], Awaitable[int]],
+        projection: Optional[dict] = None,
+    ) -> int:
+        """
+        Like update_in_batches for migrations that write elsewhere too: `handler`
+        receives each batch and returns how many documents it processed.
+        """
+        collection = self.db[collection_name]
+        key = f"{collection_name}_last_id"
+        processed = 0
+        while True:
+            batch_query = dict(query)
+            last_id = self.checkpoints.get(key)
+            if last_id is not None:
+                batch_query["_id"] = {"$gt": last_id}
+            docs = await collection.find(batch_query, projection).sort("_id", 1).limit(self.batch_size).to_list(
+                length=self.batch_size
+            )
+            if not docs:
+                return processed
+            processed += await handler(docs)
+            await self.save_checkpoint(key, docs[-1]["_id"])
+
+
+class MigrationRunner:
+    def __init__(self, db, migrations: List[Migration], batch_size: Optional[int] = None):
+        self.db = db
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+        self.batch_size = batch_size or settings.MIGRATION_BATCH_SIZE
+        self.state = db["schema_migrations"]
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    async def _claim(self, migration: Migration) -> Optional[dict]:
+        """
+        Take the lock for a migration unless it is completed or another worker
+        is actively running it (heartbeat newer than MIGRATION_LOCK_TIMEOUT_SECONDS).
+        """
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=settings.MIGRATION_LOCK_TIMEOUT_SECONDS)
+        try:
+            return await self.state.find_one_and_update(
+                {
+                    "_id": migration.version,
+                    "status": {"$ne": MigrationStatus.COMPLETED},
+                    "$or": [
+                        {"status": {"$ne": MigrationStatus.RUNNING}},
+                        {"heartbeat_at": {"$lt": stale}},
+                    ],
+                },
+                {
+                    "$set": {
+                        "name": migration.name,
+                        "status": MigrationStatus.RUNNING,
+                        "owner": self.owner,
+                        "heartbeat_at": now,
+                        "error": None,
+                    },
+                    "$setOnInsert": {"checkpoints": {}, "started_at": now},
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # Completed, or held by a live worker
+            return None
+
+    async def run_pending(self) -> List[int]:
+        """Apply migrations that have not completed yet, in version order. Returns versions applied."""
+        applied = []
+        for migration in self.migrations:
+            record = await self._claim(migration)
+            if record is None:
+                done = await self.state.find_one({"_id": migration.version, "status": MigrationStatus.COMPLETED})
+                if done:
+                    continue
+                # A later migration may depend on this one; wait for the other worker
+                logger.info(f"Migration {migration.version} is running elsewhere; stopping here")
+                break
+
+            ctx = MigrationContext(
+                self.db, self.state, migration.version, self.owner, record.get("checkpoints", {}), self.batch_size
+            )
+            logger.info(f"Running migration {migration.version}: {migration.name}")
+            try:
+                await migration.run(ctx)
+            except Exception as e:
+                logger.error(f"Migration {migration.version} failed: {e}")
+                await self.state.update_one(
+                    {"_id": migration.version},
+                    {"$set": {"status": MigrationStatus.FAILED, "error": str(e)}},
+                )
+                break
+            await self.state.update_one(
+                {"_id": migration.version},
+                {"$set": {"status": MigrationStatus.COMPLETED, "completed_at": datetime.utcnow()}},
+            )
+            applied.append(migration.version)
+            logger.info(f"Migration {migration.version} completed")
+        return applied
@@ -1,3 +1,7 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -8,9 +12,75 @@ from app.routers import resources as resources_router
 from app.routers import chatbot as chatbot_router
 from app.routers import assignments as assignments_router
 from app.db import init_indexes
+from app.db.session import get_db
+from app.db.migrations import run_migrations
 from app.routers import notices
+from app.routers import emails as emails_router
+from app.routers import health as health_router
+from app.services.email_outbox_service import get_email_dispatcher
+from app.services.notice_notification_service import get_notice_digest_scheduler
+from app.services.notice_feed_cache import get_notice_feed_cache
+from app.services.calendar_feed import get_calendar_feed_cache
+from app.services.notice_events import get_notice_event_hub
+from app.services.archival_service import get_archival_scheduler
+from app.services.summary_jobs import SummaryJobManager, get_summary_job_manager
+from app.services.chatbot_service import get_chatbot_assistant
+from app.core.config import settings
+from app.utils.model_registry import get_model_registry
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_models(summary_jobs: SummaryJobManager):
+    """Load the AI models ahead of the first request (MODEL_WARMUP); the API serves requests meanwhile."""
+    try:
+        await summary_jobs.warmup()
+    except Exception as e:
+        logger.warning(f"Summarizer warmup failed: {e}")
+    # Chatbot and grading models live in this process (summaries in the pool's)
+    await asyncio.to_thread(get_model_registry().warmup, ["chatbot"], ["chatbot", "grading"])
+    try:
+        await asyncio.to_thread(get_chatbot_assistant)
+    except Exception as e:
+        logger.warning(f"Chatbot warmup failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background workers live for the lifetime of the worker process
+    email_dispatcher = get_email_dispatcher()
+    email_dispatcher.start()
+    digest_scheduler = get_notice_digest_scheduler()
+    digest_scheduler.start()
+    notice_feed_cache = get_notice_feed_cache()
+    notice_feed_cache.start()
+    calendar_feed_cache = get_calendar_feed_cache()
+    calendar_feed_cache.start()
+    notice_event_hub = get_notice_event_hub()
+    await notice_event_hub.start()
+    archival_scheduler = get_archival_scheduler()
+    archival_scheduler.start()
+    summary_jobs = get_summary_job_manager()
+    warmup = asyncio.create_task(warm_up_models(summary_jobs)) if settings.MODEL_WARMUP else None
+    # Index builds run in the background so startup is not blocked
+    index_build = asyncio.create_task(init_indexes.ensure_indexes(get_db()))
+    # Data migrations are batched and resumable, so they can run against the live app
+    migrations = asyncio.create_task(run_migrations(get_db()))
+    yield
+    if warmup is not None:
+        warmup.cancel()
+    migrations.cancel()
+    index_build.cancel()
+    await summary_jobs.stop()
+    await archival_scheduler.stop()
+    await notice_event_hub.stop()
+    await calendar_feed_cache.stop()
+    await notice_feed_cache.stop()
+    await digest_scheduler.stop()
+    await email_dispatcher.stop()
+
 
-app = FastAPI(title="Benny WebApp Backend")
+app = FastAPI(title="Benny WebApp Backend", lifespan=lifespan)
 
 # Adjust CORS for your React frontend
 # Adjust CORS for your frontend(s). During development it's common to run
@@ -44,6 +114,8 @@ app.include_router(slots_router.router, prefix=API_PREFIX)
 app.include_router(resources_router.router, prefix=API_PREFIX)
 app.include_router(chatbot_router.router, prefix=API_PREFIX)
 app.include_router(assignments_router.router, prefix=API_PREFIX)
+app.include_router(emails_router.router, prefix=API_PREFIX)
+app.include_router(health_router.router, prefix=API_PREFIX)
 
 # Mount static file serving for assignment and submission files
 # Note: In production, consider using a proper file server (S3, etc.)
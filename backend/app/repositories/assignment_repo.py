@@ -4,6 +4,7 @@ Abstracts storage operations - can be swapped with MongoDB adapter.
 """
 from typing import Optional, List, Dict, Any
 from app.storage.assignment_storage import AssignmentStorage, SubmissionStorage
+from app.utils.pagination import PageParams, paginate_list
 
 
 class AssignmentRepository:
@@ -24,6 +25,10 @@ class AssignmentRepository:
         """List all assignments."""
         return self.storage.list_all()
     
+    async def list_page(self, params: PageParams) -> Dict[str, Any]:
+        """One page of assignments, newest first (keyset over created_at, id)."""
+        return paginate_list(self.storage.list_all(), 'created_at', 'id', -1, params)
+    
     async def update(self, assignment_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update an assignment."""
         return self.storage.update(assignment_id, updates)
@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from pymongo.collection import Collection
+
+
+class EmailStatus:
+    QUEUED = "queued"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class EmailOutboxRepository:
+    INDEXES = [
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt_at"),
+        IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="status_lease_expires_at"),
+        # Delivered messages are kept for 30 days for status lookups
+        IndexModel([("sent_at", ASCENDING)], expireAfterSeconds=30 * 24 * 3600, name="sent_at_ttl"),
+    ]
+
+    def __init__(self, db):
+        self.collection: Collection = db["email_outbox"]
+
+    async def enqueue(
+        self,
+        to_email: Optional[str],
+        subject: str,
+        content: str,
+        bcc: Optional[List[str]] = None,
+        category: str = "general",
+    ) -> str:
+        now = datetime.utcnow()
+        doc = {
+            "to": to_email,
+            "bcc": bcc or [],
+            "subject": subject,
+            "content": content,
+            "category": category,
+            "status": EmailStatus.QUEUED,
+            "attempts": 0,
+            "last_error": None,
+            "next_attempt_at": now,
+            "lease_expires_at": None,
+            "created_at": now,
+            "updated_at": now,
+            "sent_at": None,
+        }
+        res = await self.collection.insert_one(doc)
+        return str(res.inserted_id)
+
+    async def enqueue_many(self, messages: List[dict]) -> List[str]:
+        """Insert several pre-built messages (dicts with to/bcc/subject/content/category) in one write."""
+        if not messages:
+            return []
+        now = datetime.utcnow()
+        docs = [
+            {
+                "to": m.get("to"),
+                "bcc": m.get("bcc", []),
+                "subject": m["subject"],
+                "content": m["content"],
+                "category": m.get("category", "general"),
+                "status": EmailStatus.QUEUED,
+                "attempts": 0,
+                "last_error": None,
+                "next_attempt_at": now,
+                "lease_expires_at": None,
+                "created_at": now,
+                "updated_at": now,
+                "sent_at": None,
+            }
+            for m in messages
+        ]
+        res = await self.collection.insert_many(docs, ordered=False)
+        return [str(x) for x in res.inserted_ids]
+
+    async def claim_next(self, lease_seconds: int) -> Optional[dict]:
+        """
+        Atomically take the oldest due message and lease it to this worker.
+        Messages whose lease expired (worker crashed mid-send) are picked up again.
+        Each claim gets a fresh lease_id; the mark_* methods only apply while it
+        is still current, so a worker whose lease ran out cannot overwrite the new owner.
+        """
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": EmailStatus.QUEUED, "next_attempt_at": {"$lte": now}},
+                    {"status": EmailStatus.SENDING, "lease_expires_at": {"$lte": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": EmailStatus.SENDING,
+                    "lease_id": ObjectId(),
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    @staticmethod
+    def _leased(message: dict) -> dict:
+        """Filter matching a claimed message only while this claim still holds it."""
+        return {"_id": message["_id"], "status": EmailStatus.SENDING, "lease_id": message["lease_id"]}
+
+    async def mark_sent(self, message: dict) -> bool:
+        """Record delivery of a claimed message; False if the lease was lost to another worker."""
+        now = datetime.utcnow()
+        res = await self.collection.update_one(
+            self._leased(message),
+            {"$set": {
+                "status": EmailStatus.SENT,
+                "sent_at": now,
+                "updated_at": now,
+                "lease_expires_at": None,
+                "last_error": None,
+            }},
+        )
+        return res.modified_count > 0
+
+    async def mark_retry(self, message: dict, error: str, next_attempt_at: datetime) -> bool:
+        res = await self.collection.update_one(
+            self._leased(message),
+            {"$set": {
+                "status": EmailStatus.QUEUED,
+                "next_attempt_at": next_attempt_at,
+                "updated_at": datetime.utcnow(),
+                "lease_expires_at": None,
+                "last_error": error,
+            }},
+        )
+        return res.modified_count > 0
+
+    async def mark_failed(self, message: dict, error: str) -> bool:
+        res = await self.collection.update_one(
+            self._leased(message),
+            {"$set": {
+                "status": EmailStatus.FAILED,
+                "updated_at": datetime.utcnow(),
+                "lease_expires_at": None,
+                "last_error": error,
+            }},
+        )
+        return res.modified_count > 0
+
+    async def get(self, message_id: str) -> Optional[dict]:
+        doc = await self.collection.find_one({"_id": ObjectId(message_id)})
+        return self._normalize(doc) if doc else None
+
+    def _normalize(self, doc: dict) -> dict:
+        return {
+            "id": str(doc["_id"]),
+            "category": doc.get("category"),
+            "status": doc.get("status"),
+            "attempts": doc.get("attempts", 0),
+            "last_error": doc.get("last_error"),
+            "next_attempt_at": doc.get("next_attempt_at"),
+            "created_at": doc.get("created_at"),
+            "sent_at": doc.get("sent_at"),
+        }
@@ -1,10 +1,17 @@
 from datetime import datetime
 from typing import Optional
+from pymongo import ASCENDING, IndexModel
 from pymongo.collection import Collection
 from bson import ObjectId
 
+from app.utils.datetime_utils import to_iso
+
 
 class FacultyRepo:
+    INDEXES = [
+        IndexModel([("user_id", ASCENDING)], unique=True, name="user_id_unique"),
+    ]
+
     def __init__(self, db):
         self.collection: Collection = db["faculty_profiles"]
 
@@ -15,7 +22,7 @@ class FacultyRepo:
         return await self.collection.find_one({"_id": ObjectId(profile_id)})
 
     async def create_or_update(self, user_id: str, payload: dict) -> dict:
-        now = datetime.utcnow().isoformat()
+        now = datetime.utcnow()
         payload_db = {
             "user_id": ObjectId(user_id),
             "description": payload.get("description"),
@@ -48,6 +55,6 @@ class FacultyRepo:
             "description": doc.get("description"),
             "courses": doc.get("courses", []),
             "contact": doc.get("contact", {}),
-            "created_at": doc.get("created_at"),
-            "updated_at": doc.get("updated_at"),
+            "created_at": to_iso(doc.get("created_at")),
+            "updated_at": to_iso(doc.get("updated_at")),
         }
@@ -0,0 +1,42 @@
+from typing import AsyncIterator
+
+from pymongo import CursorType
+from pymongo.collection import Collection
+from pymongo.errors import CollectionInvalid
+
+
+class NoticeEventRepository:
+    """
+    Capped log of notice events, tailed by every API worker.
+    Capped collections keep insertion order and let readers block on new
+    documents (tailable await cursors), which makes them a broadcast channel.
+    """
+
+    def __init__(self, db, size_bytes: int = 4 * 1024 * 1024, max_events: int = 1000):
+        self.db = db
+        self.size_bytes = size_bytes
+        self.max_events = max_events
+        self.collection: Collection = db["notice_events"]
+
+    async def ensure_capped(self):
+        try:
+            await self.db.create_collection(
+                "notice_events", capped=True, size=self.size_bytes, max=self.max_events
+            )
+        except CollectionInvalid:
+            # Already exists (created by another worker or an earlier run)
+            pass
+
+    async def append(self, event: dict):
+        await self.collection.insert_one(dict(event))
+
+    async def tail(self) -> AsyncIterator[dict]:
+        """
+        Yield events in insertion order, waiting for new ones. Starts from the
+        oldest retained event; the cursor ends if the collection is empty or
+        the server drops it, so callers re-open it in a loop.
+        """
+        cursor = self.collection.find({}, cursor_type=CursorType.TAILABLE_AWAIT)
+        while cursor.alive:
+            async for doc in cursor:
+                yield doc
@@ -1,13 +1,65 @@
 # app/repositories/notice_repo.py
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
 from pymongo.collection import Collection
 from datetime import datetime
 from bson import ObjectId
-from typing import List, Optional
+from typing import Awaitable, Callable, List, Optional
+
+from app.db.archive import move_to_archive
+
+from app.utils.datetime_utils import to_iso
+from app.utils.pagination import PageParams, encode_cursor, keyset_filter, page_envelope, paginate, paginate_tiers
+
+# Stored in target_years for notices visible to every year, so the year feed
+# is a single $in over one multikey index instead of an $or with a null branch
+ALL_YEARS = 0
+
+# Only the fields NoticeOut needs
+NOTICE_PROJECTION = {
+    "faculty_id": 1,
+    "title": 1,
+    "content": 1,
+    "category": 1,
+    "target_years": 1,
+    "created_at": 1,
+}
 
 
 class NoticeRepository:
+    INDEXES = [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        IndexModel([("faculty_id", ASCENDING), ("created_at", DESCENDING)], name="faculty_created_at"),
+        # Feeds are keyset paginated on (created_at, _id), so _id ends every feed index
+        IndexModel(
+            [("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="category_created_at_id",
+        ),
+        # Year feeds: target_years $in [ALL_YEARS, year] merges two index ranges already in feed order
+        IndexModel(
+            [("target_years", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="target_years_created_at_id",
+        ),
+        IndexModel(
+            [("category", ASCENDING), ("target_years", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="category_target_years_created_at_id",
+        ),
+        # Full-text search; a title match counts five times a content match
+        IndexModel(
+            [("title", TEXT), ("content", TEXT)],
+            weights={"title": 5, "content": 1},
+            default_language="english",
+            name="title_content_text",
+        ),
+    ]
+    # Archived notices are only listed newest-first, overall or per faculty
+    ARCHIVE_INDEXES = [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        IndexModel([("faculty_id", ASCENDING), ("created_at", DESCENDING)], name="faculty_created_at"),
+    ]
+
     def __init__(self, db):
         self.collection: Collection = db["notices"]
+        self.archive: Collection = db["notices_archive"]
 
     async def create_notice(self, faculty_id: str, data: dict) -> dict:
         payload = {
@@ -15,68 +67,134 @@ class NoticeRepository:
             "title": data["title"],
             "content": data["content"],
             "category": data["category"],
-            # store as list or None
-            "target_years": data.get("target_years", None),
-            "created_at": datetime.utcnow().isoformat()
+            # explicit years, or [ALL_YEARS] when the notice targets everyone
+            "target_years": sorted(set(data.get("target_years") or [])) or [ALL_YEARS],
+            "created_at": datetime.utcnow()
         }
         res = await self.collection.insert_one(payload)
         new_notice = await self.collection.find_one({"_id": res.inserted_id})
         return self._normalize(new_notice)
 
-    async def get_all(self) -> List[dict]:
-        cursor = self.collection.find().sort("created_at", -1)
-        docs = await cursor.to_list(length=None)
-        return [self._normalize(doc) for doc in docs]
+    async def list_page(self, params: PageParams, include_archived: bool = False, category: Optional[str] = None) -> dict:
+        """One page of all notices (optionally one category), newest first; archived notices follow the hot ones."""
+        tiers = [self.collection, self.archive] if include_archived else [self.collection]
+        query = {"category": category} if category is not None else {}
+        return await paginate_tiers(tiers, query, "created_at", -1, params, self._normalize, NOTICE_PROJECTION)
 
-    async def get_by_faculty(self, faculty_id: str) -> List[dict]:
-        cursor = self.collection.find({"faculty_id": ObjectId(faculty_id)}).sort("created_at", -1)
-        docs = await cursor.to_list(length=None)
+    async def get_by_faculty(self, faculty_id: str, include_archived: bool = False) -> List[dict]:
+        query = {"faculty_id": ObjectId(faculty_id)}
+        docs = await self.collection.find(query, NOTICE_PROJECTION).sort("created_at", -1).to_list(length=None)
+        if include_archived:
+            docs += await self.archive.find(query, NOTICE_PROJECTION).sort("created_at", -1).to_list(length=None)
         return [self._normalize(doc) for doc in docs]
 
     async def get_by_category(self, category: str) -> List[dict]:
-        cursor = self.collection.find({"category": category}).sort("created_at", -1)
+        cursor = self.collection.find({"category": category}, NOTICE_PROJECTION).sort("created_at", -1)
         docs = await cursor.to_list(length=None)
         return [self._normalize(doc) for doc in docs]
 
-    async def get_by_year(self, year: int) -> List[dict]:
+    @staticmethod
+    def feed_query(year: int, category: Optional[str] = None) -> dict:
+        """Filter for notices visible to `year`: targeted at all years or explicitly at it."""
+        query = {"target_years": {"$in": [ALL_YEARS, year]}}
+        if category is not None:
+            query["category"] = category
+        return query
+
+    def feed_cursor(self, year: int, category: Optional[str] = None, limit: int = 50):
+        return (
+            self.collection.find(self.feed_query(year, category), NOTICE_PROJECTION)
+            .sort([("created_at", -1), ("_id", -1)])
+            .limit(limit)
+        )
+
+    async def feed_page(self, year: int, params: PageParams, category: Optional[str] = None) -> dict:
+        """One page of the notices visible to `year`, newest first."""
+        return await paginate(
+            self.collection, self.feed_query(year, category), "created_at", -1, params, self._normalize, NOTICE_PROJECTION
+        )
+
+    async def get_by_category_and_year(self, category: str, year: int, limit: int = 50) -> List[dict]:
+        docs = await self.feed_cursor(year, category, limit=limit).to_list(length=limit)
+        return [self._normalize(doc) for doc in docs]
+
+    async def search_page(
+        self,
+        text: str,
+        params: PageParams,
+        category: Optional[str] = None,
+        year: Optional[int] = None,
+    ) -> dict:
         """
-        Return notices that either target all years (target_years == None)
-        or explicitly include the given year.
+        One page of notices matching `text`, best match first.
+        Pages are keyed on (score, _id); textScore depends only on the document
+        and the query, so cursors stay valid while notices are added.
         """
-        cursor = self.collection.find({
-            "$or": [
-                {"target_years": None},
-                {"target_years": {"$in": [year]}}
-            ]
-        }).sort("created_at", -1)
-        docs = await cursor.to_list(length=None)
-        return [self._normalize(doc) for doc in docs]
+        match = {"$text": {"$search": text}}
+        if year is not None:
+            match.update(self.feed_query(year, category))
+        elif category is not None:
+            match["category"] = category
+        pipeline = [
+            {"$match": match},
+            {"$project": {**NOTICE_PROJECTION, "score": {"$meta": "textScore"}}},
+        ]
+        keyset = keyset_filter("score", -1, params.cursor)
+        if keyset:
+            pipeline.append({"$match": keyset})
+        pipeline += [
+            {"$sort": {"score": -1, "_id": -1}},
+            {"$limit": params.limit + 1},
+        ]
+        docs = await self.collection.aggregate(pipeline).to_list(length=params.limit + 1)
+        next_cursor = None
+        if len(docs) > params.limit:
+            docs = docs[: params.limit]
+            next_cursor = encode_cursor(docs[-1]["score"], docs[-1]["_id"])
+        items = [{**self._normalize(doc), "score": doc["score"]} for doc in docs]
+        return page_envelope(items, next_cursor, params.limit)
 
-    async def get_by_category_and_year(self, category: str, year: int) -> List[dict]:
+    async def get_created_between(self, start: datetime, end: datetime) -> List[dict]:
+        """Notices created in (start, end], oldest first (used by the daily digest)."""
         cursor = self.collection.find({
-            "category": category,
-            "$or": [
-                {"target_years": None},
-                {"target_years": {"$in": [year]}}
-            ]
-        }).sort("created_at", -1)
+            "created_at": {"$gt": start, "$lte": end}
+        }, NOTICE_PROJECTION).sort("created_at", 1)
         docs = await cursor.to_list(length=None)
         return [self._normalize(doc) for doc in docs]
 
-    async def delete_notice(self, notice_id: str, faculty_id: str) -> bool:
-        result = await self.collection.delete_one({
-            "_id": ObjectId(notice_id),
-            "faculty_id": ObjectId(faculty_id)
-        })
-        return result.deleted_count > 0
+    async def delete_notice(self, notice_id: str, faculty_id: str) -> Optional[dict]:
+        """Delete a faculty member's own notice (hot or archived); returns it or None."""
+        query = {"_id": ObjectId(notice_id), "faculty_id": ObjectId(faculty_id)}
+        doc = await self.collection.find_one_and_delete(query, projection=NOTICE_PROJECTION)
+        if not doc:
+            doc = await self.archive.find_one_and_delete(query, projection=NOTICE_PROJECTION)
+        return self._normalize(doc) if doc else None
+
+    async def archive_created_before(
+        self,
+        cutoff: datetime,
+        batch_size: int,
+        on_batch: Optional[Callable[[List[dict]], Awaitable[None]]] = None,
+    ) -> int:
+        """Move notices created before `cutoff` to the archive; on_batch gets each batch normalized."""
+        async def normalized(docs: List[dict]):
+            if on_batch is not None:
+                await on_batch([self._normalize(doc) for doc in docs])
+
+        return await move_to_archive(
+            self.collection, self.archive, {"created_at": {"$lt": cutoff}}, batch_size, normalized
+        )
 
     def _normalize(self, doc: dict) -> dict:
+        target_years = doc.get("target_years")
+        if not target_years or ALL_YEARS in target_years:
+            target_years = None
         return {
             "id": str(doc["_id"]),
             "faculty_id": str(doc["faculty_id"]),
             "title": doc.get("title"),
             "content": doc.get("content"),
             "category": doc.get("category"),
-            "target_years": doc.get("target_years"),
-            "created_at": doc.get("created_at")
+            "target_years": target_years,
+            "created_at": to_iso(doc.get("created_at"))
         }
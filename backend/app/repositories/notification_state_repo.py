@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+
+
+class NotificationStateRepository:
+    """Bookkeeping for periodic background jobs shared by all API workers."""
+
+    def __init__(self, db):
+        self.collection: Collection = db["notification_state"]
+
+    async def claim_run(self, job: str, run_at: datetime) -> Tuple[bool, Optional[datetime]]:
+        """
+        Atomically record that `job` runs at `run_at`.
+        Returns (claimed, previous_run_at); claimed is False when another worker
+        already ran the job for this (or a later) run time.
+        """
+        try:
+            previous = await self.collection.find_one_and_update(
+                {"_id": job, "last_run_at": {"$lt": run_at}},
+                {"$set": {"last_run_at": run_at}},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE,
+            )
+        except DuplicateKeyError:
+            return False, None
+        return True, previous["last_run_at"] if previous else None
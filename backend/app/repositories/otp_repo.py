@@ -1,8 +1,22 @@
 from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from pymongo.collection import Collection
 
 
 class OTPRepository:
+    INDEXES = [
+        IndexModel(
+            [("email", ASCENDING), ("otp", ASCENDING), ("is_used", ASCENDING), ("expires_at", ASCENDING)],
+            name="email_otp_is_used_expires_at",
+        ),
+        IndexModel(
+            [("email", ASCENDING), ("is_used", ASCENDING), ("expires_at", DESCENDING)],
+            name="email_is_used_latest",
+        ),
+        # Mongo purges OTPs as soon as they expire
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ]
+
     def __init__(self, db):
         self.collection: Collection = db["email_otps"]
 
@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pymongo import ASCENDING, IndexModel, UpdateOne
+from pymongo.collection import Collection
+
+
+class PageTextRepository:
+    """
+    Extracted document text, one document per (content hash, page), so a
+    file is parsed once however many summaries or indexes are built from it.
+    Each page records the document's page count; a file counts as extracted
+    only when all of its pages are present for the current extractor version.
+    """
+
+    INDEXES = [
+        IndexModel(
+            [("content_hash", ASCENDING), ("version", ASCENDING), ("page", ASCENDING)],
+            unique=True,
+            name="content_hash_version_page_unique",
+        ),
+    ]
+
+    def __init__(self, db):
+        self.collection: Collection = db["page_texts"]
+
+    async def get_pages(self, content_hash: str, version: int) -> Optional[List[str]]:
+        """Page texts in page order, or None unless every page is stored."""
+        cursor = self.collection.find(
+            {"content_hash": content_hash, "version": version}, {"page": 1, "page_count": 1, "text": 1}
+        ).sort("page", 1)
+        docs = [doc async for doc in cursor]
+        if not docs or len(docs) != docs[0]["page_count"]:
+            return None
+        return [doc["text"] for doc in docs]
+
+    async def put_pages(self, content_hash: str, version: int, texts: List[str]):
+        now = datetime.utcnow()
+        ops = [
+            UpdateOne(
+                {"content_hash": content_hash, "version": version, "page": page},
+                {"$set": {"text": text, "page_count": len(texts), "created_at": now}},
+                upsert=True,
+            )
+            for page, text in enumerate(texts)
+        ]
+        if ops:
+            await self.collection.bulk_write(ops, ordered=False)
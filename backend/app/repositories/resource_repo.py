@@ -1,19 +1,29 @@
 from bson import ObjectId
 from datetime import datetime
+from pymongo import DESCENDING, IndexModel
+
+from app.utils.datetime_utils import to_iso
+from app.utils.pagination import PageParams, paginate
 
 class ResourceRepo:
+    INDEXES = [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    ]
+
     def __init__(self, db):
         self.collection = db["resources"]
 
     async def create(self, data: dict):
-        data["created_at"] = datetime.utcnow().isoformat()
+        data["created_at"] = datetime.utcnow()
         res = await self.collection.insert_one(data)
         doc = await self.collection.find_one({"_id": res.inserted_id})
         return self._normalize(doc)
 
-    async def list_all(self):
-        docs = await self.collection.find().sort("created_at", -1).to_list(None)
-        return [self._normalize(d) for d in docs]
+    async def list_page(self, params: PageParams) -> dict:
+        return await paginate(self.collection, {}, "created_at", -1, params, self._normalize)
+
+    async def set_content_hash(self, resource_id: str, content_hash: str):
+        await self.collection.update_one({"_id": ObjectId(resource_id)}, {"$set": {"content_hash": content_hash}})
 
     async def get(self, resource_id: str):
         doc = await self.collection.find_one({"_id": ObjectId(resource_id)})
@@ -27,6 +37,7 @@ class ResourceRepo:
             "course_code": doc["course"]["code"],
             "course_name": doc["course"]["name"],
             "file_path": doc["file_path"],
+            "content_hash": doc.get("content_hash"),
             "faculty_id": str(doc["faculty_id"]),
-            "created_at": doc["created_at"]
+            "created_at": to_iso(doc["created_at"])
         }
@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import AsyncIterator, Dict, List
+
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+
+from app.utils.datetime_utils import to_iso
+from app.utils.pagination import PageParams, paginate
+
+
+class SlotBookingRepository:
+    """
+    One document per (slot, student) booking. Slot details are copied in at
+    booking time (slots are never edited), so a student's bookings are listed
+    from this collection alone.
+    """
+
+    INDEXES = [
+        # Also what makes a double booking impossible
+        IndexModel([("slot_id", ASCENDING), ("student_id", ASCENDING)], unique=True, name="slot_student_unique"),
+        IndexModel(
+            [("student_id", ASCENDING), ("start_time", ASCENDING), ("_id", ASCENDING)],
+            name="student_start_time_id",
+        ),
+    ]
+
+    def __init__(self, db):
+        self.collection: Collection = db["slot_bookings"]
+
+    async def create(self, slot: dict, student_id: str) -> bool:
+        """Record a booking for a raw slot document; False if the student already has one."""
+        try:
+            await self.collection.insert_one({
+                "slot_id": slot["_id"],
+                "student_id": ObjectId(student_id),
+                "faculty_id": slot["faculty_id"],
+                "title": slot.get("title"),
+                "location": slot.get("location"),
+                "start_time": slot["start_time"],
+                "end_time": slot["end_time"],
+                "booked_at": datetime.utcnow(),
+            })
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def delete(self, slot_id: str, student_id: str) -> bool:
+        res = await self.collection.delete_one({"slot_id": ObjectId(slot_id), "student_id": ObjectId(student_id)})
+        return res.deleted_count > 0
+
+    async def exists(self, slot_id: str, student_id: str) -> bool:
+        doc = await self.collection.find_one(
+            {"slot_id": ObjectId(slot_id), "student_id": ObjectId(student_id)}, {"_id": 1}
+        )
+        return doc is not None
+
+    async def delete_for_slot(self, slot_id: str) -> int:
+        res = await self.collection.delete_many({"slot_id": ObjectId(slot_id)})
+        return res.deleted_count
+
+    async def student_ids_by_slot(self, slot_ids: List[str]) -> Dict[str, List[str]]:
+        """Booked student ids for several slots in one query, in booking order."""
+        cursor = self.collection.find(
+            {"slot_id": {"$in": [ObjectId(s) for s in slot_ids]}}, {"slot_id": 1, "student_id": 1}
+        ).sort("booked_at", 1)
+        booked: Dict[str, List[str]] = {slot_id: [] for slot_id in slot_ids}
+        async for doc in cursor:
+            booked[str(doc["slot_id"])].append(str(doc["student_id"]))
+        return booked
+
+    async def iter_for_student(self, student_id: str, since: datetime) -> AsyncIterator[dict]:
+        """Stream a student's raw bookings starting at or after `since`, soonest first (student_start_time_id)."""
+        cursor = self.collection.find(
+            {"student_id": ObjectId(student_id), "start_time": {"$gte": since}}
+        ).sort([("start_time", 1), ("_id", 1)])
+        async for doc in cursor:
+            yield doc
+
+    async def list_for_student_page(self, student_id: str, params: PageParams, include_past: bool = False) -> dict:
+        """A student's bookings, soonest first; ended ones only when include_past."""
+        query = {"student_id": ObjectId(student_id)}
+        if not include_past:
+            query["end_time"] = {"$gt": datetime.utcnow()}
+        return await paginate(self.collection, query, "start_time", 1, params, self._normalize)
+
+    def _normalize(self, doc: dict) -> dict:
+        return {
+            "id": str(doc["_id"]),
+            "slot_id": str(doc["slot_id"]),
+            "faculty_id": str(doc["faculty_id"]),
+            "title": doc.get("title"),
+            "location": doc.get("location"),
+            "start_time": to_iso(doc.get("start_time")),
+            "end_time": to_iso(doc.get("end_time")),
+            "booked_at": to_iso(doc.get("booked_at")),
+        }
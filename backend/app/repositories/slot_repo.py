@@ -1,34 +1,57 @@
+from pymongo import ASCENDING, IndexModel, ReturnDocument
 from pymongo.collection import Collection
 from datetime import datetime
 from bson import ObjectId
-from typing import Optional, List
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from app.utils.datetime_utils import to_iso, to_utc_naive
+from app.db.archive import move_to_archive
+from app.utils.pagination import PageParams, encode_cursor, keyset_filter, page_envelope, paginate_tiers
+
+
+# Seats taken: the booked_count counter, or the legacy booked_by array on
+# slots that migration m0004 has not reached yet
+BOOKED_COUNT_EXPR = {"$ifNull": ["$booked_count", {"$size": {"$ifNull": ["$booked_by", []]}}]}
+
+
+class BookingOutcome:
+    BOOKED = "booked"
+    NOT_FOUND = "not_found"
+    ENDED = "ended"
+    ALREADY_BOOKED = "already_booked"
+    FULL = "full"
 
 
 class SlotRepo:
+    INDEXES = [
+        IndexModel(
+            [("faculty_id", ASCENDING), ("start_time", ASCENDING), ("_id", ASCENDING)],
+            name="faculty_start_time_id",
+        ),
+        # /slots/available: start_time > now range, already in (start_time, _id) page order
+        IndexModel([("start_time", ASCENDING), ("_id", ASCENDING)], name="start_time_id"),
+        # Archival sweep: slots that have ended
+        IndexModel([("end_time", ASCENDING)], name="end_time"),
+    ]
+    ARCHIVE_INDEXES = [
+        IndexModel(
+            [("faculty_id", ASCENDING), ("start_time", ASCENDING), ("_id", ASCENDING)],
+            name="faculty_start_time_id",
+        ),
+    ]
+
     def __init__(self, db):
         self.collection: Collection = db["faculty_slots"]
+        self.archive: Collection = db["faculty_slots_archive"]
 
     async def create_slot(self, faculty_id: str, payload: dict) -> dict:
         try:
-            # Handle datetime objects - convert to ISO string if needed
-            start_time = payload["start_time"]
-            end_time = payload["end_time"]
-            
-            if isinstance(start_time, datetime):
-                start_time_str = start_time.isoformat()
-            elif isinstance(start_time, str):
-                # Validate and use the string as-is (should already be ISO format)
-                start_time_str = start_time
-            else:
-                raise ValueError(f"Invalid start_time type: {type(start_time)}, value: {start_time}")
-                
-            if isinstance(end_time, datetime):
-                end_time_str = end_time.isoformat()
-            elif isinstance(end_time, str):
-                # Validate and use the string as-is (should already be ISO format)
-                end_time_str = end_time
-            else:
-                raise ValueError(f"Invalid end_time type: {type(end_time)}, value: {end_time}")
+            # Store native (naive UTC) datetimes so range filters and sorts run in Mongo
+            try:
+                start_time = to_utc_naive(payload["start_time"])
+                end_time = to_utc_naive(payload["end_time"])
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid start_time/end_time: {payload.get('start_time')!r}, {payload.get('end_time')!r}: {e}")
             
             # Validate faculty_id is a valid ObjectId
             try:
@@ -39,12 +62,13 @@ class SlotRepo:
             doc = {
                 "faculty_id": faculty_obj_id,
                 "title": payload.get("title"),
-                "start_time": start_time_str,
-                "end_time": end_time_str,
+                "start_time": start_time,
+                "end_time": end_time,
                 "max_students": int(payload["max_students"]),
                 "location": payload.get("location"),
-                "booked_by": [],  # list of ObjectId strings
-                "created_at": datetime.utcnow().isoformat(),
+                # bookings live in slot_bookings; this counter enforces capacity
+                "booked_count": 0,
+                "created_at": datetime.utcnow(),
             }
             res = await self.collection.insert_one(doc)
             created = await self.collection.find_one({"_id": res.inserted_id})
@@ -58,15 +82,136 @@ class SlotRepo:
             logger.error(f"Error creating slot: {str(e)}, payload: {payload}, faculty_id: {faculty_id}")
             raise
 
-    async def get_slots_by_faculty(self, faculty_id: str) -> List[dict]:
-        cursor = self.collection.find({"faculty_id": ObjectId(faculty_id)}).sort("start_time", 1)
-        docs = await cursor.to_list(length=None)
+    async def create_slots(self, faculty_id: str, payloads: List[dict]) -> List[dict]:
+        """Insert many slots for one faculty member in a single batched write."""
+        now = datetime.utcnow()
+        docs = [
+            {
+                "faculty_id": ObjectId(faculty_id),
+                "title": payload.get("title"),
+                "start_time": to_utc_naive(payload["start_time"]),
+                "end_time": to_utc_naive(payload["end_time"]),
+                "max_students": int(payload["max_students"]),
+                "location": payload.get("location"),
+                "booked_count": 0,
+                "created_at": now,
+            }
+            for payload in payloads
+        ]
+        if not docs:
+            return []
+        res = await self.collection.insert_many(docs, ordered=True)
+        for doc, inserted_id in zip(docs, res.inserted_ids):
+            doc["_id"] = inserted_id
+        return [self._normalize(doc) for doc in docs]
+
+    async def get_faculty_slots_overlapping(self, faculty_id: str, start: datetime, end: datetime) -> List[dict]:
+        """
+        The faculty member's slots intersecting [start, end), as raw {_id, start_time, end_time}.
+        The start_time bound runs on the faculty_start_time_id index; ended
+        slots are archived, so the residual end_time filter sees few documents.
+        """
+        cursor = self.collection.find(
+            {
+                "faculty_id": ObjectId(faculty_id),
+                "start_time": {"$lt": to_utc_naive(end)},
+                "end_time": {"$gt": to_utc_naive(start)},
+            },
+            {"start_time": 1, "end_time": 1},
+        )
+        return await cursor.to_list(length=None)
+
+    async def get_slots_by_faculty(self, faculty_id: str, include_archived: bool = False) -> List[dict]:
+        query = {"faculty_id": ObjectId(faculty_id)}
+        docs = []
+        if include_archived:
+            # Archived slots have ended, so they come before the hot ones
+            docs += await self.archive.find(query).sort("start_time", 1).to_list(length=None)
+        docs += await self.collection.find(query).sort("start_time", 1).to_list(length=None)
         return [self._normalize(d) for d in docs]
 
-    async def get_slot_by_id(self, slot_id: str) -> Optional[dict]:
+    async def get_slots_by_faculty_page(self, faculty_id: str, params: PageParams, include_archived: bool = False) -> dict:
+        tiers = [self.archive, self.collection] if include_archived else [self.collection]
+        return await paginate_tiers(
+            tiers, {"faculty_id": ObjectId(faculty_id)}, "start_time", 1, params, self._normalize
+        )
+
+    @staticmethod
+    def available_pipeline(params: PageParams, now: datetime, include_full: bool = False) -> List[dict]:
+        """
+        Upcoming slots with free seats (or all upcoming slots when
+        include_full, for joining waitlists), soonest first, joined with their faculty.
+        The range and sort run on the start_time_id index and the stages after
+        them stream, so the faculty $lookup runs only until limit + 1 slots
+        with an existing faculty account have been found. Slots whose faculty
+        account is gone are not bookable and are dropped before the $limit,
+        so pages are never short.
+        """
+        match = {"start_time": {"$gt": now}}
+        if not include_full:
+            match["$expr"] = {"$lt": [BOOKED_COUNT_EXPR, "$max_students"]}
+        keyset = keyset_filter("start_time", 1, params.cursor)
+        if keyset:
+            match = {"$and": [match, keyset]}
+        return [
+            {"$match": match},
+            {"$sort": {"start_time": 1, "_id": 1}},
+            {"$lookup": {"from": "users", "localField": "faculty_id", "foreignField": "_id", "as": "faculty"}},
+            {"$match": {"faculty.0": {"$exists": True}}},
+            {"$limit": params.limit + 1},
+            {"$project": {
+                "faculty_id": 1,
+                "title": 1,
+                "start_time": 1,
+                "end_time": 1,
+                "location": 1,
+                "max_students": 1,
+                "booked_count": BOOKED_COUNT_EXPR,
+                "is_full": {"$gte": [BOOKED_COUNT_EXPR, "$max_students"]},
+                "faculty": {"$arrayElemAt": [
+                    {"$map": {
+                        "input": "$faculty",
+                        "as": "f",
+                        "in": {"_id": "$$f._id", "full_name": "$$f.full_name", "email": "$$f.email"},
+                    }},
+                    0,
+                ]},
+            }},
+        ]
+
+    async def get_available_page(self, params: PageParams, include_full: bool = False) -> dict:
+        """One page of bookable slots in a single aggregation round trip."""
+        pipeline = self.available_pipeline(params, datetime.utcnow(), include_full=include_full)
+        docs = await self.collection.aggregate(pipeline).to_list(length=params.limit + 1)
+        next_cursor = None
+        if len(docs) > params.limit:
+            docs = docs[: params.limit]
+            next_cursor = encode_cursor(docs[-1]["start_time"], docs[-1]["_id"])
+        return page_envelope([self._normalize_available(doc) for doc in docs], next_cursor, params.limit)
+
+    async def get_slot_by_id(self, slot_id: str, include_archived: bool = False) -> Optional[dict]:
         doc = await self.collection.find_one({"_id": ObjectId(slot_id)})
+        if not doc and include_archived:
+            doc = await self.archive.find_one({"_id": ObjectId(slot_id)})
         return self._normalize(doc) if doc else None
 
+    async def iter_faculty_slots(self, faculty_id: str) -> AsyncIterator[dict]:
+        """Stream a faculty member's hot slots as raw documents, soonest first (faculty_start_time_id)."""
+        cursor = self.collection.find({"faculty_id": ObjectId(faculty_id)}).sort([("start_time", 1), ("_id", 1)])
+        async for doc in cursor:
+            yield doc
+
+    async def archive_ended_before(
+        self,
+        cutoff: datetime,
+        batch_size: int,
+        on_batch: Optional[Callable[[List[dict]], Awaitable[None]]] = None,
+    ) -> int:
+        """Move slots that ended before `cutoff` to the archive."""
+        return await move_to_archive(
+            self.collection, self.archive, {"end_time": {"$lt": cutoff}}, batch_size, on_batch=on_batch
+        )
+
     async def delete_slot(self, slot_id: str, faculty_id: str) -> bool:
         res = await self.collection.delete_one({
             "_id": ObjectId(slot_id),
@@ -74,34 +219,83 @@ class SlotRepo:
         })
         return res.deleted_count > 0
 
-    async def book_slot(self, slot_id: str, student_id: str) -> bool:
+    async def get_raw_slot(self, slot_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"_id": ObjectId(slot_id)})
+
+    async def reserve_seat(self, slot_id: str, student_id: str) -> Optional[dict]:
         """
-        Attempt to push student into booked_by if room available and not already booked.
-        Returns True if booked, False if already booked or full.
+        Take one seat in a single conditional update: the filter only matches
+        while the slot has not ended, booked_count < max_students and the
+        student is not in a legacy booked_by array, so concurrent bookings can
+        never overbook. Returns the raw slot or None.
         """
-        # ensure not already booked
-        doc = await self.collection.find_one({"_id": ObjectId(slot_id)})
-        if not doc:
-            return False
-        booked = [str(x) for x in doc.get("booked_by", [])]
-        if student_id in booked:
-            return False
-        if len(booked) >= int(doc.get("max_students", 0)):
-            return False
-
-        await self.collection.update_one(
-            {"_id": ObjectId(slot_id)},
-            {"$push": {"booked_by": ObjectId(student_id)}}
+        return await self.collection.find_one_and_update(
+            {
+                "_id": ObjectId(slot_id),
+                "end_time": {"$gt": datetime.utcnow()},
+                "booked_by": {"$ne": ObjectId(student_id)},
+                "$expr": {"$lt": [BOOKED_COUNT_EXPR, "$max_students"]},
+            },
+            [{"$set": {"booked_count": {"$add": [BOOKED_COUNT_EXPR, 1]}}}],
+            return_document=ReturnDocument.AFTER,
         )
-        return True
 
-    async def cancel_booking(self, slot_id: str, student_id: str) -> bool:
+    async def release_seat(self, slot_id: str) -> bool:
         res = await self.collection.update_one(
-            {"_id": ObjectId(slot_id)},
-            {"$pull": {"booked_by": ObjectId(student_id)}}
+            {"_id": ObjectId(slot_id), "$expr": {"$gt": [BOOKED_COUNT_EXPR, 0]}},
+            [{"$set": {"booked_count": {"$add": [BOOKED_COUNT_EXPR, -1]}}}],
         )
         return res.modified_count > 0
 
+    async def has_legacy_booking(self, slot_id: str, student_id: str) -> bool:
+        doc = await self.collection.find_one(
+            {"_id": ObjectId(slot_id), "booked_by": ObjectId(student_id)}, {"_id": 1}
+        )
+        return doc is not None
+
+    async def take_legacy_booking(self, slot_id: str, student_id: str) -> bool:
+        """
+        Remove a student from a legacy booked_by array without freeing the
+        seat: booked_count is pinned to the current count in the same update,
+        so the caller can hand the seat on or release it like any other.
+        """
+        res = await self.collection.update_one(
+            {"_id": ObjectId(slot_id), "booked_by": ObjectId(student_id)},
+            [{"$set": {
+                "booked_count": BOOKED_COUNT_EXPR,
+                "booked_by": {"$filter": {"input": "$booked_by", "cond": {"$ne": ["$$this", ObjectId(student_id)]}}},
+            }}],
+        )
+        return res.modified_count > 0
+
+    async def seat_unavailable_reason(self, slot_id: str) -> str:
+        """Why reserve_seat matched nothing: NOT_FOUND, ENDED or FULL."""
+        doc = await self.collection.find_one({"_id": ObjectId(slot_id)}, {"end_time": 1})
+        if not doc:
+            return BookingOutcome.NOT_FOUND
+        if to_utc_naive(doc["end_time"]) <= datetime.utcnow():
+            return BookingOutcome.ENDED
+        return BookingOutcome.FULL
+
+    def _normalize_available(self, doc: dict) -> dict:
+        faculty = doc["faculty"]
+        return {
+            "id": str(doc["_id"]),
+            "faculty_id": str(doc["faculty_id"]),
+            "title": doc.get("title"),
+            "start_time": to_iso(doc.get("start_time")),
+            "end_time": to_iso(doc.get("end_time")),
+            "location": doc.get("location"),
+            "max_students": int(doc.get("max_students", 0)),
+            "booked_count": doc.get("booked_count", 0),
+            "is_full": doc.get("is_full", False),
+            "faculty": {
+                "id": str(faculty["_id"]),
+                "full_name": faculty.get("full_name"),
+                "email": faculty.get("email"),
+            },
+        }
+
     def _normalize(self, doc: dict) -> dict:
         if not doc:
             raise ValueError("Cannot normalize None or empty document")
@@ -109,11 +303,12 @@ class SlotRepo:
             "id": str(doc["_id"]),
             "faculty_id": str(doc["faculty_id"]),
             "title": doc.get("title"),
-            "start_time": str(doc.get("start_time", "")),
-            "end_time": str(doc.get("end_time", "")),
+            "start_time": to_iso(doc.get("start_time")) or "",
+            "end_time": to_iso(doc.get("end_time")) or "",
             "max_students": int(doc.get("max_students", 0)),
             "location": doc.get("location"),
+            # Legacy entries only; SlotService adds slot_bookings where it is exposed
             "booked_by": [str(x) for x in doc.get("booked_by", [])],
-            "booked_count": len(doc.get("booked_by", [])),
-            "created_at": str(doc.get("created_at", "")),
+            "booked_count": int(doc.get("booked_count", len(doc.get("booked_by", [])))),
+            "created_at": to_iso(doc.get("created_at")) or "",
         }
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+
+
+class SlotWaitlistRepository:
+    """FIFO waitlist per slot: first joined, first promoted when a seat frees up."""
+
+    INDEXES = [
+        IndexModel([("slot_id", ASCENDING), ("student_id", ASCENDING)], unique=True, name="slot_student_unique"),
+        # Queue order; the head of a slot's queue is one index seek
+        IndexModel(
+            [("slot_id", ASCENDING), ("joined_at", ASCENDING), ("_id", ASCENDING)],
+            name="slot_joined_at_id",
+        ),
+    ]
+
+    def __init__(self, db):
+        self.collection: Collection = db["slot_waitlist"]
+
+    async def join(self, slot_id: str, student_id: str) -> Optional[dict]:
+        """Append the student to the slot's queue; None if already waiting."""
+        entry = {
+            "slot_id": ObjectId(slot_id),
+            "student_id": ObjectId(student_id),
+            "joined_at": datetime.utcnow(),
+        }
+        try:
+            await self.collection.insert_one(entry)
+        except DuplicateKeyError:
+            return None
+        return entry
+
+    async def leave(self, slot_id: str, student_id: str) -> bool:
+        res = await self.collection.delete_one({"slot_id": ObjectId(slot_id), "student_id": ObjectId(student_id)})
+        return res.deleted_count > 0
+
+    async def claim_next(self, slot_id: str, claim_seconds: int) -> Optional[dict]:
+        """
+        Atomically mark the head of the queue as being promoted, so each waiter
+        is promoted once. The entry stays queued until finish_claim: a failed
+        promotion hands it back with release_claim, and a claim left behind by
+        a crashed worker expires after claim_seconds.
+        """
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {
+                "slot_id": ObjectId(slot_id),
+                "$or": [{"claim_expires_at": None}, {"claim_expires_at": {"$lte": now}}],
+            },
+            {"$set": {"claim_id": ObjectId(), "claim_expires_at": now + timedelta(seconds=claim_seconds)}},
+            sort=[("joined_at", ASCENDING), ("_id", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def finish_claim(self, entry: dict) -> bool:
+        """Drop a claimed entry once its promotion is decided; False if the claim was lost."""
+        res = await self.collection.delete_one({"_id": entry["_id"], "claim_id": entry["claim_id"]})
+        return res.deleted_count > 0
+
+    async def release_claim(self, entry: dict) -> bool:
+        """Put a claimed entry back at its old place in the queue."""
+        res = await self.collection.update_one(
+            {"_id": entry["_id"], "claim_id": entry["claim_id"]},
+            {"$set": {"claim_id": None, "claim_expires_at": None}},
+        )
+        return res.modified_count > 0
+
+    async def position(self, slot_id: str, student_id: str) -> Optional[int]:
+        """1-based place in the queue, or None if the student is not waiting."""
+        entry = await self.collection.find_one({"slot_id": ObjectId(slot_id), "student_id": ObjectId(student_id)})
+        if not entry:
+            return None
+        ahead = await self.collection.count_documents({
+            "slot_id": entry["slot_id"],
+            "$or": [
+                {"joined_at": {"$lt": entry["joined_at"]}},
+                {"joined_at": entry["joined_at"], "_id": {"$lt": entry["_id"]}},
+            ],
+        })
+        return ahead + 1
+
+    async def delete_for_slot(self, slot_id: str) -> int:
+        res = await self.collection.delete_many({"slot_id": ObjectId(slot_id)})
+        return res.deleted_count
@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from pymongo.collection import Collection
+
+from app.utils.datetime_utils import to_iso
+
+
+class SummaryJobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    ACTIVE = [QUEUED, RUNNING]
+
+
+class SummaryJobRepository:
+    """
+    Summarization jobs, so any API worker can report a job's status. The
+    result itself lives in the summaries store; a finished job only points at it.
+    """
+
+    INDEXES = [
+        # Coalescing: an active job for the same content and type is reused
+        IndexModel(
+            [("content_hash", ASCENDING), ("summary_type", ASCENDING), ("status", ASCENDING)],
+            name="content_hash_type_status",
+        ),
+        # Jobs are kept for a day for status polling
+        IndexModel([("created_at", ASCENDING)], expireAfterSeconds=24 * 3600, name="created_at_ttl"),
+    ]
+
+    def __init__(self, db):
+        self.collection: Collection = db["summary_jobs"]
+
+    async def create(self, content_hash: str, summary_type: str, requested_by: Optional[str], status: str) -> dict:
+        now = datetime.utcnow()
+        doc = {
+            "content_hash": content_hash,
+            "summary_type": summary_type,
+            "requested_by": requested_by,
+            "status": status,
+            "error": None,
+            "created_at": now,
+            "started_at": now if status == SummaryJobStatus.RUNNING else None,
+            "finished_at": now if status == SummaryJobStatus.DONE else None,
+        }
+        res = await self.collection.insert_one(doc)
+        doc["_id"] = res.inserted_id
+        return self._normalize(doc)
+
+    async def find_active(self, content_hash: str, summary_type: str, created_after: datetime) -> Optional[dict]:
+        doc = await self.collection.find_one({
+            "content_hash": content_hash,
+            "summary_type": summary_type,
+            "status": {"$in": SummaryJobStatus.ACTIVE},
+            "created_at": {"$gt": created_after},
+        })
+        return self._normalize(doc) if doc else None
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        if not ObjectId.is_valid(job_id):
+            return None
+        doc = await self.collection.find_one({"_id": ObjectId(job_id)})
+        return self._normalize(doc) if doc else None
+
+    async def transition(self, job_id: str, from_statuses: list, status: str, error: Optional[str] = None) -> Optional[dict]:
+        """Move a job to `status` only if it is still in one of `from_statuses`; None if it was not."""
+        now = datetime.utcnow()
+        update = {"status": status}
+        if status == SummaryJobStatus.RUNNING:
+            update["started_at"] = now
+        else:
+            update["finished_at"] = now
+            update["error"] = error
+        doc = await self.collection.find_one_and_update(
+            {"_id": ObjectId(job_id), "status": {"$in": from_statuses}},
+            {"$set": update},
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._normalize(doc) if doc else None
+
+    def _normalize(self, doc: dict) -> dict:
+        return {
+            "id": str(doc["_id"]),
+            "content_hash": doc["content_hash"],
+            "summary_type": doc["summary_type"],
+            "requested_by": doc.get("requested_by"),
+            "status": doc["status"],
+            "error": doc.get("error"),
+            "created_at": to_iso(doc.get("created_at")),
+            "started_at": to_iso(doc.get("started_at")),
+            "finished_at": to_iso(doc.get("finished_at")),
+        }
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.collection import Collection
+
+
+class SummaryRepository:
+    """
+    Generated document summaries, keyed by what determines the output: the
+    file's content hash, the summary type and the model/prompt version. The
+    same file uploaded twice (or summarized from /summarize/local) shares entries,
+    and bumping the version orphans old entries instead of serving them.
+    """
+
+    INDEXES = [
+        IndexModel(
+            [("content_hash", ASCENDING), ("summary_type", ASCENDING), ("version", ASCENDING)],
+            unique=True,
+            name="content_hash_type_version_unique",
+        ),
+    ]
+
+    def __init__(self, db):
+        self.collection: Collection = db["summaries"]
+
+    async def get(self, content_hash: str, summary_type: str, version: str) -> Optional[str]:
+        doc = await self.collection.find_one(
+            {"content_hash": content_hash, "summary_type": summary_type, "version": version},
+            {"summary": 1},
+        )
+        return doc["summary"] if doc else None
+
+    async def put(self, content_hash: str, summary_type: str, version: str, summary: str):
+        await self.collection.update_one(
+            {"content_hash": content_hash, "summary_type": summary_type, "version": version},
+            {"$set": {"summary": summary, "created_at": datetime.utcnow()}},
+            upsert=True,
+        )
@@ -1,10 +1,23 @@
-from typing import Optional
+from typing import AsyncIterator, List, Optional
 
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 from pymongo.collection import Collection
 
+from app.schemas.notice import NoticeEmailMode
+from app.utils.student_year import admission_year_filter
+
 
 class UserRepository:
+    INDEXES = [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        # cohort fan-out (role, mode $in, admission_year) and digest distinct
+        IndexModel(
+            [("role", ASCENDING), ("notice_email_mode", ASCENDING), ("admission_year", ASCENDING)],
+            name="role_notice_mode_admission_year",
+        ),
+    ]
+
     def __init__(self, db):
         self.collection: Collection = db["users"]
 
@@ -18,3 +31,50 @@ class UserRepository:
         result = await self.collection.insert_one(user_data)
         user_data["_id"] = result.inserted_id
         return user_data
+
+    async def set_notice_email_mode(self, user_id: str, mode: str):
+        await self.collection.update_one(
+            {"_id": ObjectId(user_id)},
+            {"$set": {"notice_email_mode": mode}}
+        )
+
+    async def iter_student_emails(
+        self,
+        student_year: Optional[int],
+        modes: List[str],
+        batch_size: int = 1000,
+    ) -> AsyncIterator[str]:
+        """
+        Stream emails of students in one year cohort (or all students when
+        student_year is None) whose notice_email_mode is in `modes`.
+        Users without a stored mode are treated as immediate.
+        """
+        query = {"role": "student"}
+        if student_year is not None:
+            query["admission_year"] = admission_year_filter(student_year)
+        mode_values = [NoticeEmailMode(mode).value for mode in modes]
+        if NoticeEmailMode.immediate.value in mode_values:
+            mode_values.append(None)
+        query["notice_email_mode"] = {"$in": mode_values}
+        cursor = self.collection.find(query, {"email": 1, "_id": 0}).batch_size(batch_size)
+        async for doc in cursor:
+            yield doc["email"]
+
+    async def get_digest_admission_years(self) -> List[Optional[int]]:
+        """Distinct admission years of students subscribed to the daily digest."""
+        return await self.collection.distinct(
+            "admission_year",
+            {"role": "student", "notice_email_mode": NoticeEmailMode.daily_digest.value},
+        )
+
+    async def iter_digest_emails(self, admission_year: Optional[int], batch_size: int = 1000) -> AsyncIterator[str]:
+        cursor = self.collection.find(
+            {
+                "role": "student",
+                "notice_email_mode": NoticeEmailMode.daily_digest.value,
+                "admission_year": admission_year,
+            },
+            {"email": 1, "_id": 0},
+        ).batch_size(batch_size)
+        async for doc in cursor:
+            yield doc["email"]
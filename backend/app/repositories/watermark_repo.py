@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from pymongo.collection import Collection
+
+
+class WatermarkRepository:
+    """
+    Per-scope change counters shared by all API workers (e.g. notice feeds,
+    calendar feeds); a cached response is current while its scopes' counters are.
+    """
+
+    INDEXES = [
+        # Workers poll for counters bumped since their last refresh
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+    ]
+
+    def __init__(self, db, collection_name: str):
+        self.collection: Collection = db[collection_name]
+
+    async def bump(self, scopes: List[str]) -> Dict[str, int]:
+        updated = {}
+        for scope in scopes:
+            doc = await self.collection.find_one_and_update(
+                {"_id": scope},
+                # Server time, so every worker compares against the same clock
+                {"$inc": {"v": 1}, "$currentDate": {"updated_at": True}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            updated[scope] = doc["v"]
+        return updated
+
+    async def get_changed_since(self, since: Optional[datetime]) -> Tuple[Dict[str, int], Optional[datetime]]:
+        """
+        Counters bumped at or after `since` (every counter when None), and the
+        newest updated_at among them (None when nothing matched).
+        """
+        query = {} if since is None else {"updated_at": {"$gte": since}}
+        docs = await self.collection.find(query).to_list(length=None)
+        stamps = [doc["updated_at"] for doc in docs if doc.get("updated_at")]
+        return {doc["_id"]: doc["v"] for doc in docs}, max(stamps, default=None)
+
+
+class NoticeWatermarkRepository(WatermarkRepository):
+    def __init__(self, db):
+        super().__init__(db, "notice_watermarks")
+
+
+class CalendarWatermarkRepository(WatermarkRepository):
+    def __init__(self, db):
+        super().__init__(db, "calendar_watermarks")
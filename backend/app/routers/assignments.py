@@ -12,13 +12,14 @@ from app.schemas.assignment import (
     AssignmentCreate,
     AssignmentOut,
     SubmissionOut,
-    AssignmentListResponse,
     SubmissionListResponse
 )
 from app.schemas.user import UserInDB
 from app.core.dependencies import get_current_user, require_role
 from app.constants.roles import UserRole
 from app.services.assignment_service import AssignmentService
+from app.schemas.pagination import Page
+from app.utils.pagination import PageParams
 from app.utils.assignment_storage import (
     save_assignment_file,
     save_submission_file,
@@ -90,19 +91,19 @@ async def create_assignment(
         raise HTTPException(status_code=500, detail=f"Failed to create assignment: {str(e)}")
 
 
-@router.get("/", response_model=AssignmentListResponse)
+@router.get("/", response_model=Page[AssignmentOut])
 async def list_assignments(
+    page: PageParams = Depends(),
     service: AssignmentService = Depends(get_service)
 ):
     """
-    List all assignments (available to all authenticated users).
+    List assignments, newest first (available to all authenticated users).
+    Keyset paginated: pass `next_cursor` back as `cursor` for the next page.
     """
     try:
-        assignments = await service.list_assignments()
-        return {
-            'assignments': assignments,
-            'total': len(assignments)
-        }
+        return await service.list_assignments(page)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list assignments: {str(e)}")
 
@@ -5,8 +5,10 @@ from app.core.dependencies import get_user_repo, get_current_user, require_role
 from app.db.session import get_db
 from app.repositories.user_repo import UserRepository
 from app.repositories.otp_repo import OTPRepository
+from app.repositories.email_outbox_repo import EmailOutboxRepository
 from app.services.auth_service import AuthService
 from app.services.otp_service import OTPService
+from app.services.email_outbox_service import EmailOutboxService
 from app.schemas.user import (
     UserCreateStudent,
     UserCreateFaculty,
@@ -117,15 +119,16 @@ async def request_otp(
             "verified": True
         }
     
-    # Send OTP
+    # Queue OTP email (delivered in the background)
     db = get_db()
     otp_repo = OTPRepository(db)
-    otp_service = OTPService(otp_repo, user_repo)
-    await otp_service.send_verification_otp(data.email)
+    otp_service = OTPService(otp_repo, user_repo, EmailOutboxService(EmailOutboxRepository(db)))
+    email_id = await otp_service.send_verification_otp(data.email)
     
     return {
         "message": "OTP sent successfully. Please check your email.",
-        "email": data.email
+        "email": data.email,
+        "email_id": email_id
     }
 
 
@@ -137,7 +140,7 @@ async def verify_email_otp(
     """Verify email with OTP"""
     db = get_db()
     otp_repo = OTPRepository(db)
-    otp_service = OTPService(otp_repo, user_repo)
+    otp_service = OTPService(otp_repo, user_repo, EmailOutboxService(EmailOutboxRepository(db)))
     
     result = await otp_service.verify_email_otp(data.email, data.otp)
     return {"message": "Email verified successfully", "verified": result}
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+
+from app.db.session import get_db
+from app.repositories.email_outbox_repo import EmailOutboxRepository
+from app.services.email_outbox_service import EmailOutboxService
+from app.schemas.email import EmailStatusOut
+
+router = APIRouter(prefix="/emails", tags=["Emails"])
+
+
+def get_email_service(db=Depends(get_db)) -> EmailOutboxService:
+    return EmailOutboxService(EmailOutboxRepository(db))
+
+
+# Delivery status of a queued email (e.g. the id returned by /auth/request-otp)
+@router.get("/{email_id}/status", response_model=EmailStatusOut)
+async def get_email_status(
+    email_id: str,
+    service: EmailOutboxService = Depends(get_email_service),
+):
+    return await service.get_status(email_id)
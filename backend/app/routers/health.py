@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.services.summary_jobs import get_summary_job_manager
+from app.utils.model_registry import get_model_registry
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+# Liveness: the worker is up and serving requests
+@router.get("")
+async def health():
+    return {"status": "ok"}
+
+
+# Readiness of the AI models: 503 while warming up or after a model failed to load
+@router.get("/models")
+async def models_health():
+    status = get_model_registry().status()
+    status["summary_pool"] = get_summary_job_manager().stats()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
@@ -1,22 +1,55 @@
 # app/routers/notices.py
-from fastapi import APIRouter, Depends, HTTPException
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
 
-from app.core.dependencies import get_current_user, require_role, get_user_repo
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.dependencies import (
+    get_current_user,
+    get_stream_token_payload,
+    get_token_payload,
+    require_role,
+    get_user_repo,
+)
 from app.constants.roles import UserRole
-from app.schemas.notice import NoticeCreate, NoticeOut, NoticeCategory
+from app.schemas.notice import (
+    NoticeCreate,
+    NoticeOut,
+    NoticeCategory,
+    NoticeNotificationPreference,
+    NoticeSearchHit,
+)
 from app.repositories.notice_repo import NoticeRepository
+from app.repositories.user_repo import UserRepository
 from app.services.notice_service import NoticeService
+from app.services.notice_events import NoticeEventHub, get_notice_event_hub
+from app.services.notice_feed_cache import (
+    GLOBAL_SCOPE,
+    NoticeFeedCache,
+    category_scope,
+    get_notice_feed_cache,
+    year_feed_scopes,
+)
+from app.services.notice_notification_service import (
+    NoticeNotificationService,
+    build_notice_notification_service,
+)
 from app.schemas.user import UserInDB
+from app.schemas.pagination import Page
+from app.utils.pagination import PageParams
 from app.db.session import get_db
+from app.utils.student_year import extract_admission_year, student_year_for_admission
 
 router = APIRouter(prefix="/notices", tags=["Notices"])
 
 
 def get_notice_service(db=Depends(get_db)):
     repo = NoticeRepository(db)
-    return NoticeService(repo)
+    return NoticeService(repo, get_notice_feed_cache(), get_notice_event_hub())
+
+
+def get_notification_service(db=Depends(get_db)) -> NoticeNotificationService:
+    return build_notice_notification_service(db)
 
 
 # Helper: derive student year from Bennett email like s24cse...
@@ -27,86 +60,192 @@ def extract_student_year_from_email(email: str) -> int:
     Returns an integer >= 1. Raises HTTPException if pattern is not recognized.
     """
     try:
-        # naive but effective: letters then two digits after initial 's' or 'S'
-        lower = email.lower()
-        idx = lower.find("@")
-        local = lower if idx == -1 else lower[:idx]
-        # find first occurrence of 's' followed by two digits
-        import re
-        m = re.search(r"s(\d{2})", local)
-        if not m:
-            raise ValueError("Admission year not found in email")
-        yy = int(m.group(1))
-        full_adm_year = 2000 + yy
-        current_year = datetime.utcnow().year
-        student_year = current_year - full_adm_year + 1
-        if student_year < 1:
-            student_year = 1
-        return student_year
+        return student_year_for_admission(extract_admission_year(email))
     except Exception:
         raise HTTPException(status_code=400, detail="Cannot extract student year from email")
 
 
+async def email_from_token(token: dict, user_repo: UserRepository) -> str:
+    """The email claim lets feed requests skip Mongo; tokens issued before it existed fall back to a lookup."""
+    email = token.get("email")
+    if email is None:
+        user = await user_repo.get_by_id(token["sub"])
+        if not user:
+            raise HTTPException(status_code=401, detail="Could not validate credentials")
+        email = user["email"]
+    return email
+
+
 # 1. Faculty creates notice (must include category; optional target_years)
 @router.post("/", dependencies=[Depends(require_role([UserRole.FACULTY]))])
 async def create_notice(
     data: NoticeCreate,
+    background_tasks: BackgroundTasks,
     service: NoticeService = Depends(get_notice_service),
+    notifier: NoticeNotificationService = Depends(get_notification_service),
     current_user: UserInDB = Depends(get_current_user)
 ):
     notice = await service.create_notice(current_user.id, data)
+    # Email fan-out runs after the response is sent
+    background_tasks.add_task(notifier.notify_new_notice, notice)
     return notice
 
 
-# 2. Everyone can see all notices (unfiltered)
-@router.get("/all", response_model=list[NoticeOut])
-async def get_all_notices(service: NoticeService = Depends(get_notice_service)):
-    return await service.get_all_notices()
+# 2. Everyone can see all notices (newest first, optionally one category, keyset paginated)
+# Feed endpoints send an ETag and answer If-None-Match with 304 (see notice_feed_cache)
+@router.get("/all", response_model=Page[NoticeOut])
+async def get_all_notices(
+    request: Request,
+    page: PageParams = Depends(),
+    category: Optional[NoticeCategory] = None,
+    include_archived: bool = Query(False, description="Continue into archived notices after the recent ones"),
+    service: NoticeService = Depends(get_notice_service),
+    cache: NoticeFeedCache = Depends(get_notice_feed_cache)
+):
+    scopes = [category_scope(category)] if category else [GLOBAL_SCOPE]
+    category_value = category.value if category else None
+    return await cache.respond(
+        request, scopes, f"all:{category_value}:{page.cursor}:{page.limit}:{include_archived}",
+        lambda: service.list_notices_page(page, include_archived=include_archived, category=category_value),
+    )
+
+
+# Full-text search over title and content, ranked by relevance (keyset paginated)
+@router.get("/search", response_model=Page[NoticeSearchHit])
+async def search_notices(
+    q: str = Query(..., min_length=1, max_length=200, description="Words or \"quoted phrases\"; -word excludes"),
+    category: Optional[NoticeCategory] = None,
+    year: Optional[int] = Query(None, ge=1, le=10, description="Only notices visible to this year"),
+    page: PageParams = Depends(),
+    service: NoticeService = Depends(get_notice_service)
+):
+    return await service.search_notices(
+        q, page, category=category.value if category else None, year=year
+    )
 
 
 # 3. Get notices by a specific faculty
 @router.get("/faculty/{faculty_id}", response_model=list[NoticeOut])
 async def get_faculty_notices(
     faculty_id: str,
+    include_archived: bool = Query(False, description="Also list archived notices"),
     service: NoticeService = Depends(get_notice_service)
 ):
-    return await service.get_faculty_notices(faculty_id)
+    return await service.get_faculty_notices(faculty_id, include_archived=include_archived)
 
 
 # 4. Get notices by category (unfiltered by year)
 @router.get("/category/{category}", response_model=list[NoticeOut])
 async def get_notices_by_category(
+    request: Request,
     category: NoticeCategory,
-    service: NoticeService = Depends(get_notice_service)
+    service: NoticeService = Depends(get_notice_service),
+    cache: NoticeFeedCache = Depends(get_notice_feed_cache)
 ):
-    return await service.get_notices_by_category(category.value)
+    return await cache.respond(
+        request, [category_scope(category.value)], f"category:{category.value}",
+        lambda: service.get_notices_by_category(category.value),
+    )
 
 
 # 5. Get notices by category + year (e.g. show CSET notices for 1st year)
 @router.get("/category/{category}/year/{year}", response_model=list[NoticeOut])
 async def get_notices_by_category_and_year(
     category: NoticeCategory,
+    request: Request,
     year: int,
-    service: NoticeService = Depends(get_notice_service)
+    limit: int = Query(50, ge=1, le=200),
+    service: NoticeService = Depends(get_notice_service),
+    cache: NoticeFeedCache = Depends(get_notice_feed_cache)
 ):
-    return await service.get_notices_by_category_and_year(category.value, year)
+    # Only notices of this category can change this feed
+    return await cache.respond(
+        request, [category_scope(category.value)], f"category:{category.value}:year:{year}:{limit}",
+        lambda: service.get_notices_by_category_and_year(category.value, year, limit=limit),
+    )
 
 
 # 6. Student feed — notices relevant to the current student's computed year
-@router.get("/student-feed", response_model=list[NoticeOut])
+# (newest first, optionally one category, keyset paginated)
+@router.get("/student-feed", response_model=Page[NoticeOut])
 async def get_student_feed(
-    current_user: UserInDB = Depends(get_current_user),
-    service: NoticeService = Depends(get_notice_service)
+    request: Request,
+    page: PageParams = Depends(),
+    category: Optional[NoticeCategory] = None,
+    token: dict = Depends(get_token_payload),
+    user_repo: UserRepository = Depends(get_user_repo),
+    service: NoticeService = Depends(get_notice_service),
+    cache: NoticeFeedCache = Depends(get_notice_feed_cache)
 ):
+    # With the email claim a revalidation (304) never touches Mongo
+    email = await email_from_token(token, user_repo)
+    category_value = category.value if category else None
+
     # only students expected here; but allow others to see general feed (optional)
     try:
-        student_year = extract_student_year_from_email(current_user.email)
+        student_year = extract_student_year_from_email(email)
     except HTTPException:
         # if we can't find student year, return general feed (all notices)
-        return await service.get_all_notices()
+        return await cache.respond(
+            request, [category_scope(category)] if category else [GLOBAL_SCOPE],
+            f"all:{category_value}:{page.cursor}:{page.limit}:False",
+            lambda: service.list_notices_page(page, category=category_value),
+        )
+
+    # return notices targeted to their year (or global); every notice of a
+    # category bumps its scope, so a category feed only needs that one
+    scopes = [category_scope(category)] if category else year_feed_scopes(student_year)
+    return await cache.respond(
+        request, scopes, f"feed:year:{student_year}:{category_value}:{page.cursor}:{page.limit}",
+        lambda: service.notices_for_year_page(student_year, page, category=category_value),
+    )
+
+
+# Push channel: server-sent notice_created / notice_deleted events for the
+# caller's year (and optional categories); replaces polling the student feed.
+# EventSource cannot set headers, so the token may be passed as ?access_token=
+@router.get("/stream")
+async def stream_notice_events(
+    category: Optional[List[NoticeCategory]] = Query(None),
+    last_event_id: Optional[str] = Header(None),
+    token: dict = Depends(get_stream_token_payload),
+    user_repo: UserRepository = Depends(get_user_repo),
+    hub: NoticeEventHub = Depends(get_notice_event_hub)
+):
+    email = await email_from_token(token, user_repo)
+    try:
+        year = extract_student_year_from_email(email)
+    except HTTPException:
+        # Not a student email: receive every notice, like the general feed
+        year = None
+    categories = [c.value for c in category] if category else None
+    return StreamingResponse(
+        hub.stream(year, categories, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Student chooses how notices reach them by email (immediate, daily digest, or off)
+@router.get("/notifications/preferences", response_model=NoticeNotificationPreference,
+            dependencies=[Depends(require_role([UserRole.STUDENT]))])
+async def get_notification_preferences(
+    current_user: UserInDB = Depends(get_current_user),
+    user_repo: UserRepository = Depends(get_user_repo)
+):
+    user = await user_repo.get_by_id(current_user.id)
+    return {"mode": user.get("notice_email_mode") or "immediate"}
+
 
-    # return notices targeted to their year (or global)
-    return await service.get_notices_for_year(student_year)
+@router.put("/notifications/preferences", response_model=NoticeNotificationPreference,
+            dependencies=[Depends(require_role([UserRole.STUDENT]))])
+async def set_notification_preferences(
+    data: NoticeNotificationPreference,
+    current_user: UserInDB = Depends(get_current_user),
+    user_repo: UserRepository = Depends(get_user_repo)
+):
+    await user_repo.set_notice_email_mode(current_user.id, data.mode.value)
+    return data
 
 
 # 7. Faculty deletes own notice
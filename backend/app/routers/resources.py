@@ -1,12 +1,18 @@
-from fastapi import APIRouter, UploadFile, Depends, HTTPException, Form
-from fastapi.responses import FileResponse
+import asyncio
+
+from fastapi import APIRouter, BackgroundTasks, UploadFile, Depends, HTTPException, Form
+from fastapi.responses import FileResponse, StreamingResponse
 from app.schemas.user import UserInDB
 from app.core.dependencies import get_current_user, require_role
 from app.constants.roles import UserRole
-from app.utils.resource_storage import save_resource_file
-from app.utils.pdf_ppt_summarizer import summarize_file
+from app.utils.resource_storage import file_sha256, save_resource_file
 from app.repositories.resource_repo import ResourceRepo
+from app.repositories.summary_repo import SummaryRepository
 from app.services.resource_service import ResourceService
+from app.schemas.pagination import Page
+from app.schemas.resource import ResourceOut, SummaryJobOut
+from app.services.summary_jobs import get_summary_job_manager
+from app.utils.pagination import PageParams
 from app.db.session import get_db
 import os
 
@@ -14,13 +20,14 @@ router = APIRouter(prefix="/resources", tags=["Resources"])
 
 def get_service(db=Depends(get_db)):
     repo = ResourceRepo(db)
-    return ResourceService(repo)
+    return ResourceService(repo, SummaryRepository(db), get_summary_job_manager())
 
 
 # Faculty uploads a resource
 @router.post("/upload", dependencies=[Depends(require_role([UserRole.FACULTY]))])
 async def upload_resource(
     file: UploadFile,
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     course_code: str = Form(...),
     course_name: str = Form(...),
@@ -39,14 +46,18 @@ async def upload_resource(
             raise HTTPException(status_code=400, detail="Only PDF and PPT/PPTX files are allowed")
         
         path = await save_resource_file(file)
+        content_hash = await asyncio.to_thread(file_sha256, path)
 
         resource = await service.create_resource(
             faculty_id=current_user.id,
             file_path=path,
             title=title,
             description=description or "",
-            course={"code": course_code, "name": course_name}
+            course={"code": course_code, "name": course_name},
+            content_hash=content_hash,
         )
+        # Summaries of every length are generated after the response is sent
+        background_tasks.add_task(service.precompute_summaries, path, content_hash)
 
         return resource
     except HTTPException:
@@ -58,10 +69,13 @@ async def upload_resource(
         raise HTTPException(status_code=500, detail=f"Failed to upload resource: {str(e)}")
 
 
-# List all resources for students
-@router.get("/all")
-async def list_resources(service: ResourceService = Depends(get_service)):
-    return await service.repo.list_all()
+# List resources for students (newest first, keyset paginated)
+@router.get("/all", response_model=Page[ResourceOut])
+async def list_resources(
+    page: PageParams = Depends(),
+    service: ResourceService = Depends(get_service)
+):
+    return await service.repo.list_page(page)
 
 
 # IMPORTANT: Specific routes must come BEFORE parameterized routes
@@ -73,10 +87,44 @@ async def summarize_local_file(
     service: ResourceService = Depends(get_service)
 ):
     temp_path = await save_resource_file(file)
-    summary = summarize_file(temp_path, summary_type)
+    summary = await service.summarize_temp_file(temp_path, summary_type)
     return {"summary": summary}
 
 
+# Summarize a local file as a background job; poll /summary-jobs/{job_id} for the result
+@router.post("/summarize/local/jobs", response_model=SummaryJobOut, status_code=202)
+async def submit_local_summary_job(
+    file: UploadFile,
+    summary_type: str = Form("short"),
+    current_user: UserInDB = Depends(get_current_user),
+    service: ResourceService = Depends(get_service)
+):
+    temp_path = await save_resource_file(file)
+    content_hash = await asyncio.to_thread(file_sha256, temp_path)
+    job = await service.jobs.submit(temp_path, content_hash, summary_type, requested_by=current_user.id)
+    return await service.jobs.get(job["id"])
+
+
+# Poll a summary job (must come before /{resource_id}/... routes)
+@router.get("/summary-jobs/{job_id}", response_model=SummaryJobOut)
+async def get_summary_job(
+    job_id: str,
+    current_user: UserInDB = Depends(get_current_user),
+    service: ResourceService = Depends(get_service)
+):
+    return await service.jobs.get(job_id)
+
+
+# Cancel a queued or running summary job you submitted
+@router.delete("/summary-jobs/{job_id}", response_model=SummaryJobOut)
+async def cancel_summary_job(
+    job_id: str,
+    current_user: UserInDB = Depends(get_current_user),
+    service: ResourceService = Depends(get_service)
+):
+    return await service.jobs.cancel(job_id, current_user.id)
+
+
 # Download a resource file (must come before /{resource_id}/summarize)
 @router.get("/{resource_id}/download")
 async def download_resource(
@@ -98,7 +146,44 @@ async def download_resource(
     )
 
 
-# Summarize an uploaded resource
+# Summarize an uploaded resource as a background job
+@router.post("/{resource_id}/summary-jobs", response_model=SummaryJobOut, status_code=202)
+async def submit_summary_job(
+    resource_id: str,
+    summary_type: str = "short",
+    current_user: UserInDB = Depends(get_current_user),
+    service: ResourceService = Depends(get_service)
+):
+    res = await service.repo.get(resource_id)
+    if not res:
+        raise HTTPException(404, "Resource not found")
+    content_hash = await service.resource_content_hash(res)
+    job = await service.jobs.submit(res["file_path"], content_hash, summary_type, requested_by=current_user.id)
+    return await service.jobs.get(job["id"])
+
+
+# Summarize an uploaded resource as server-sent events: `token` events as the
+# LLM writes, then `done`; a stored summary is replayed at once
+@router.get("/{resource_id}/summarize/stream")
+async def stream_resource_summary(
+    resource_id: str,
+    summary_type: str = "short",
+    service: ResourceService = Depends(get_service)
+):
+    service.check_summary_type(summary_type)
+    res = await service.repo.get(resource_id)
+    if not res:
+        raise HTTPException(404, "Resource not found")
+    content_hash = await service.resource_content_hash(res)
+    events = await service.open_summary_stream(res["file_path"], content_hash, summary_type)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Summarize an uploaded resource (waits for the job; prefer /summary-jobs for long documents)
 @router.get("/{resource_id}/summarize")
 async def summarize_resource(
     resource_id: str,
@@ -109,5 +194,6 @@ async def summarize_resource(
     if not res:
         raise HTTPException(404, "Resource not found")
 
-    summary = summarize_file(res["file_path"], summary_type)
+    # One indexed lookup once the summary exists (precomputed at upload)
+    summary = await service.summarize_uploaded_resource(res, summary_type)
     return {"summary": summary}
@@ -1,22 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
 from datetime import datetime
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
+from typing import List
 from app.db.session import get_db
+from app.repositories.slot_booking_repo import SlotBookingRepository
 from app.repositories.slot_repo import SlotRepo
-from app.services.slot_services import SlotService
-from app.schemas.slot import SlotCreate, SlotOut, SlotListItem
-from app.core.dependencies import get_current_user, require_role
+from app.services.calendar_feed import (
+    CalendarFeedCache,
+    bookings_feed_since,
+    faculty_scope,
+    get_calendar_feed_cache,
+    render_bookings_feed,
+    render_faculty_feed,
+    student_scope,
+)
+from app.services.slot_services import SlotService, build_slot_service
+from app.schemas.slot import (
+    AvailableSlot,
+    CalendarLinks,
+    RecurringSlotCreate,
+    RecurringSlotResult,
+    SlotBookingOut,
+    SlotCreate,
+    SlotListItem,
+    SlotOut,
+)
+from app.schemas.pagination import Page
+from app.utils.pagination import PageParams
+from app.core.dependencies import get_calendar_token_payload, get_current_user, require_role
+from app.core.security import create_calendar_token
 from app.schemas.user import UserInDB
 from app.constants.roles import UserRole
-from app.repositories.user_repo import UserRepository
 
 
 router = APIRouter(prefix="/slots", tags=["Slots"])
 
 
 def get_slot_service(db=Depends(get_db)):
-    repo = SlotRepo(db)
-    return SlotService(repo)
+    return build_slot_service(db)
 
 
 # Faculty creates slot
@@ -56,115 +79,120 @@ async def create_slot(
         )
 
 
+# Faculty creates a weekly series of slots (e.g. a semester of office hours) in one request
+@router.post("/recurring", response_model=RecurringSlotResult, dependencies=[Depends(require_role([UserRole.FACULTY]))])
+async def create_recurring_slots(
+    rule: RecurringSlotCreate,
+    service: SlotService = Depends(get_slot_service),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    return await service.create_recurring_slots(current_user.id, rule)
+
+
 # IMPORTANT: Specific routes must come BEFORE parameterized routes
-# Get all available slots (for students to browse)
-@router.get("/available")
+# Get all available slots (for students to browse): upcoming, not full unless include_full, soonest first
+@router.get("/available", response_model=Page[AvailableSlot])
 async def list_available_slots(
+    page: PageParams = Depends(),
+    include_full: bool = Query(False, description="Also list full slots (is_full=true), whose waitlist can be joined"),
+    service: SlotService = Depends(get_slot_service)
+):
+    return await service.list_available_slots(page, include_full=include_full)
+
+
+# Student lists their own bookings (upcoming by default), soonest first
+@router.get("/my-bookings", response_model=Page[SlotBookingOut], dependencies=[Depends(require_role([UserRole.STUDENT]))])
+async def my_bookings(
+    page: PageParams = Depends(),
+    include_past: bool = Query(False, description="Also list bookings for slots that have ended"),
     service: SlotService = Depends(get_slot_service),
-    db=Depends(get_db)
+    current_user: UserInDB = Depends(get_current_user)
 ):
-    try:
-        from bson import ObjectId
-        repo_user = UserRepository(db)
-        
-        # get all faculty slots
-        slots = await service.repo.collection.find().to_list(length=None)
-        
-        available_slots = []
-        current_time = datetime.utcnow()
-        
-        for s in slots:
-            try:
-                booked_count = len(s.get("booked_by", []))
-                max_students = s.get("max_students", 0)
-                
-                # Parse start_time - handle both string and datetime
-                start_time_str = s.get("start_time")
-                if isinstance(start_time_str, str):
-                    start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                    # Make naive if timezone-aware for comparison
-                    if start_time.tzinfo:
-                        start_time = start_time.replace(tzinfo=None)
-                elif isinstance(start_time_str, datetime):
-                    start_time = start_time_str
-                    if start_time.tzinfo:
-                        start_time = start_time.replace(tzinfo=None)
-                else:
-                    continue
-                
-                # only available slots (not full and not in the past)
-                if booked_count < max_students and start_time > current_time:
-                    # faculty_id is stored as ObjectId in the database
-                    faculty_id = s.get("faculty_id")
-                    if not faculty_id:
-                        continue
-                    
-                    # Ensure faculty_id is ObjectId for query
-                    if isinstance(faculty_id, str):
-                        faculty_id = ObjectId(faculty_id)
-                    
-                    faculty_doc = await repo_user.collection.find_one({"_id": faculty_id})
-                    if not faculty_doc:
-                        continue
-                    
-                    # normalize faculty info
-                    faculty_info = {
-                        "id": str(faculty_doc["_id"]),
-                        "full_name": faculty_doc.get("full_name"),
-                        "email": faculty_doc.get("email"),
-                    }
-                    
-                    available_slots.append({
-                        "id": str(s["_id"]),
-                        "faculty_id": str(s["faculty_id"]),
-                        "title": s.get("title"),
-                        "start_time": s.get("start_time"),
-                        "end_time": s.get("end_time"),
-                        "location": s.get("location"),
-                        "max_students": max_students,
-                        "booked_count": booked_count,
-                        "faculty": faculty_info
-                    })
-            except Exception as e:
-                # Skip slots with errors, log and continue
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Error processing slot {s.get('_id')}: {str(e)}")
-                continue
-        
-        # Sort by start_time
-        available_slots.sort(key=lambda x: x["start_time"])
-        return available_slots
-    except Exception as e:
-        import logging
-        import traceback
-        logger = logging.getLogger(__name__)
-        logger.error(f"Error in list_available_slots: {str(e)}\n{traceback.format_exc()}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to load available slots: {str(e)}"
-        )
+    return await service.list_my_bookings(current_user.id, page, include_past=include_past)
+
+
+# Subscription URLs for calendar apps: faculty get their slots, students their bookings
+@router.get("/calendar/links", response_model=CalendarLinks)
+async def calendar_links(
+    request: Request,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    token = create_calendar_token(current_user.id, current_user.role.value)
+    links = {"token": token}
+    if current_user.role == UserRole.FACULTY:
+        url = request.url_for("faculty_calendar_feed", faculty_id=current_user.id)
+        links["faculty_feed"] = f"{url}?token={token}"
+    elif current_user.role == UserRole.STUDENT:
+        url = request.url_for("student_calendar_feed", student_id=current_user.id)
+        links["bookings_feed"] = f"{url}?token={token}"
+    return links
+
+
+# .ics feeds authenticate with ?token= (calendar apps cannot send headers) and
+# are served from the calendar feed cache with ETag revalidation.
+# A faculty member's slots are public (see /faculty/{faculty_id}), so any calendar token may read them.
+@router.get("/calendar/faculty/{faculty_id}.ics", name="faculty_calendar_feed", response_class=Response)
+async def faculty_calendar_feed(
+    faculty_id: str,
+    request: Request,
+    payload: dict = Depends(get_calendar_token_payload),
+    db=Depends(get_db),
+    cache: CalendarFeedCache = Depends(get_calendar_feed_cache)
+):
+    if not ObjectId.is_valid(faculty_id):
+        raise HTTPException(status_code=404, detail="Calendar not found")
+    return cache.respond(
+        request,
+        faculty_scope(faculty_id),
+        "faculty",
+        "benny-office-hours.ics",
+        lambda: render_faculty_feed(SlotRepo(db), faculty_id),
+    )
+
+
+# A student's bookings feed is readable only with that student's own calendar token
+@router.get("/calendar/students/{student_id}.ics", name="student_calendar_feed", response_class=Response)
+async def student_calendar_feed(
+    student_id: str,
+    request: Request,
+    payload: dict = Depends(get_calendar_token_payload),
+    db=Depends(get_db),
+    cache: CalendarFeedCache = Depends(get_calendar_feed_cache)
+):
+    if payload["sub"] != student_id:
+        raise HTTPException(status_code=403, detail="Calendar token does not match this feed")
+    since = bookings_feed_since(datetime.utcnow())
+    return cache.respond(
+        request,
+        student_scope(student_id),
+        f"bookings|{since.date().isoformat()}",
+        "benny-bookings.ics",
+        lambda: render_bookings_feed(SlotBookingRepository(db), student_id, since),
+    )
 
 
 # Faculty lists their slots (with bookings)
 @router.get("/me", response_model=List[SlotOut], dependencies=[Depends(require_role([UserRole.FACULTY]))])
 async def my_slots(
+    include_archived: bool = Query(False, description="Also list archived (long past) slots"),
     service: SlotService = Depends(get_slot_service),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    slots = await service.list_slots_for_faculty(current_user.id)
+    slots = await service.list_slots_for_faculty(current_user.id, include_archived=include_archived)
     return [SlotOut(**s) for s in slots]
 
 
 # Get public slots for a faculty (students use this to list available slots)
-@router.get("/faculty/{faculty_id}", response_model=List[SlotListItem])
+@router.get("/faculty/{faculty_id}", response_model=Page[SlotListItem])
 async def slots_by_faculty(
     faculty_id: str,
+    page: PageParams = Depends(),
+    include_archived: bool = Query(False, description="Start with archived (long past) slots"),
     service: SlotService = Depends(get_slot_service)
 ):
-    slots = await service.list_slots_for_faculty(faculty_id)
+    result = await service.list_slots_for_faculty_page(faculty_id, page, include_archived=include_archived)
     # map to list item (hide booked_by)
-    return [SlotListItem(
+    result["items"] = [SlotListItem(
         id=s["id"],
         faculty_id=s["faculty_id"],
         title=s.get("title"),
@@ -173,16 +201,18 @@ async def slots_by_faculty(
         max_students=s["max_students"],
         location=s.get("location"),
         booked_count=s.get("booked_count", 0)
-    ) for s in slots]
+    ) for s in result["items"]]
+    return result
 
 
 # Get a single slot by ID (must come AFTER specific routes)
 @router.get("/{slot_id}", response_model=SlotOut)
 async def get_slot(
     slot_id: str,
+    include_archived: bool = Query(False, description="Look in the archive if the slot is not current"),
     service: SlotService = Depends(get_slot_service)
 ):
-    slot = await service.get_slot(slot_id)
+    slot = await service.get_slot(slot_id, include_archived=include_archived)
     return SlotOut(**slot)
 
 
@@ -196,6 +226,37 @@ async def book_slot(
     return await service.book_slot(slot_id, current_user.id)
 
 
+# Student joins the FIFO waitlist of a full slot; the first waiter is booked
+# automatically (and emailed) when someone cancels
+@router.post("/{slot_id}/waitlist", dependencies=[Depends(require_role([UserRole.STUDENT]))])
+async def join_waitlist(
+    slot_id: str,
+    service: SlotService = Depends(get_slot_service),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    return await service.join_waitlist(slot_id, current_user.id)
+
+
+# Student checks their place in the waitlist
+@router.get("/{slot_id}/waitlist", dependencies=[Depends(require_role([UserRole.STUDENT]))])
+async def waitlist_position(
+    slot_id: str,
+    service: SlotService = Depends(get_slot_service),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    return await service.get_waitlist_position(slot_id, current_user.id)
+
+
+# Student leaves the waitlist
+@router.delete("/{slot_id}/waitlist", dependencies=[Depends(require_role([UserRole.STUDENT]))])
+async def leave_waitlist(
+    slot_id: str,
+    service: SlotService = Depends(get_slot_service),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    return await service.leave_waitlist(slot_id, current_user.id)
+
+
 # Student cancels their booking
 @router.post("/{slot_id}/cancel", dependencies=[Depends(require_role([UserRole.STUDENT]))])
 async def cancel_booking(
@@ -85,11 +85,6 @@ class SubmissionWithAssignment(SubmissionOut):
 
 
 # Response schemas
-class AssignmentListResponse(BaseModel):
-    assignments: List[AssignmentOut]
-    total: int
-
-
 class SubmissionListResponse(BaseModel):
     submissions: List[SubmissionOut]
     total: int
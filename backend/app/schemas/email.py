@@ -0,0 +1,23 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class EmailDeliveryStatus(str, Enum):
+    queued = "queued"
+    sending = "sending"
+    sent = "sent"
+    failed = "failed"
+
+
+class EmailStatusOut(BaseModel):
+    id: str
+    category: Optional[str] = None
+    status: EmailDeliveryStatus
+    attempts: int
+    last_error: Optional[str] = None
+    next_attempt_at: Optional[datetime] = None
+    created_at: datetime
+    sent_at: Optional[datetime] = None
@@ -31,3 +31,18 @@ class NoticeOut(BaseModel):
     category: NoticeCategory
     target_years: Optional[List[int]] = None
     created_at: str
+
+
+class NoticeSearchHit(NoticeOut):
+    # Mongo textScore: higher is a better match
+    score: float
+
+
+class NoticeEmailMode(str, Enum):
+    immediate = "immediate"
+    daily_digest = "daily_digest"
+    off = "off"
+
+
+class NoticeNotificationPreference(BaseModel):
+    mode: NoticeEmailMode
@@ -0,0 +1,12 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    # Pass back as ?cursor= to fetch the next page; null on the last page
+    next_cursor: Optional[str] = None
+    limit: int
@@ -10,3 +10,16 @@ class ResourceOut(BaseModel):
     file_path: str
     faculty_id: str
     created_at: str
+
+
+class SummaryJobOut(BaseModel):
+    id: str
+    summary_type: str
+    # queued | running | done | failed | cancelled
+    status: str
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    # Set once status is "done"
+    summary: Optional[str] = None
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 
 
 class SlotCreate(BaseModel):
@@ -12,6 +12,22 @@ class SlotCreate(BaseModel):
     title: Optional[str] = None
 
 
+class RecurringSlotCreate(BaseModel):
+    # First occurrence; later ones repeat it on the same wall-clock time
+    start_time: datetime = Field(..., description="ISO datetime of the first occurrence")
+    end_time: datetime = Field(..., description="ISO datetime the first occurrence ends")
+    until: date = Field(..., description="Last day on which an occurrence may start (inclusive)")
+    weekdays: Optional[List[int]] = Field(
+        None, description="Days to repeat on, 0=Monday .. 6=Sunday; defaults to start_time's weekday"
+    )
+    interval_weeks: int = Field(1, ge=1, le=4, description="1 = every week, 2 = every other week, ...")
+    max_students: int = Field(..., gt=0)
+    location: Optional[str] = None
+    title: Optional[str] = None
+    # False: reject the whole request if any occurrence overlaps; True: create the rest
+    skip_conflicts: bool = False
+
+
 class SlotOut(BaseModel):
     id: str
     faculty_id: str
@@ -34,3 +50,44 @@ class SlotListItem(BaseModel):
     max_students: int
     location: Optional[str]
     booked_count: int
+
+
+class SlotFacultyInfo(BaseModel):
+    id: str
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+
+
+class AvailableSlot(SlotListItem):
+    faculty: SlotFacultyInfo
+    is_full: bool = False
+
+
+class SlotBookingOut(BaseModel):
+    id: str
+    slot_id: str
+    faculty_id: str
+    title: Optional[str] = None
+    location: Optional[str] = None
+    start_time: str
+    end_time: str
+    booked_at: str
+
+
+class SlotConflict(BaseModel):
+    start_time: str
+    end_time: str
+    # Existing slot it overlaps; null when it overlaps another generated occurrence
+    conflicts_with: Optional[str] = None
+
+
+class RecurringSlotResult(BaseModel):
+    created: List[SlotOut]
+    skipped: List[SlotConflict]
+
+
+class CalendarLinks(BaseModel):
+    # Long-lived token that only authorizes the .ics feeds; treat the URLs as secrets
+    token: str
+    faculty_feed: Optional[str] = None
+    bookings_feed: Optional[str] = None
@@ -3,6 +3,7 @@ AI Grading Service
 Handles code execution, test case running, and LLM-based feedback generation.
 Designed to be modular so the LLM provider can be swapped easily.
 """
+import importlib.util
 import os
 import json
 from pathlib import Path
@@ -12,7 +13,8 @@ from datetime import datetime, timezone
 # Try to import LLM utilities (using existing RAG chatbot setup)
 try:
     from app.utils.rag_chatbot import get_llm
-    LLM_AVAILABLE = True
+    # rag_chatbot imports langchain lazily, so check for it without importing it
+    LLM_AVAILABLE = importlib.util.find_spec("langchain_groq") is not None
 except (ImportError, Exception):
     LLM_AVAILABLE = False
     # LLM not available - will use fallback feedback
@@ -21,8 +23,15 @@ except (ImportError, Exception):
 class AIGradingService:
     """Service for AI-powered assignment grading."""
     
-    def __init__(self):
-        self.llm = get_llm() if LLM_AVAILABLE else None
+    @property
+    def llm(self):
+        # Shared client from the model registry; building the service (per request) stays free
+        if not LLM_AVAILABLE:
+            return None
+        try:
+            return get_llm("grading")
+        except Exception:
+            return None  # fallback feedback; the failure shows in /health/models
     
     async def grade_submission(
         self,
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.repositories.notice_repo import NoticeRepository
+from app.repositories.notification_state_repo import NotificationStateRepository
+from app.repositories.slot_repo import SlotRepo
+from app.services.calendar_feed import CalendarFeedCache, get_calendar_feed_cache
+from app.services.notice_feed_cache import NoticeFeedCache, get_notice_feed_cache
+
+logger = logging.getLogger(__name__)
+
+ARCHIVAL_JOB = "hot_cold_archival"
+
+
+class ArchivalService:
+    """
+    Moves cold documents out of the hot collections: notices older than
+    ARCHIVE_NOTICES_AFTER_DAYS and slots that ended more than
+    ARCHIVE_SLOTS_AFTER_HOURS ago. Feeds and /slots/available then only ever
+    touch recent data; archived items are read only when a caller asks for them.
+    """
+
+    def __init__(
+        self,
+        notice_repo: NoticeRepository,
+        slot_repo: SlotRepo,
+        state_repo: NotificationStateRepository,
+        feed_cache: NoticeFeedCache,
+        calendar_cache: CalendarFeedCache,
+    ):
+        self.notice_repo = notice_repo
+        self.slot_repo = slot_repo
+        self.state_repo = state_repo
+        self.feed_cache = feed_cache
+        self.calendar_cache = calendar_cache
+
+    async def archive_once(self, run_at: datetime) -> Optional[Dict[str, int]]:
+        """Archive everything past its cutoff. Only the worker that claims `run_at` runs; others return None."""
+        claimed, _ = await self.state_repo.claim_run(ARCHIVAL_JOB, run_at)
+        if not claimed:
+            return None
+
+        batch_size = settings.ARCHIVE_BATCH_SIZE
+        # Archived notices drop out of the hot feeds, so their cached ETags must change
+        notices = await self.notice_repo.archive_created_before(
+            run_at - timedelta(days=settings.ARCHIVE_NOTICES_AFTER_DAYS),
+            batch_size,
+            on_batch=self.feed_cache.notices_changed,
+        )
+        slots = await self.slot_repo.archive_ended_before(
+            run_at - timedelta(hours=settings.ARCHIVE_SLOTS_AFTER_HOURS),
+            batch_size,
+            on_batch=self.calendar_cache.slots_archived,
+        )
+        if notices or slots:
+            logger.info(f"Archived {notices} notice(s) and {slots} slot(s)")
+        return {"notices": notices, "slots": slots}
+
+
+def build_archival_service(db) -> ArchivalService:
+    return ArchivalService(
+        NoticeRepository(db),
+        SlotRepo(db),
+        NotificationStateRepository(db),
+        get_notice_feed_cache(),
+        get_calendar_feed_cache(),
+    )
+
+
+class ArchivalScheduler:
+    """Runs archive_once every ARCHIVE_INTERVAL_HOURS."""
+
+    def __init__(self, service: ArchivalService):
+        self.service = service
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    @staticmethod
+    def current_run_at(now: datetime) -> datetime:
+        """Start of the interval `now` falls in; all workers agree on it, so one of them claims it."""
+        interval = int(settings.ARCHIVE_INTERVAL_HOURS * 3600)
+        epoch = datetime(1970, 1, 1)
+        elapsed = int((now - epoch).total_seconds())
+        return epoch + timedelta(seconds=elapsed - elapsed % interval)
+
+    async def _run(self):
+        while not self._stop.is_set():
+            run_at = self.current_run_at(datetime.utcnow())
+            try:
+                await self.service.archive_once(run_at)
+            except Exception as e:
+                logger.error(f"Archival run failed: {e}")
+            next_run = run_at + timedelta(hours=settings.ARCHIVE_INTERVAL_HOURS)
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=(next_run - datetime.utcnow()).total_seconds())
+            except asyncio.TimeoutError:
+                pass
+
+
+# Global scheduler instance (one per worker process; runs are deduplicated in Mongo)
+_archival_scheduler: Optional[ArchivalScheduler] = None
+
+
+def get_archival_scheduler() -> ArchivalScheduler:
+    global _archival_scheduler
+
+    if _archival_scheduler is None:
+        _archival_scheduler = ArchivalScheduler(build_archival_service(get_db()))
+    return _archival_scheduler
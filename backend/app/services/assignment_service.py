@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 from app.repositories.assignment_repo import AssignmentRepository, SubmissionRepository
 from app.services.ai_grading_service import AIGradingService
 from app.utils.assignment_storage import get_file_content_type
+from app.utils.pagination import PageParams
 
 
 class AssignmentService:
@@ -46,12 +47,9 @@ class AssignmentService:
         """Get an assignment by ID."""
         return await self.assignment_repo.get(assignment_id)
     
-    async def list_assignments(self) -> List[Dict[str, Any]]:
-        """List all assignments."""
-        assignments = await self.assignment_repo.list_all()
-        # Sort by created_at descending
-        assignments.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        return assignments
+    async def list_assignments(self, params: PageParams) -> Dict[str, Any]:
+        """List one page of assignments, newest first."""
+        return await self.assignment_repo.list_page(params)
     
     async def add_assignment_file(
         self,
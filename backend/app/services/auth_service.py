@@ -5,7 +5,9 @@ from fastapi import HTTPException, status
 
 from app.repositories.user_repo import UserRepository
 from app.repositories.otp_repo import OTPRepository
+from app.repositories.email_outbox_repo import EmailOutboxRepository
 from app.services.otp_service import OTPService
+from app.services.email_outbox_service import EmailOutboxService
 from app.db.session import get_db
 from app.core.security import (
     get_password_hash,
@@ -20,6 +22,7 @@ from app.schemas.user import (
 )
 from app.constants.roles import UserRole
 from app.core.config import settings
+from app.utils.student_year import extract_admission_year
 
 
 class AuthService:
@@ -67,22 +70,29 @@ class AuthService:
             # Only students require email verification via OTP
             "is_email_verified": not requires_verification,
         }
+        if role == UserRole.STUDENT:
+            # Stored so notice fan-out can select a year cohort with one indexed query
+            try:
+                user_doc["admission_year"] = extract_admission_year(data.email)
+            except ValueError:
+                user_doc["admission_year"] = None
 
         created = await self.user_repo.create(user_doc)
 
         # Only trigger OTP flow for students (faculty/alumni are auto-verified for now)
         if requires_verification:
-            # Send OTP for email verification (non-blocking - user is created even if email fails)
+            # Queue the OTP email (delivered in the background - user is created even if email fails)
             try:
                 db = get_db()
                 otp_repo = OTPRepository(db)
-                otp_service = OTPService(otp_repo, self.user_repo)
+                email_service = EmailOutboxService(EmailOutboxRepository(db))
+                otp_service = OTPService(otp_repo, self.user_repo, email_service)
                 await otp_service.send_verification_otp(data.email)
             except Exception as e:
                 # Log error but don't fail registration
                 import logging
                 logger = logging.getLogger(__name__)
-                logger.error(f"Failed to send OTP email during registration: {e}")
+                logger.error(f"Failed to queue OTP email during registration: {e}")
 
         return UserInDB(
             id=str(created["_id"]),
@@ -120,7 +130,8 @@ class AuthService:
         access_token_expires = timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-        token_data = {"sub": user.id, "role": user.role.value}
+        # email lets read-only endpoints (e.g. the notice feed) skip the user lookup
+        token_data = {"sub": user.id, "role": user.role.value, "email": user.email}
         return create_access_token(
             data=token_data, expires_delta=access_token_expires
         )
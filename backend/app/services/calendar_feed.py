@@ -0,0 +1,134 @@
+"""
+iCalendar subscription feeds for slots, with a serialized-feed cache.
+
+A faculty member's feed lists their upcoming (hot) slots; a student's feed
+lists their bookings. Feeds depend on the scopes faculty:<id> / student:<id>,
+which SlotService bumps on create/delete/book/cancel (see WatermarkCache).
+A miss streams the feed straight from the Mongo cursor and keeps a copy of
+the bytes, so the next poll with the same watermarks is served from memory
+and a poll with a matching If-None-Match gets a 304.
+"""
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Iterable, List, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.repositories.slot_booking_repo import SlotBookingRepository
+from app.repositories.slot_repo import SlotRepo
+from app.repositories.watermark_repo import CalendarWatermarkRepository
+from app.services.watermark_cache import WatermarkCache
+from app.utils import icalendar
+
+ICS_MEDIA_TYPE = "text/calendar; charset=utf-8"
+# Streamed bodies are flushed in chunks of roughly this size
+STREAM_CHUNK_BYTES = 16 * 1024
+
+
+def faculty_scope(faculty_id) -> str:
+    return f"faculty:{faculty_id}"
+
+
+def student_scope(student_id) -> str:
+    return f"student:{student_id}"
+
+
+class CalendarFeedCache(WatermarkCache):
+    async def slots_changed(self, faculty_ids: Iterable = (), student_ids: Iterable = ()):
+        """Invalidate the feeds of the given faculty members and students."""
+        await self.bump(
+            [faculty_scope(f) for f in faculty_ids] + [student_scope(s) for s in student_ids]
+        )
+
+    async def slots_archived(self, slots: List[dict]):
+        """on_batch hook for archival: archived slots drop out of their faculty's feed."""
+        await self.slots_changed(faculty_ids={slot["faculty_id"] for slot in slots})
+
+    def respond(self, request: Request, scope: str, variant: str, filename: str, render) -> Response:
+        """
+        304 on If-None-Match, the cached body on a watermark hit, otherwise a
+        streamed `render()` (an async iterator of text) that is cached once complete.
+        """
+        etag = self.etag([scope], variant)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+            "Content-Disposition": f'inline; filename="{filename}"',
+        }
+        if self.not_modified(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        body = self.get_body(etag)
+        if body is not None:
+            return Response(content=body, media_type=ICS_MEDIA_TYPE, headers=headers)
+        return StreamingResponse(self._stream_and_store(etag, render()), media_type=ICS_MEDIA_TYPE, headers=headers)
+
+    async def _stream_and_store(self, etag: str, parts: AsyncIterator[str]) -> AsyncIterator[bytes]:
+        body, pending, pending_size = [], [], 0
+        async for part in parts:
+            data = part.encode("utf-8")
+            pending.append(data)
+            pending_size += len(data)
+            if pending_size >= STREAM_CHUNK_BYTES:
+                chunk = b"".join(pending)
+                body.append(chunk)
+                pending, pending_size = [], 0
+                yield chunk
+        chunk = b"".join(pending)
+        body.append(chunk)
+        yield chunk
+        # Only a fully sent feed is cached; a body rendered while its scope was
+        # bumped is stored under the old ETag, which no request computes any more
+        self.put_body(etag, b"".join(body))
+
+
+async def render_faculty_feed(slots: SlotRepo, faculty_id: str) -> AsyncIterator[str]:
+    yield icalendar.calendar_header("Benny office hours")
+    async for slot in slots.iter_faculty_slots(faculty_id):
+        yield icalendar.vevent(
+            uid=f"slot-{slot['_id']}@benny",
+            start=slot["start_time"],
+            end=slot["end_time"],
+            summary=slot.get("title") or "Office hours",
+            stamp=slot.get("created_at"),
+            location=slot.get("location"),
+            description=f"{slot.get('booked_count', 0)}/{slot.get('max_students', 0)} seats booked",
+        )
+    yield icalendar.calendar_footer()
+
+
+def bookings_feed_since(now: datetime) -> datetime:
+    """Start of the student feed's window; day-aligned so the feed (and its ETag) is stable within a day."""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=settings.CALENDAR_FEED_PAST_DAYS)
+
+
+async def render_bookings_feed(bookings: SlotBookingRepository, student_id: str, since: datetime) -> AsyncIterator[str]:
+    yield icalendar.calendar_header("Benny bookings")
+    async for booking in bookings.iter_for_student(student_id, since):
+        yield icalendar.vevent(
+            uid=f"slot-{booking['slot_id']}@benny",
+            start=booking["start_time"],
+            end=booking["end_time"],
+            summary=booking.get("title") or "Office hours",
+            stamp=booking.get("booked_at"),
+            location=booking.get("location"),
+        )
+    yield icalendar.calendar_footer()
+
+
+# Global cache instance (one per worker process)
+_calendar_cache: Optional[CalendarFeedCache] = None
+
+
+def get_calendar_feed_cache() -> CalendarFeedCache:
+    global _calendar_cache
+
+    if _calendar_cache is None:
+        _calendar_cache = CalendarFeedCache(
+            CalendarWatermarkRepository(get_db()),
+            max_entries=settings.CALENDAR_FEED_CACHE_ENTRIES,
+            refresh_seconds=settings.CALENDAR_WATERMARK_REFRESH_SECONDS,
+        )
+    return _calendar_cache
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from aiosmtplib import SMTPRecipientsRefused, SMTPResponseException
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.repositories.email_outbox_repo import EmailOutboxRepository
+from app.utils.email_sender import RateLimiter, SMTPConnectionPool, build_message
+
+logger = logging.getLogger(__name__)
+
+# SMTP errors usually quote the refused recipients
+_EMAIL_ADDRESS = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+
+class EmailOutboxService:
+    """Enqueue emails for background delivery and report their delivery status."""
+
+    def __init__(self, repo: EmailOutboxRepository):
+        self.repo = repo
+
+    async def enqueue(
+        self,
+        to_email: Optional[str],
+        subject: str,
+        content: str,
+        bcc: Optional[List[str]] = None,
+        category: str = "general",
+    ) -> str:
+        message_id = await self.repo.enqueue(to_email, subject, content, bcc=bcc, category=category)
+        get_email_dispatcher().wake()
+        return message_id
+
+    async def enqueue_many(self, messages: List[dict]) -> List[str]:
+        message_ids = await self.repo.enqueue_many(messages)
+        if message_ids:
+            get_email_dispatcher().wake()
+        return message_ids
+
+    async def get_status(self, message_id: str) -> dict:
+        try:
+            record = await self.repo.get(message_id)
+        except Exception:
+            record = None
+        if not record:
+            raise HTTPException(status_code=404, detail="Email not found")
+        # The status endpoint is public (OTP emails go to users who cannot log in yet)
+        if record["last_error"]:
+            record["last_error"] = _EMAIL_ADDRESS.sub("<recipient>", record["last_error"])
+        return record
+
+
+def retry_delay_seconds(attempts: int) -> float:
+    """Exponential backoff: base, 2*base, 4*base, ... capped at EMAIL_RETRY_MAX_SECONDS."""
+    delay = settings.EMAIL_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return min(delay, settings.EMAIL_RETRY_MAX_SECONDS)
+
+
+class EmailDispatcher:
+    """
+    Background worker draining the email outbox.
+    Messages are claimed with a lease so several API workers can run a dispatcher
+    against the same collection without double-sending.
+    """
+
+    def __init__(self, repo: EmailOutboxRepository, pool: SMTPConnectionPool, limiter: RateLimiter):
+        self.repo = repo
+        self.pool = pool
+        self.limiter = limiter
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stopping = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.pool.close()
+
+    def wake(self):
+        """Skip the poll interval: called when this worker enqueues a message."""
+        self._wakeup.set()
+
+    async def _run(self):
+        logger.info("Email dispatcher started")
+        while not self._stopping:
+            try:
+                processed = await self.drain_once()
+            except Exception as e:
+                logger.error(f"Email dispatcher iteration failed: {e}")
+                processed = 0
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.EMAIL_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+        logger.info("Email dispatcher stopped")
+
+    async def drain_once(self) -> int:
+        """Claim up to one batch of due messages and deliver them concurrently over the pool."""
+        batch = []
+        for _ in range(settings.EMAIL_DISPATCH_BATCH_SIZE):
+            doc = await self.repo.claim_next(settings.EMAIL_SEND_LEASE_SECONDS)
+            if not doc:
+                break
+            batch.append(doc)
+        if batch:
+            await asyncio.gather(*(self._deliver(doc) for doc in batch))
+        return len(batch)
+
+    async def _deliver(self, doc: dict):
+        await self.limiter.acquire()
+        msg = build_message(doc.get("to"), doc["subject"], doc["content"], bcc=doc.get("bcc"))
+        try:
+            await self.pool.send(msg)
+        except SMTPRecipientsRefused as e:
+            # Permanent failure: retrying will not help
+            logger.error(f"Email {doc['_id']} rejected by server: {e}")
+            recorded = await self.repo.mark_failed(doc, str(e))
+        except Exception as e:
+            permanent = isinstance(e, SMTPResponseException) and 500 <= e.code < 600 and e.code != 535
+            attempts = doc.get("attempts", 1)
+            if permanent or attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                logger.error(f"Email {doc['_id']} failed after {attempts} attempt(s): {e}")
+                recorded = await self.repo.mark_failed(doc, str(e))
+            else:
+                delay = retry_delay_seconds(attempts)
+                logger.warning(f"Email {doc['_id']} attempt {attempts} failed ({e}); retrying in {delay:.0f}s")
+                recorded = await self.repo.mark_retry(doc, str(e), datetime.utcnow() + timedelta(seconds=delay))
+        else:
+            recorded = await self.repo.mark_sent(doc)
+            logger.info(f"Email {doc['_id']} delivered")
+        if not recorded:
+            # The send outlived its lease and another worker re-claimed the message
+            logger.warning(f"Email {doc['_id']} lease expired before its outcome was recorded")
+
+
+# Global dispatcher instance (one per worker process)
+_dispatcher_instance: Optional[EmailDispatcher] = None
+
+
+def get_email_dispatcher() -> EmailDispatcher:
+    global _dispatcher_instance
+
+    if _dispatcher_instance is None:
+        _dispatcher_instance = EmailDispatcher(
+            EmailOutboxRepository(get_db()),
+            SMTPConnectionPool.from_settings(),
+            RateLimiter(settings.EMAIL_RATE_LIMIT_PER_SECOND),
+        )
+    return _dispatcher_instance
@@ -3,6 +3,7 @@ from fastapi import HTTPException, status
 from app.repositories.faculty_repo import FacultyRepo
 from app.schemas.faculty import FacultyProfileCreate
 from app.schemas.user import UserInDB
+from app.utils.datetime_utils import to_iso
 
 
 class FacultyService:
@@ -19,6 +20,8 @@ class FacultyService:
         # normalize response id fields
         created["id"] = str(created["_id"])
         created["user_id"] = str(created["user_id"])
+        created["created_at"] = to_iso(created.get("created_at"))
+        created["updated_at"] = to_iso(created.get("updated_at"))
         return created
 
     async def get_my_profile(self, current_user: UserInDB):
@@ -29,6 +32,8 @@ class FacultyService:
             raise HTTPException(status_code=404, detail="Profile not found")
         profile["id"] = str(profile["_id"])
         profile["user_id"] = str(profile["user_id"])
+        profile["created_at"] = to_iso(profile.get("created_at"))
+        profile["updated_at"] = to_iso(profile.get("updated_at"))
         return profile
 
     async def get_public_profile(self, profile_id: str):
@@ -0,0 +1,228 @@
+"""
+Server-sent event push channel for notice create/delete.
+
+Publishing goes through a broadcaster so every API worker sees every event:
+MongoBroadcaster appends to a capped collection that all workers tail;
+MemoryBroadcaster is the single-process stand-in for local runs. Each worker
+fans events out in-process to its open streams, one bounded asyncio.Queue per
+client, so an idle connection costs a queue and a parked coroutine.
+
+Each worker also keeps the most recent events in memory so a reconnecting
+client's Last-Event-ID is resumed without a database query; if the id has
+aged out, the client gets a `reset` event and should refetch its feed.
+"""
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import AsyncIterator, Callable, List, Optional, Set
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.repositories.notice_event_repo import NoticeEventRepository
+
+logger = logging.getLogger(__name__)
+
+
+class NoticeEventType:
+    CREATED = "notice_created"
+    DELETED = "notice_deleted"
+
+
+RESET_EVENT = "reset"
+
+
+def format_sse(event: str, data: dict, event_id: Optional[str] = None) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class MemoryBroadcaster:
+    """Local stand-in: delivers events to this process only."""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[dict], None]] = None
+
+    async def start(self, deliver: Callable[[dict], None]):
+        self._deliver = deliver
+
+    async def publish(self, event: dict):
+        if self._deliver is not None:
+            self._deliver(event)
+
+    async def stop(self):
+        self._deliver = None
+
+
+class MongoBroadcaster:
+    """Cross-worker broadcast over a tailed capped collection."""
+
+    def __init__(self, repo: NoticeEventRepository):
+        self.repo = repo
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Callable[[dict], None]):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(deliver))
+
+    async def publish(self, event: dict):
+        # Delivered locally by our own tail, like on every other worker
+        await self.repo.append(event)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, deliver: Callable[[dict], None]):
+        while True:
+            try:
+                # Created here rather than in start() so startup never waits on Mongo
+                await self.repo.ensure_capped()
+                # A re-opened tail starts from the oldest retained event;
+                # the hub drops the ones it has already seen
+                async for event in self.repo.tail():
+                    deliver(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notice event tail failed: {e}")
+            await asyncio.sleep(1)
+
+
+class NoticeSubscription:
+    """One open stream: its filter and a bounded queue of pending events."""
+
+    def __init__(self, year: Optional[int], categories: Optional[List[str]], queue_size: int):
+        self.year = year
+        self.categories = set(categories) if categories else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def wants(self, event: dict) -> bool:
+        notice = event["notice"]
+        if self.categories is not None and notice["category"] not in self.categories:
+            return False
+        target_years = notice.get("target_years")
+        return self.year is None or not target_years or self.year in target_years
+
+    def offer(self, event: dict):
+        if self.overflowed or not self.wants(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client this far behind is dropped; it reconnects with Last-Event-ID
+            self.overflowed = True
+
+
+class NoticeEventHub:
+    def __init__(self, broadcaster, buffer_size: int, queue_size: int, keepalive_seconds: float):
+        self.broadcaster = broadcaster
+        self.buffer_size = buffer_size
+        self.queue_size = queue_size
+        self.keepalive_seconds = keepalive_seconds
+        self._subscribers: Set[NoticeSubscription] = set()
+        self._recent: "OrderedDict[str, dict]" = OrderedDict()
+
+    async def start(self):
+        await self.broadcaster.start(self.deliver)
+
+    async def stop(self):
+        await self.broadcaster.stop()
+
+    async def publish(self, event_type: str, notice: dict):
+        event = {
+            "_id": str(ObjectId()),
+            "type": event_type,
+            "notice": jsonable_encoder(notice),
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            await self.broadcaster.publish(event)
+        except Exception as e:
+            # The notice itself is saved; clients still see it on their next fetch
+            logger.warning(f"Failed to publish {event_type} for notice {notice.get('id')}: {e}")
+
+    def deliver(self, event: dict):
+        """Called by the broadcaster for every event, once per worker."""
+        if event["_id"] in self._recent:
+            return
+        self._recent[event["_id"]] = event
+        while len(self._recent) > self.buffer_size:
+            self._recent.popitem(last=False)
+        for subscription in self._subscribers:
+            subscription.offer(event)
+
+    def replay_after(self, last_event_id: str) -> Optional[List[dict]]:
+        """Events after `last_event_id`, or None if it is no longer buffered."""
+        if last_event_id not in self._recent:
+            return None
+        ids = list(self._recent)
+        return [self._recent[i] for i in ids[ids.index(last_event_id) + 1:]]
+
+    async def stream(
+        self,
+        year: Optional[int],
+        categories: Optional[List[str]],
+        last_event_id: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        subscription = NoticeSubscription(year, categories, self.queue_size)
+        # Subscribing and snapshotting the replay happen without an await in
+        # between, so no event can fall in the gap or be sent twice
+        self._subscribers.add(subscription)
+        missed = self.replay_after(last_event_id) if last_event_id else []
+        try:
+            yield f"retry: {settings.NOTICE_EVENTS_RETRY_MS}\n\n"
+            if missed is None:
+                yield format_sse(RESET_EVENT, {})
+            else:
+                for event in missed:
+                    if subscription.wants(event):
+                        yield format_sse(event["type"], event["notice"], event["_id"])
+
+            while not subscription.overflowed:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event["type"], event["notice"], event["_id"])
+        finally:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+def build_notice_broadcaster(db):
+    if settings.NOTICE_EVENTS_BROADCAST == "memory":
+        return MemoryBroadcaster()
+    return MongoBroadcaster(NoticeEventRepository(db, max_events=settings.NOTICE_EVENTS_BUFFER))
+
+
+# Global hub instance (one per worker process)
+_event_hub: Optional[NoticeEventHub] = None
+
+
+def get_notice_event_hub() -> NoticeEventHub:
+    global _event_hub
+
+    if _event_hub is None:
+        _event_hub = NoticeEventHub(
+            build_notice_broadcaster(get_db()),
+            buffer_size=settings.NOTICE_EVENTS_BUFFER,
+            queue_size=settings.NOTICE_EVENTS_QUEUE_SIZE,
+            keepalive_seconds=settings.NOTICE_EVENTS_KEEPALIVE_SECONDS,
+        )
+    return _event_hub
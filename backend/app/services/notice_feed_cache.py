@@ -0,0 +1,84 @@
+"""
+ETag revalidation and response caching for notice feeds.
+
+Every feed depends on a few change scopes (global, category:<c>, year:<y>,
+year:all). create/delete bump the scopes a notice belongs to, so a feed's
+ETag changes exactly when the feed might have (see WatermarkCache).
+"""
+import json
+from typing import List, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.repositories.watermark_repo import NoticeWatermarkRepository
+from app.services.watermark_cache import WatermarkCache
+
+GLOBAL_SCOPE = "global"
+ALL_YEARS_SCOPE = "year:all"
+
+
+def category_scope(category) -> str:
+    # Accepts NoticeCategory members as well as plain strings
+    return f"category:{getattr(category, 'value', category)}"
+
+
+def year_scope(year: int) -> str:
+    return f"year:{year}"
+
+
+def year_feed_scopes(year: int) -> List[str]:
+    """A year feed shows notices targeted at that year or at all years."""
+    return [year_scope(year), ALL_YEARS_SCOPE]
+
+
+def scopes_for_notice(notice: dict) -> List[str]:
+    scopes = [GLOBAL_SCOPE, category_scope(notice["category"])]
+    target_years = notice.get("target_years")
+    if target_years:
+        scopes += [year_scope(y) for y in target_years]
+    else:
+        scopes.append(ALL_YEARS_SCOPE)
+    return scopes
+
+
+class NoticeFeedCache(WatermarkCache):
+    async def notice_changed(self, notice: dict):
+        """Bump the watermarks of every feed the notice appears in."""
+        await self.notices_changed([notice])
+
+    async def notices_changed(self, notices: List[dict]):
+        await self.bump(scope for notice in notices for scope in scopes_for_notice(notice))
+
+    async def respond(self, request: Request, scopes: List[str], variant: str, load) -> Response:
+        """
+        Serve a feed with ETag revalidation: 304 on If-None-Match match, cached
+        body on a watermark hit, otherwise `load()` from Mongo and cache it.
+        """
+        etag = self.etag(scopes, variant)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if self.not_modified(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        body = self.get_body(etag)
+        if body is None:
+            body = json.dumps(jsonable_encoder(await load())).encode()
+            self.put_body(etag, body)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Global cache instance (one per worker process)
+_feed_cache: Optional[NoticeFeedCache] = None
+
+
+def get_notice_feed_cache() -> NoticeFeedCache:
+    global _feed_cache
+
+    if _feed_cache is None:
+        _feed_cache = NoticeFeedCache(
+            NoticeWatermarkRepository(get_db()),
+            max_entries=settings.NOTICE_FEED_CACHE_ENTRIES,
+            refresh_seconds=settings.NOTICE_WATERMARK_REFRESH_SECONDS,
+        )
+    return _feed_cache
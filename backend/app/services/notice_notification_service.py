@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Optional
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.repositories.email_outbox_repo import EmailOutboxRepository
+from app.repositories.notice_repo import NoticeRepository
+from app.repositories.notification_state_repo import NotificationStateRepository
+from app.repositories.user_repo import UserRepository
+from app.schemas.notice import NoticeEmailMode
+from app.services.email_outbox_service import EmailOutboxService
+from app.utils.student_year import student_year_for_admission
+
+logger = logging.getLogger(__name__)
+
+DIGEST_JOB = "notice_daily_digest"
+
+
+class NoticeNotificationService:
+    """
+    Fans out notice emails to students.
+    Recipients are resolved with one indexed query per year cohort and grouped
+    into Bcc batches, so a notice to 10k students is ~200 outbox messages
+    delivered over the dispatcher's pooled SMTP connections.
+    """
+
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        notice_repo: NoticeRepository,
+        state_repo: NotificationStateRepository,
+        email_service: EmailOutboxService,
+    ):
+        self.user_repo = user_repo
+        self.notice_repo = notice_repo
+        self.state_repo = state_repo
+        self.email_service = email_service
+
+    async def notify_new_notice(self, notice: dict) -> int:
+        """Queue immediate emails for a new notice. Returns the number of recipients."""
+        target_years = notice.get("target_years")
+        cohorts = sorted(set(target_years)) if target_years else [None]
+        subject = f"[Benny] New notice: {notice['title']}"
+        content = self._format_notice(notice)
+
+        recipients = 0
+        for year in cohorts:
+            recipients += await self._enqueue_batched(
+                self.user_repo.iter_student_emails(year, [NoticeEmailMode.immediate]),
+                subject,
+                content,
+            )
+        logger.info(f"Queued notice {notice['id']} for {recipients} student(s)")
+        return recipients
+
+    async def send_daily_digest(self, run_at: datetime) -> int:
+        """
+        Queue one digest per subscribed student covering notices since the last run.
+        Only the worker that claims `run_at` sends; others return 0.
+        """
+        claimed, previous_run = await self.state_repo.claim_run(DIGEST_JOB, run_at)
+        if not claimed:
+            return 0
+        since = previous_run or run_at - timedelta(days=1)
+        notices = await self.notice_repo.get_created_between(since, run_at)
+        if not notices:
+            return 0
+
+        subject = f"[Benny] Your notice digest for {run_at.strftime('%d %b %Y')}"
+        recipients = 0
+        for admission_year in await self.user_repo.get_digest_admission_years():
+            if admission_year is None:
+                # Same fallback as the student feed: unknown year sees every notice
+                relevant = notices
+            else:
+                year = student_year_for_admission(admission_year)
+                relevant = [n for n in notices if not n.get("target_years") or year in n["target_years"]]
+            if not relevant:
+                continue
+            content = "\n\n".join(self._format_notice(n) for n in relevant)
+            recipients += await self._enqueue_batched(
+                self.user_repo.iter_digest_emails(admission_year),
+                subject,
+                content,
+            )
+        logger.info(f"Queued notice digest for {recipients} student(s)")
+        return recipients
+
+    async def _enqueue_batched(self, emails: AsyncIterator[str], subject: str, content: str) -> int:
+        batch_size = settings.NOTICE_EMAIL_BATCH_SIZE
+        recipients = 0
+        bcc: List[str] = []
+        messages: List[dict] = []
+        async for email in emails:
+            bcc.append(email)
+            if len(bcc) >= batch_size:
+                messages.append({"bcc": bcc, "subject": subject, "content": content, "category": "notice"})
+                recipients += len(bcc)
+                bcc = []
+            if len(messages) >= 100:
+                await self.email_service.enqueue_many(messages)
+                messages = []
+        if bcc:
+            messages.append({"bcc": bcc, "subject": subject, "content": content, "category": "notice"})
+            recipients += len(bcc)
+        if messages:
+            await self.email_service.enqueue_many(messages)
+        return recipients
+
+    @staticmethod
+    def _format_notice(notice: dict) -> str:
+        category = str(notice.get("category", "")).replace("_", " ").title()
+        return f"{notice['title']} ({category})\n\n{notice['content']}"
+
+
+def build_notice_notification_service(db) -> NoticeNotificationService:
+    return NoticeNotificationService(
+        UserRepository(db),
+        NoticeRepository(db),
+        NotificationStateRepository(db),
+        EmailOutboxService(EmailOutboxRepository(db)),
+    )
+
+
+class NoticeDigestScheduler:
+    """Runs send_daily_digest once a day at NOTICE_DIGEST_HOUR_UTC."""
+
+    def __init__(self, service: NoticeNotificationService):
+        self.service = service
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    @staticmethod
+    def next_run_at(now: datetime) -> datetime:
+        run_at = now.replace(hour=settings.NOTICE_DIGEST_HOUR_UTC, minute=0, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        return run_at
+
+    async def _run(self):
+        while not self._stop.is_set():
+            run_at = self.next_run_at(datetime.utcnow())
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=(run_at - datetime.utcnow()).total_seconds())
+                break
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.service.send_daily_digest(run_at)
+            except Exception as e:
+                logger.error(f"Notice digest run failed: {e}")
+
+
+# Global scheduler instance (one per worker process; runs are deduplicated in Mongo)
+_digest_scheduler: Optional[NoticeDigestScheduler] = None
+
+
+def get_notice_digest_scheduler() -> NoticeDigestScheduler:
+    global _digest_scheduler
+
+    if _digest_scheduler is None:
+        _digest_scheduler = NoticeDigestScheduler(build_notice_notification_service(get_db()))
+    return _digest_scheduler
@@ -1,14 +1,19 @@
 # app/services/notice_service.py
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException, status
 
 from app.repositories.notice_repo import NoticeRepository
+from app.services.notice_events import NoticeEventHub, NoticeEventType
+from app.services.notice_feed_cache import NoticeFeedCache
 from app.schemas.notice import NoticeCreate
+from app.utils.pagination import PageParams
 
 
 class NoticeService:
-    def __init__(self, repo: NoticeRepository):
+    def __init__(self, repo: NoticeRepository, feed_cache: NoticeFeedCache, events: NoticeEventHub):
         self.repo = repo
+        self.feed_cache = feed_cache
+        self.events = events
 
     async def create_notice(self, faculty_id: str, data: NoticeCreate) -> dict:
         # basic validation for target_years
@@ -19,25 +24,44 @@ class NoticeService:
             for y in target_years:
                 if not isinstance(y, int) or y < 1 or y > 10:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid target_years value")
-        return await self.repo.create_notice(faculty_id, payload)
+        notice = await self.repo.create_notice(faculty_id, payload)
+        await self.feed_cache.notice_changed(notice)
+        await self.events.publish(NoticeEventType.CREATED, notice)
+        return notice
 
     async def delete_notice(self, notice_id: str, faculty_id: str):
         deleted = await self.repo.delete_notice(notice_id, faculty_id)
         if not deleted:
             raise HTTPException(status_code=403, detail="You can delete only your own notices")
+        await self.feed_cache.notice_changed(deleted)
+        await self.events.publish(NoticeEventType.DELETED, deleted)
         return {"message": "Notice deleted"}
 
-    async def get_all_notices(self) -> List[dict]:
-        return await self.repo.get_all()
+    async def list_notices_page(
+        self, params: PageParams, include_archived: bool = False, category: Optional[str] = None
+    ) -> dict:
+        return await self.repo.list_page(params, include_archived=include_archived, category=category)
 
-    async def get_faculty_notices(self, faculty_id: str) -> List[dict]:
-        return await self.repo.get_by_faculty(faculty_id)
+    async def search_notices(
+        self,
+        text: str,
+        params: PageParams,
+        category: Optional[str] = None,
+        year: Optional[int] = None,
+    ) -> dict:
+        text = text.strip()
+        if not text:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search text is required")
+        return await self.repo.search_page(text, params, category=category, year=year)
+
+    async def get_faculty_notices(self, faculty_id: str, include_archived: bool = False) -> List[dict]:
+        return await self.repo.get_by_faculty(faculty_id, include_archived=include_archived)
 
     async def get_notices_by_category(self, category: str) -> List[dict]:
         return await self.repo.get_by_category(category)
 
-    async def get_notices_for_year(self, year: int) -> List[dict]:
-        return await self.repo.get_by_year(year)
+    async def notices_for_year_page(self, year: int, params: PageParams, category: Optional[str] = None) -> dict:
+        return await self.repo.feed_page(year, params, category=category)
 
-    async def get_notices_by_category_and_year(self, category: str, year: int) -> List[dict]:
-        return await self.repo.get_by_category_and_year(category, year)
+    async def get_notices_by_category_and_year(self, category: str, year: int, limit: int = 50) -> List[dict]:
+        return await self.repo.get_by_category_and_year(category, year, limit=limit)
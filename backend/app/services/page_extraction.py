@@ -0,0 +1,57 @@
+"""
+Page-level document extraction with a shared text cache.
+
+Parsing a large PDF page by page in one process is what delays every
+summary of it. Here a PDF's pages are split into ranges of
+PDF_EXTRACT_BATCH_PAGES and parsed concurrently in the summary process pool;
+the page texts are stored by (content hash, page), so summaries of every
+length, streamed summaries and any other consumer of a file's text parse it
+once. Concurrent requests for the same file in this worker share one
+extraction.
+"""
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Callable, Dict, List
+
+from app.repositories.page_text_repo import PageTextRepository
+from app.utils.document_text import EXTRACTOR_VERSION, extract_pages, extract_pdf_pages, is_pdf, pdf_page_count
+
+logger = logging.getLogger(__name__)
+
+
+class PageExtractor:
+    def __init__(self, pages: PageTextRepository, executor: Callable[[], Executor], batch_pages: int):
+        self.pages = pages
+        self.executor = executor
+        self.batch_pages = batch_pages
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get_pages(self, path: str, content_hash: str) -> List[str]:
+        """The file's page texts, from the cache or extracted (and cached) now."""
+        texts = await self.pages.get_pages(content_hash, EXTRACTOR_VERSION)
+        if texts is not None:
+            return texts
+        task = self._inflight.get(content_hash)
+        if task is None:
+            task = asyncio.create_task(self._extract(path, content_hash))
+            self._inflight[content_hash] = task
+            task.add_done_callback(lambda _: self._inflight.pop(content_hash, None))
+        # shield: one waiter going away must not cancel the extraction for the others
+        return await asyncio.shield(task)
+
+    async def _extract(self, path: str, content_hash: str) -> List[str]:
+        loop = asyncio.get_running_loop()
+        pool = self.executor()
+        if is_pdf(path):
+            count = await loop.run_in_executor(pool, pdf_page_count, path)
+            ranges = [(start, min(start + self.batch_pages, count)) for start in range(0, count, self.batch_pages)]
+            batches = await asyncio.gather(
+                *(loop.run_in_executor(pool, extract_pdf_pages, path, start, stop) for start, stop in ranges)
+            )
+            texts = [text for batch in batches for text in batch]
+            logger.info(f"Extracted {count} page(s) of {path} in {len(ranges)} batch(es)")
+        else:
+            texts = await loop.run_in_executor(pool, extract_pages, path)
+        await self.pages.put_pages(content_hash, EXTRACTOR_VERSION, texts)
+        return texts
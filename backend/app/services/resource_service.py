@@ -1,22 +1,131 @@
-from app.utils.pdf_ppt_summarizer import summarize_file
+import asyncio
+import logging
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException
+
+from app.utils.pdf_ppt_summarizer import SUMMARY_TYPES, SUMMARY_VERSION, get_summarizer, prepare_summary_input
+from app.utils.resource_storage import file_sha256
 from app.repositories.resource_repo import ResourceRepo
+from app.repositories.summary_repo import SummaryRepository
+from app.services.notice_events import format_sse
+from app.services.summary_jobs import SummaryJobManager
+
+logger = logging.getLogger(__name__)
+
 
 class ResourceService:
-    def __init__(self, repo: ResourceRepo):
+    def __init__(self, repo: ResourceRepo, summaries: SummaryRepository, jobs: SummaryJobManager):
         self.repo = repo
+        self.summaries = summaries
+        self.jobs = jobs
 
-    async def create_resource(self, faculty_id: str, file_path: str, title: str, description: str, course: dict):
+    async def create_resource(
+        self,
+        faculty_id: str,
+        file_path: str,
+        title: str,
+        description: str,
+        course: dict,
+        content_hash: Optional[str] = None,
+    ):
         data = {
             "faculty_id": faculty_id,
             "file_path": file_path,
             "title": title,
             "description": description,
-            "course": course
+            "course": course,
+            "content_hash": content_hash,
         }
         return await self.repo.create(data)
 
-    async def summarize_uploaded_resource(self, resource):
-        return summarize_file(resource["file_path"])
+    async def resource_content_hash(self, resource: dict) -> str:
+        content_hash = resource.get("content_hash")
+        if not content_hash:
+            # Resources uploaded before summaries were stored get their hash on first use
+            content_hash = await asyncio.to_thread(file_sha256, resource["file_path"])
+            await self.repo.set_content_hash(resource["id"], content_hash)
+        return content_hash
+
+    async def summarize_uploaded_resource(self, resource: dict, summary_type: str = "short") -> str:
+        content_hash = await self.resource_content_hash(resource)
+        return await self.get_summary(resource["file_path"], content_hash, summary_type)
+
+    async def summarize_temp_file(self, path: str, summary_type: str = "short") -> str:
+        content_hash = await asyncio.to_thread(file_sha256, path)
+        return await self.get_summary(path, content_hash, summary_type)
+
+    @staticmethod
+    def check_summary_type(summary_type: str):
+        if summary_type not in SUMMARY_TYPES:
+            raise HTTPException(status_code=400, detail=f"summary_type must be one of {', '.join(SUMMARY_TYPES)}")
+
+    async def get_summary(self, path: str, content_hash: str, summary_type: str) -> str:
+        """Stored summary for this content, type and model version; generated and stored on a miss."""
+        self.check_summary_type(summary_type)
+        summary = await self.summaries.get(content_hash, summary_type, SUMMARY_VERSION)
+        if summary is None:
+            # Generated in the job process pool; this request only waits for it
+            job = await self.jobs.submit(path, content_hash, summary_type)
+            summary = await self.jobs.wait(job)
+        return summary
+
+    async def open_summary_stream(self, path: str, content_hash: str, summary_type: str) -> AsyncIterator[str]:
+        """
+        The stream_summary events for one summary. Stored summaries and active
+        jobs are looked up first, so a worker with a full queue can still
+        answer with a plain 429 before the event stream starts.
+        """
+        summary = await self.summaries.get(content_hash, summary_type, SUMMARY_VERSION)
+        job = None
+        if summary is None:
+            job = await self.jobs.find_active(content_hash, summary_type)
+            if job is None:
+                self.jobs.check_capacity()
+        return self.stream_summary(path, content_hash, summary_type, summary, job)
+
+    async def stream_summary(
+        self, path: str, content_hash: str, summary_type: str, summary: Optional[str] = None, job: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        Server-sent events for one summary: `token` events carrying text as
+        the LLM produces it, then `done` (or `error`). A stored summary is
+        replayed as a single token event; one being generated by a job (or
+        another stream) is waited for and replayed. Otherwise the map-reduce
+        stages run in the job pool and only the final `summary_prompt | llm`
+        call is streamed, from this process, under a job record of its own.
+        """
+        try:
+            if summary is None and job is not None:
+                yield format_sse("status", {"stage": "queued", "job_id": job["id"]})
+                summary = await self.jobs.wait(job)
+            if summary is not None:
+                yield format_sse("token", {"text": summary})
+                yield format_sse("done", {"cached": True})
+                return
+
+            async with self.jobs.stream_job(content_hash, summary_type) as job:
+                yield format_sse("status", {"stage": "preparing", "job_id": job["id"]})
+                pages = await self.jobs.pages.get_pages(path, content_hash)
+                text = await self.jobs.run_in_pool(prepare_summary_input, pages, summary_type)
+                yield format_sse("status", {"stage": "summarizing", "job_id": job["id"]})
+                parts = []
+                async for token in get_summarizer().astream({"text": text, "summary_type": summary_type}):
+                    if token:
+                        parts.append(token)
+                        yield format_sse("token", {"text": token})
+                await self.summaries.put(content_hash, summary_type, SUMMARY_VERSION, "".join(parts))
+            yield format_sse("done", {"cached": False})
+        except HTTPException as e:
+            yield format_sse("error", {"detail": e.detail})
+        except Exception as e:
+            logger.warning(f"Streaming {summary_type} summary of {path} failed: {e}")
+            yield format_sse("error", {"detail": f"Failed to summarize: {e}"})
 
-    async def summarize_temp_file(self, path: str):
-        return summarize_file(path)
+    async def precompute_summaries(self, path: str, content_hash: str):
+        """Queue every summary type for a freshly uploaded file, so the first reader gets a stored one."""
+        for summary_type in SUMMARY_TYPES:
+            try:
+                await self.jobs.submit(path, content_hash, summary_type)
+            except Exception as e:
+                logger.warning(f"Queueing {summary_type} summary for {path} failed: {e}")
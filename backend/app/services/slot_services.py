@@ -1,14 +1,74 @@
-from datetime import datetime, timezone
-from typing import List
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
 
-from app.repositories.slot_repo import SlotRepo
-from app.schemas.slot import SlotCreate
+from app.core.config import settings
+
+from app.repositories.email_outbox_repo import EmailOutboxRepository
+from app.repositories.slot_booking_repo import SlotBookingRepository
+from app.repositories.slot_repo import BookingOutcome, SlotRepo
+from app.repositories.slot_waitlist_repo import SlotWaitlistRepository
+from app.repositories.user_repo import UserRepository
+from app.services.calendar_feed import CalendarFeedCache, get_calendar_feed_cache
+from app.services.email_outbox_service import EmailOutboxService
+from app.schemas.slot import RecurringSlotCreate, SlotCreate
+from app.utils.datetime_utils import to_iso, to_utc_naive
+from app.utils.interval_tree import IntervalTree
+from app.utils.pagination import PageParams
+
+logger = logging.getLogger(__name__)
+
+
+BOOKING_FAILURES = {
+    BookingOutcome.ENDED: "Cannot book a slot that has ended",
+    BookingOutcome.ALREADY_BOOKED: "You have already booked this slot",
+    BookingOutcome.FULL: "Slot is full; join the waitlist to be booked when a seat frees up",
+}
+
+
+def weekly_occurrences(rule: RecurringSlotCreate) -> List[Tuple[datetime, datetime]]:
+    """
+    Expand a weekly rule into (start, end) pairs in naive UTC, in start order.
+    Repetition happens in start_time's own timezone so the wall-clock time stays fixed.
+    """
+    duration = rule.end_time - rule.start_time
+    weekdays = sorted(set(rule.weekdays)) if rule.weekdays else [rule.start_time.weekday()]
+    if any(day < 0 or day > 6 for day in weekdays):
+        raise HTTPException(status_code=400, detail="weekdays must be between 0 (Monday) and 6 (Sunday)")
+    week_start = rule.start_time - timedelta(days=rule.start_time.weekday())
+    occurrences = []
+    while week_start.date() <= rule.until:
+        for day in weekdays:
+            start = week_start + timedelta(days=day)
+            if start < rule.start_time or start.date() > rule.until:
+                continue
+            occurrences.append((to_utc_naive(start), to_utc_naive(start + duration)))
+            if len(occurrences) > settings.SLOT_RECURRENCE_MAX_INSTANCES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Rule generates more than {settings.SLOT_RECURRENCE_MAX_INSTANCES} slots",
+                )
+        week_start += timedelta(weeks=rule.interval_weeks)
+    return occurrences
 
 
 class SlotService:
-    def __init__(self, repo: SlotRepo):
+    def __init__(
+        self,
+        repo: SlotRepo,
+        bookings: SlotBookingRepository,
+        waitlist: SlotWaitlistRepository,
+        user_repo: UserRepository,
+        email_service: EmailOutboxService,
+        calendar_cache: CalendarFeedCache,
+    ):
         self.repo = repo
+        self.bookings = bookings
+        self.waitlist = waitlist
+        self.user_repo = user_repo
+        self.email_service = email_service
+        self.calendar_cache = calendar_cache
 
     async def create_slot(self, faculty_id: str, payload: SlotCreate) -> dict:
         # validations
@@ -49,45 +109,238 @@ class SlotService:
                 "location": payload.location,
             }
         
-        return await self.repo.create_slot(faculty_id, payload_dict)
+        overlapping = await self.repo.get_faculty_slots_overlapping(faculty_id, payload.start_time, payload.end_time)
+        if overlapping:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Slot overlaps your existing slot {overlapping[0]['_id']}",
+            )
+
+        created = await self.repo.create_slot(faculty_id, payload_dict)
+        await self.calendar_cache.slots_changed(faculty_ids=[faculty_id])
+        return created
+
+    async def create_recurring_slots(self, faculty_id: str, rule: RecurringSlotCreate) -> dict:
+        """
+        Create every occurrence of a weekly rule in one insert_many.
+        Existing slots over the rule's whole span are fetched with one indexed
+        range query into an interval tree, so checking each occurrence for
+        overlap is a tree lookup rather than a database round trip.
+        """
+        if rule.end_time <= rule.start_time:
+            raise HTTPException(status_code=400, detail="end_time must be after start_time")
+        if to_utc_naive(rule.end_time) <= datetime.utcnow():
+            raise HTTPException(status_code=400, detail="Cannot create a slot that ends in the past")
+        occurrences = weekly_occurrences(rule)
+        if not occurrences:
+            raise HTTPException(status_code=400, detail="Rule does not produce any slots before 'until'")
+
+        existing = await self.repo.get_faculty_slots_overlapping(
+            faculty_id, occurrences[0][0], max(end for _, end in occurrences)
+        )
+        tree = IntervalTree([(doc["start_time"], doc["end_time"], str(doc["_id"])) for doc in existing])
+
+        accepted, skipped = [], []
+        for start, end in occurrences:
+            hits = tree.overlapping(start, end)
+            # Occurrences are in start order, so only the last accepted one can overlap this one
+            overlaps_previous = bool(accepted) and accepted[-1][1] > start
+            if hits or overlaps_previous:
+                skipped.append({
+                    "start_time": to_iso(start),
+                    "end_time": to_iso(end),
+                    "conflicts_with": hits[0][2] if hits else None,
+                })
+            else:
+                accepted.append((start, end))
+
+        if skipped and not rule.skip_conflicts:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": f"{len(skipped)} occurrence(s) overlap existing slots", "conflicts": skipped},
+            )
+        created = await self.repo.create_slots(faculty_id, [
+            {
+                "title": rule.title,
+                "start_time": start,
+                "end_time": end,
+                "max_students": rule.max_students,
+                "location": rule.location,
+            }
+            for start, end in accepted
+        ])
+        if created:
+            await self.calendar_cache.slots_changed(faculty_ids=[faculty_id])
+        return {"created": created, "skipped": skipped}
+
+    async def list_slots_for_faculty(self, faculty_id: str, include_archived: bool = False) -> List[dict]:
+        slots = await self.repo.get_slots_by_faculty(faculty_id, include_archived=include_archived)
+        return await self._with_booked_by(slots)
+
+    async def list_slots_for_faculty_page(self, faculty_id: str, params: PageParams, include_archived: bool = False) -> dict:
+        return await self.repo.get_slots_by_faculty_page(faculty_id, params, include_archived=include_archived)
 
-    async def list_slots_for_faculty(self, faculty_id: str) -> List[dict]:
-        return await self.repo.get_slots_by_faculty(faculty_id)
+    async def list_available_slots(self, params: PageParams, include_full: bool = False) -> dict:
+        return await self.repo.get_available_page(params, include_full=include_full)
 
-    async def get_slot(self, slot_id: str) -> dict:
-        slot = await self.repo.get_slot_by_id(slot_id)
+    async def get_slot(self, slot_id: str, include_archived: bool = False) -> dict:
+        slot = await self.repo.get_slot_by_id(slot_id, include_archived=include_archived)
         if not slot:
             raise HTTPException(status_code=404, detail="Slot not found")
-        return slot
+        return (await self._with_booked_by([slot]))[0]
+
+    async def _with_booked_by(self, slots: List[dict]) -> List[dict]:
+        """Attach each slot's booked student ids (one slot_bookings query for all of them)."""
+        booked = await self.bookings.student_ids_by_slot([s["id"] for s in slots])
+        for slot in slots:
+            slot["booked_by"] = slot["booked_by"] + booked[slot["id"]]
+        return slots
 
     async def delete_slot(self, slot_id: str, faculty_id: str):
         ok = await self.repo.delete_slot(slot_id, faculty_id)
         if not ok:
             raise HTTPException(status_code=403, detail="Cannot delete slot: not found or not your slot")
+        # Read who had booked before their bookings go, so their feeds drop the slot
+        booked = (await self.bookings.student_ids_by_slot([slot_id]))[slot_id]
+        await self.bookings.delete_for_slot(slot_id)
+        await self.waitlist.delete_for_slot(slot_id)
+        await self.calendar_cache.slots_changed(faculty_ids=[faculty_id], student_ids=booked)
         return {"message": "Slot deleted"}
 
+    async def try_book(self, slot_id: str, student_id: str) -> str:
+        """
+        Book a seat; returns a BookingOutcome. The seat counter is taken first
+        and released if the booking insert hits the unique (slot, student)
+        index, so a crash in between can only leak a seat, never overbook.
+        """
+        slot = await self.repo.reserve_seat(slot_id, student_id)
+        if slot is None:
+            if await self.bookings.exists(slot_id, student_id) or await self.repo.has_legacy_booking(slot_id, student_id):
+                return BookingOutcome.ALREADY_BOOKED
+            return await self.repo.seat_unavailable_reason(slot_id)
+        if not await self.bookings.create(slot, student_id):
+            await self.repo.release_seat(slot_id)
+            return BookingOutcome.ALREADY_BOOKED
+        await self.calendar_cache.slots_changed(faculty_ids=[slot["faculty_id"]], student_ids=[student_id])
+        return BookingOutcome.BOOKED
+
     async def book_slot(self, slot_id: str, student_id: str):
-        slot = await self.repo.get_slot_by_id(slot_id)
-        if not slot:
+        outcome = await self.try_book(slot_id, student_id)
+        if outcome == BookingOutcome.BOOKED:
+            return {"message": "Booked successfully"}
+        if outcome == BookingOutcome.NOT_FOUND:
             raise HTTPException(status_code=404, detail="Slot not found")
-        # prevent booking past start time
-        start_time = datetime.fromisoformat(slot["start_time"])
-        end_time = datetime.fromisoformat(slot["end_time"])
-        if datetime.utcnow() >= end_time:
-            raise HTTPException(status_code=400, detail="Cannot book a slot that has ended")
-        # attempt booking
-        booked = await self.repo.book_slot(slot_id, student_id)
-        if not booked:
-            # determine reason
-            if student_id in slot["booked_by"]:
-                raise HTTPException(status_code=400, detail="You have already booked this slot")
-            if slot["booked_count"] >= slot["max_students"]:
-                raise HTTPException(status_code=400, detail="Slot is full")
-            raise HTTPException(status_code=400, detail="Unable to book slot")
-        return {"message": "Booked successfully"}
+        raise HTTPException(status_code=400, detail=BOOKING_FAILURES[outcome])
 
     async def cancel_booking(self, slot_id: str, student_id: str):
-        ok = await self.repo.cancel_booking(slot_id, student_id)
-        if not ok:
+        # Slots m0004 has not reached yet still hold bookings in booked_by; while
+        # it runs a booking can be in both places, and it is still one seat
+        deleted = await self.bookings.delete(slot_id, student_id)
+        legacy = await self.repo.take_legacy_booking(slot_id, student_id)
+        if not (deleted or legacy):
             raise HTTPException(status_code=400, detail="You do not have a booking on this slot")
+        slot = await self.repo.get_raw_slot(slot_id)
+        # The freed seat goes straight to the head of the waitlist; the seat
+        # counter never drops in between, so nobody else can take it
+        promoted = None
+        try:
+            promoted = await self._promote_next(slot)
+        except Exception as e:
+            # The cancellation itself is done; the waiter kept their place for the next free seat
+            logger.warning(f"Failed to promote a waiter on slot {slot_id}: {e}")
+        finally:
+            if not promoted:
+                await self.repo.release_seat(slot_id)
+        changed_students = [student_id] + ([str(promoted["student_id"])] if promoted else [])
+        await self.calendar_cache.slots_changed(
+            faculty_ids=[slot["faculty_id"]] if slot else [], student_ids=changed_students
+        )
         return {"message": "Booking cancelled"}
+
+    async def _promote_next(self, slot: Optional[dict]) -> Optional[dict]:
+        """Hand a held seat of a raw slot to the first waiting student. Returns the promoted entry, or None."""
+        if not slot or to_utc_naive(slot["end_time"]) <= datetime.utcnow():
+            return None
+        slot_id = str(slot["_id"])
+        while True:
+            entry = await self.waitlist.claim_next(slot_id, settings.SLOT_WAITLIST_CLAIM_SECONDS)
+            if entry is None:
+                return None
+            try:
+                booked = await self.bookings.create(slot, str(entry["student_id"]))
+            except Exception:
+                # Keep the waiter's place; the caller releases the seat
+                await self.waitlist.release_claim(entry)
+                raise
+            try:
+                await self.waitlist.finish_claim(entry)
+            except Exception as e:
+                # The claim expires and the entry is then skipped as already booked
+                logger.warning(f"Failed to remove promoted waitlist entry {entry['_id']}: {e}")
+            # Skip waiters who booked the slot directly in the meantime
+            if booked:
+                await self._notify_promoted(entry["student_id"], slot)
+                return entry
+
+    async def _notify_promoted(self, student_id, slot: dict):
+        # Must not raise: the seat now belongs to the promoted booking
+        title = slot.get("title") or "office hours"
+        content = (
+            f"A seat opened up in {title} ({to_iso(slot['start_time'])}"
+            f"{', ' + slot['location'] if slot.get('location') else ''}).\n\n"
+            "You were first on the waitlist, so it has been booked for you. "
+            "Cancel the booking in Benny if you can no longer attend."
+        )
+        try:
+            user = await self.user_repo.get_by_id(str(student_id))
+            if not user:
+                return
+            await self.email_service.enqueue(
+                user["email"], f"[Benny] You got a seat: {title}", content, category="slot_waitlist"
+            )
+        except Exception as e:
+            # The booking stands; the student also sees it in /slots/my-bookings
+            logger.warning(f"Failed to queue waitlist email for slot {slot['_id']}: {e}")
+
+    async def join_waitlist(self, slot_id: str, student_id: str) -> dict:
+        slot = await self.get_slot(slot_id)
+        if to_utc_naive(slot["end_time"]) <= datetime.utcnow():
+            raise HTTPException(status_code=400, detail="Cannot join the waitlist of a slot that has ended")
+        if student_id in slot["booked_by"]:
+            raise HTTPException(status_code=400, detail="You have already booked this slot")
+        if slot["booked_count"] < slot["max_students"]:
+            raise HTTPException(status_code=409, detail="Slot has free seats; book it instead")
+        if await self.waitlist.join(slot_id, student_id) is None:
+            raise HTTPException(status_code=400, detail="You are already on the waitlist")
+
+        # A seat released between the capacity check and the join would have
+        # found nobody to promote; take it now rather than wait for the next cancel
+        if await self.try_book(slot_id, student_id) == BookingOutcome.BOOKED:
+            await self.waitlist.leave(slot_id, student_id)
+            return {"message": "Booked successfully", "position": None}
+        return {"message": "Added to waitlist", "position": await self.waitlist.position(slot_id, student_id)}
+
+    async def get_waitlist_position(self, slot_id: str, student_id: str) -> dict:
+        position = await self.waitlist.position(slot_id, student_id)
+        if position is None:
+            raise HTTPException(status_code=404, detail="You are not on the waitlist for this slot")
+        return {"position": position}
+
+    async def leave_waitlist(self, slot_id: str, student_id: str):
+        if not await self.waitlist.leave(slot_id, student_id):
+            raise HTTPException(status_code=404, detail="You are not on the waitlist for this slot")
+        return {"message": "Left waitlist"}
+
+    async def list_my_bookings(self, student_id: str, params: PageParams, include_past: bool = False) -> dict:
+        return await self.bookings.list_for_student_page(student_id, params, include_past=include_past)
+
+
+def build_slot_service(db) -> SlotService:
+    return SlotService(
+        SlotRepo(db),
+        SlotBookingRepository(db),
+        SlotWaitlistRepository(db),
+        UserRepository(db),
+        EmailOutboxService(EmailOutboxRepository(db)),
+        get_calendar_feed_cache(),
+    )
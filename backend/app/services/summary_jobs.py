@@ -0,0 +1,277 @@
+"""
+Background summarization jobs.
+
+Summarizing parses the document, ranks its sentences on the CPU and calls the
+LLM, which takes seconds to minutes; none of it may run on the event loop.
+Jobs are recorded in Mongo (so any worker can report their status) and run
+in a process pool owned by the worker that accepted them. A semaphore sized
+to the pool keeps jobs "queued" until a process is free, so a queued job can
+be cancelled cleanly; a running one keeps its process until it finishes and
+its summary is still stored (the job stays cancelled). A summary streamed to
+the client (stream_job) is recorded as a running job too, so other requests
+coalesce with it. Each worker accepts at most SUMMARY_JOB_MAX_QUEUE
+unfinished jobs and answers 429 beyond that.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Optional
+
+import anyio
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.repositories.page_text_repo import PageTextRepository
+from app.repositories.summary_job_repo import SummaryJobRepository, SummaryJobStatus
+from app.repositories.summary_repo import SummaryRepository
+from app.services.page_extraction import PageExtractor
+from app.utils.pdf_ppt_summarizer import SUMMARY_TYPES, SUMMARY_VERSION, summarize_pages, warmup
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_pool_process():
+    # Pool initializer: an exception here would break the whole pool, so only log it
+    try:
+        warmup()
+    except Exception as e:
+        logger.warning(f"Summarizer warmup failed in process {os.getpid()}: {e}")
+
+
+def _process_ready() -> int:
+    return os.getpid()
+
+
+class SummaryJobManager:
+    def __init__(
+        self,
+        jobs: SummaryJobRepository,
+        summaries: SummaryRepository,
+        page_texts: PageTextRepository,
+        workers: int,
+        max_queue: int,
+    ):
+        self.jobs = jobs
+        self.summaries = summaries
+        # Page extraction shares the pool; it runs while the job holds its slot but
+        # occupies processes only between the job's own pool calls, so it cannot starve
+        self.pages = PageExtractor(page_texts, self._executor, settings.PDF_EXTRACT_BATCH_PAGES)
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(workers)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._streaming = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # A pool whose process died (e.g. OOM-killed) fails every later call; replace it
+        if self._pool is not None and getattr(self._pool, "_broken", False):
+            logger.warning("Summarizer pool is broken; starting a new one")
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._pool is None:
+            # spawn: children must not inherit the event loop or open Mongo sockets
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_pool_process if settings.MODEL_WARMUP else None,
+            )
+        return self._pool
+
+    async def warmup(self):
+        """Start every pool process now; with MODEL_WARMUP each loads the models as it starts."""
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        # Concurrent submissions make the pool spawn one process per task, up to its size
+        await asyncio.gather(*(loop.run_in_executor(pool, _process_ready) for _ in range(self.workers)))
+        logger.info(f"Summarizer pool started with {self.workers} process(es)")
+
+    async def run_in_pool(self, fn, *args):
+        """Run fn(*args) in the pool, counted against the same process slots as jobs."""
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor(), fn, *args)
+
+    async def find_active(self, content_hash: str, summary_type: str) -> Optional[dict]:
+        """An unfinished job (on any worker) for this content and type."""
+        # Jobs older than the timeout are presumed lost with the worker that ran them
+        return await self.jobs.find_active(
+            content_hash, summary_type, datetime.utcnow() - timedelta(seconds=settings.SUMMARY_JOB_TIMEOUT_SECONDS)
+        )
+
+    async def submit(self, path: str, content_hash: str, summary_type: str, requested_by: Optional[str] = None) -> dict:
+        """
+        Start a job and return it. A stored summary yields an already finished
+        job; a job already active for the same content and type is returned as is.
+        """
+        if summary_type not in SUMMARY_TYPES:
+            raise HTTPException(status_code=400, detail=f"summary_type must be one of {', '.join(SUMMARY_TYPES)}")
+        if await self.summaries.get(content_hash, summary_type, SUMMARY_VERSION) is not None:
+            return await self.jobs.create(content_hash, summary_type, requested_by, SummaryJobStatus.DONE)
+        active = await self.find_active(content_hash, summary_type)
+        if active:
+            return active
+        self.check_capacity()
+        job = await self.jobs.create(content_hash, summary_type, requested_by, SummaryJobStatus.QUEUED)
+        task = asyncio.create_task(self._run(job["id"], path, content_hash, summary_type))
+        self._tasks[job["id"]] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job["id"], None))
+        return job
+
+    def check_capacity(self):
+        """429 once this worker has max_queue unfinished jobs (streamed ones included)."""
+        if len(self._tasks) + self._streaming >= self.max_queue:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many summaries are being generated; try again shortly",
+                headers={"Retry-After": "30"},
+            )
+
+    @asynccontextmanager
+    async def stream_job(self, content_hash: str, summary_type: str, requested_by: Optional[str] = None) -> AsyncIterator[dict]:
+        """
+        Record a summary the request generates itself (stream_summary) as a
+        running job, counted against max_queue, so other requests wait for it
+        instead of generating it again. The block stores the summary; the job
+        is marked done when it exits normally and failed otherwise.
+        """
+        self.check_capacity()
+        self._streaming += 1
+        try:
+            job = await self.jobs.create(content_hash, summary_type, requested_by, SummaryJobStatus.RUNNING)
+            try:
+                yield job
+            except BaseException as e:
+                # Also a client that disconnected mid-stream: nothing will finish the job now.
+                # Shielded, or the same cancellation would abort the write and leave it running
+                with anyio.CancelScope(shield=True):
+                    await self.jobs.transition(
+                        job["id"], SummaryJobStatus.ACTIVE, SummaryJobStatus.FAILED, error=str(e) or type(e).__name__
+                    )
+                raise
+            with anyio.CancelScope(shield=True):
+                await self.jobs.transition(job["id"], [SummaryJobStatus.RUNNING], SummaryJobStatus.DONE)
+        finally:
+            self._streaming -= 1
+
+    async def _run(self, job_id: str, path: str, content_hash: str, summary_type: str):
+        async with self._slots:
+            if not await self.jobs.transition(job_id, [SummaryJobStatus.QUEUED], SummaryJobStatus.RUNNING):
+                return  # cancelled while queued
+            loop = asyncio.get_running_loop()
+            future = None
+            try:
+                pages = await self.pages.get_pages(path, content_hash)
+                future = loop.run_in_executor(self._executor(), summarize_pages, pages, summary_type)
+                summary = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future is None:
+                    raise
+                # The process runs on regardless: keep its slot until it is done and
+                # store the summary, which is still valid, before honouring the cancel
+                try:
+                    summary = await future
+                except Exception as e:
+                    logger.warning(f"Cancelled summary job {job_id} failed: {e}")
+                    raise asyncio.CancelledError()
+                await self.summaries.put(content_hash, summary_type, SUMMARY_VERSION, summary)
+                raise
+            except Exception as e:
+                logger.warning(f"Summary job {job_id} failed: {e}")
+                await self.jobs.transition(job_id, SummaryJobStatus.ACTIVE, SummaryJobStatus.FAILED, error=str(e))
+                return
+            # Stored even if the job was cancelled meanwhile; the summary is still valid
+            await self.summaries.put(content_hash, summary_type, SUMMARY_VERSION, summary)
+            await self.jobs.transition(job_id, [SummaryJobStatus.RUNNING], SummaryJobStatus.DONE)
+
+    async def get(self, job_id: str) -> dict:
+        """The job, with its summary attached once done."""
+        job = await self.jobs.get(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Summary job not found")
+        job["summary"] = None
+        if job["status"] == SummaryJobStatus.DONE:
+            job["summary"] = await self.summaries.get(job["content_hash"], job["summary_type"], SUMMARY_VERSION)
+        return job
+
+    async def cancel(self, job_id: str, user_id: str) -> dict:
+        job = await self.jobs.get(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Summary job not found")
+        if job["requested_by"] != user_id:
+            raise HTTPException(status_code=403, detail="You can only cancel your own summary jobs")
+        cancelled = await self.jobs.transition(job_id, SummaryJobStatus.ACTIVE, SummaryJobStatus.CANCELLED)
+        if not cancelled:
+            raise HTTPException(status_code=409, detail=f"Summary job already {job['status']}")
+        # A job queued on another worker notices the cancellation before it starts
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+        return cancelled
+
+    async def wait(self, job: dict) -> str:
+        """Wait for a job to finish and return its summary (for the blocking endpoints)."""
+        task = self._tasks.get(job["id"])
+        if task is not None:
+            # wait() rather than await: the caller must not be cancelled along with the job
+            await asyncio.wait({task})
+        deadline = datetime.utcnow() + timedelta(seconds=settings.SUMMARY_JOB_TIMEOUT_SECONDS)
+        while True:
+            # A job coalesced with another worker's is followed through Mongo
+            job = await self.get(job["id"])
+            if job["status"] not in SummaryJobStatus.ACTIVE or datetime.utcnow() >= deadline:
+                break
+            await asyncio.sleep(settings.SUMMARY_JOB_POLL_SECONDS)
+        if job["status"] == SummaryJobStatus.DONE and job["summary"] is not None:
+            return job["summary"]
+        if job["status"] == SummaryJobStatus.CANCELLED:
+            raise HTTPException(status_code=409, detail="Summary job was cancelled")
+        if job["status"] in SummaryJobStatus.ACTIVE:
+            raise HTTPException(status_code=504, detail="Summary is taking too long; poll the job instead")
+        raise HTTPException(status_code=500, detail=f"Failed to summarize: {job['error']}")
+
+    def stats(self) -> dict:
+        """Pool size and load (the pool's processes load their own copies of the summary models)."""
+        return {
+            "workers": self.workers,
+            "started": self._pool is not None,
+            "unfinished_jobs": len(self._tasks) + self._streaming,
+            "max_queue": self.max_queue,
+        }
+
+    async def stop(self):
+        for job_id, task in list(self._tasks.items()):
+            task.cancel()
+            # Nothing will finish these now; fail them so they are not coalesced with
+            try:
+                await self.jobs.transition(
+                    job_id, SummaryJobStatus.ACTIVE, SummaryJobStatus.FAILED, error="Worker shut down"
+                )
+            except Exception as e:
+                logger.warning(f"Could not mark summary job {job_id} as failed: {e}")
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Global job manager (one process pool per API worker)
+_job_manager: Optional[SummaryJobManager] = None
+
+
+def get_summary_job_manager() -> SummaryJobManager:
+    global _job_manager
+
+    if _job_manager is None:
+        db = get_db()
+        _job_manager = SummaryJobManager(
+            SummaryJobRepository(db),
+            SummaryRepository(db),
+            PageTextRepository(db),
+            workers=settings.SUMMARY_PROCESS_WORKERS or os.cpu_count() or 1,
+            max_queue=settings.SUMMARY_JOB_MAX_QUEUE,
+        )
+    return _job_manager
@@ -0,0 +1,90 @@
+"""
+Shared machinery for watermark-validated response caches.
+
+A cached response depends on a few change scopes; writers bump the scopes'
+counters in Mongo and every worker mirrors them in memory through a
+background refresher that reads only the counters bumped since its last
+pass. A response's ETag hashes its scopes' counters, so revalidation (304)
+and cache hits never query Mongo on the request path, and other workers'
+writes show up within refresh_seconds.
+"""
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from app.repositories.watermark_repo import WatermarkRepository
+
+logger = logging.getLogger(__name__)
+
+# Each refresh re-reads this far behind the newest bump it has seen, so bumps
+# that commit out of updated_at order are not skipped
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+class WatermarkCache:
+    def __init__(self, repo: WatermarkRepository, max_entries: int, refresh_seconds: float):
+        self.repo = repo
+        self.max_entries = max_entries
+        self.refresh_seconds = refresh_seconds
+        self.watermarks: Dict[str, int] = {}
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+        self._latest_change: Optional[datetime] = None
+
+    def etag(self, scopes: Iterable[str], variant: str) -> str:
+        marks = ",".join(f"{s}={self.watermarks.get(s, 0)}" for s in sorted(scopes))
+        digest = hashlib.sha1(f"{marks}|{variant}".encode()).hexdigest()[:20]
+        return f'W/"{digest}"'
+
+    @staticmethod
+    def not_modified(if_none_match: Optional[str], etag: str) -> bool:
+        return bool(if_none_match) and etag in if_none_match
+
+    def get_body(self, etag: str) -> Optional[bytes]:
+        body = self._bodies.get(etag)
+        if body is not None:
+            self._bodies.move_to_end(etag)
+        return body
+
+    def put_body(self, etag: str, body: bytes):
+        self._bodies[etag] = body
+        self._bodies.move_to_end(etag)
+        while len(self._bodies) > self.max_entries:
+            self._bodies.popitem(last=False)
+
+    async def bump(self, scopes: Iterable[str]):
+        """Invalidate every cached response that depends on any of `scopes`."""
+        scopes = sorted(set(scopes))
+        if scopes:
+            self.watermarks.update(await self.repo.bump(scopes))
+
+    async def refresh(self):
+        since = self._latest_change - REFRESH_OVERLAP if self._latest_change else None
+        marks, latest = await self.repo.get_changed_since(since)
+        if latest and (self._latest_change is None or latest > self._latest_change):
+            self._latest_change = latest
+        # Never move a watermark backwards (a local bump may be newer than the read)
+        for scope, value in marks.items():
+            if value > self.watermarks.get(scope, 0):
+                self.watermarks[scope] = value
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        # Picks up bumps made by other workers within refresh_seconds
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"{type(self).__name__} watermark refresh failed: {e}")
+            await asyncio.sleep(self.refresh_seconds)
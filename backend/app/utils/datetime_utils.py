@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+
+def to_utc_naive(value: Union[datetime, str]) -> datetime:
+    """
+    Normalize a datetime (or ISO string) to a naive UTC datetime, the form
+    Mongo stores and returns by default. Naive inputs are assumed to be UTC.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if not isinstance(value, datetime):
+        raise ValueError(f"Invalid datetime value: {value!r}")
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def to_iso(value: Union[datetime, str, None]) -> Optional[str]:
+    """
+    Serialize a stored timestamp for API responses as ISO 8601 with an explicit
+    UTC offset. Strings (documents not migrated yet) are returned unchanged.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    return value
@@ -0,0 +1,86 @@
+"""
+Plain-text extraction from uploaded documents, one string per page (a
+slide counts as a page).
+
+The functions here are blocking and picklable by reference, so they can run
+in the summary job process pool: a PDF is split into page ranges and each
+range is parsed by its own process (see app/services/page_extraction.py).
+"""
+import os
+from typing import List
+
+# Stored page text is valid only for the extractor that produced it
+EXTRACTOR_VERSION = 2
+
+
+def is_pdf(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() == ".pdf"
+
+
+def pdf_page_count(path: str) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(path).pages)
+
+
+def extract_pdf_pages(path: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop); each call opens the file itself, so ranges can be parsed in parallel."""
+    from pypdf import PdfReader
+
+    pages = PdfReader(path).pages
+    return [pages[i].extract_text() or "" for i in range(start, min(stop, len(pages)))]
+
+
+def _shape_lines(shape) -> List[str]:
+    from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+    if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+        return [line for child in shape.shapes for line in _shape_lines(child)]
+    if getattr(shape, "has_table", False):
+        rows = []
+        for row in shape.table.rows:
+            cells = [cell.text.strip() for cell in row.cells]
+            if any(cells):
+                rows.append(" | ".join(cells))
+        return rows
+    if shape.has_text_frame:
+        return [p.text.strip() for p in shape.text_frame.paragraphs if p.text.strip()]
+    return []
+
+
+def extract_pptx_slides(path: str) -> List[str]:
+    """
+    Text of each slide of a .pptx with python-pptx: its shapes in slide order
+    (groups expanded, table rows as "a | b | c"), then the speaker notes.
+    """
+    from pptx import Presentation
+
+    slides = []
+    for slide in Presentation(path).slides:
+        lines = [line for shape in slide.shapes for line in _shape_lines(shape)]
+        if slide.has_notes_slide:
+            notes = slide.notes_slide.notes_text_frame
+            if notes is not None and notes.text.strip():
+                lines.append(f"Notes: {notes.text.strip()}")
+        slides.append("\n".join(lines))
+    return slides
+
+
+def extract_ppt_unstructured(path: str) -> List[str]:
+    """Legacy binary .ppt, which python-pptx cannot read (needs unstructured and LibreOffice)."""
+    from langchain_community.document_loaders import UnstructuredPowerPointLoader
+
+    return [d.page_content for d in UnstructuredPowerPointLoader(path).load()]
+
+
+def extract_pages(path: str) -> List[str]:
+    """All page texts of a document, sequentially in this process."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".pdf":
+        return extract_pdf_pages(path, 0, pdf_page_count(path))
+    elif ext == ".pptx":
+        return extract_pptx_slides(path)
+    elif ext == ".ppt":
+        return extract_ppt_unstructured(path)
+    else:
+        raise ValueError("Unsupported file type")
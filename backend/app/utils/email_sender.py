@@ -1,75 +1,179 @@
-import smtplib
+import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
 from email.message import EmailMessage
-from smtplib import SMTPAuthenticationError, SMTPException
+from typing import List, Optional
+
+import aiosmtplib
+from aiosmtplib import SMTPAuthenticationError, SMTPServerDisconnected
+
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
-def send_email(to_email: str, content: str):
+def build_message(
+    to_email: Optional[str],
+    subject: str,
+    content: str,
+    bcc: Optional[List[str]] = None,
+) -> EmailMessage:
+    """
+    Build a plain-text message from the configured sender.
+    Recipients passed in `bcc` are hidden from each other (used for batched sends).
+    """
+    sender = settings.SMTP_EMAIL.strip()
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = sender
+    # Batched messages are addressed to the sender and delivered via Bcc
+    msg["To"] = to_email or sender
+    if bcc:
+        msg["Bcc"] = ", ".join(bcc)
+    msg.set_content(content)
+    return msg
+
+
+class RateLimiter:
     """
-    Send an email using SMTP. Returns True on success, False on failure.
+    Token bucket limiting how many messages per second leave this worker.
+    """
+
+    def __init__(self, rate_per_second: float, burst: Optional[int] = None):
+        self.rate = max(rate_per_second, 0.001)
+        self.capacity = burst or max(1, int(rate_per_second))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SMTPConnectionPool:
     """
-    try:
-        # Strip whitespace from credentials in case they were read incorrectly
-        email = settings.SMTP_EMAIL.strip()
-        password = settings.SMTP_PASSWORD.strip()
-        
-        if not email or not password:
-            logger.error("SMTP_EMAIL or SMTP_PASSWORD is empty")
-            return False
-        
-        # Debug info (don't log password, just length)
-        logger.debug(f"Attempting to send email from {email} (password length: {len(password)})")
-        
-        # Gmail app passwords are 16 characters. Warn if different.
-        if len(password) != 16:
-            logger.warning(f"Password length is {len(password)} characters. Gmail App Passwords are typically 16 characters.")
-        
-        msg = EmailMessage()
-        msg["Subject"] = "Benny App - Verification OTP"
-        msg["From"] = email
-        msg["To"] = to_email
-        msg.set_content(content)
-
-        # Try SMTP_SSL first (port 465)
+    Pool of long-lived async SMTP connections.
+    Connections are opened lazily, reused across messages and transparently
+    reopened when the server drops them (e.g. after its idle timeout).
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        start_tls: bool = False,
+        size: int = 2,
+        timeout: float = 10,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.start_tls = start_tls
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.size)
+        self._closed = False
+
+    @classmethod
+    def from_settings(cls) -> "SMTPConnectionPool":
+        return cls(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            # Strip whitespace from credentials in case they were read incorrectly
+            username=settings.SMTP_EMAIL.strip(),
+            password=settings.SMTP_PASSWORD.strip(),
+            use_tls=settings.SMTP_USE_TLS,
+            start_tls=settings.SMTP_START_TLS,
+            size=settings.SMTP_POOL_SIZE,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await smtp.connect()
+        if self.password:
+            try:
+                await smtp.login(self.username, self.password)
+            except SMTPAuthenticationError:
+                logger.error(
+                    "SMTP authentication failed for %s (password length: %d). "
+                    "Gmail requires a 16-character App Password with 2-Step Verification enabled.",
+                    self.username,
+                    len(self.password),
+                )
+                await self._quietly_close(smtp)
+                raise
+        logger.debug(f"Opened SMTP connection to {self.host}:{self.port}")
+        return smtp
+
+    @staticmethod
+    async def _quietly_close(smtp: aiosmtplib.SMTP):
         try:
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=10) as smtp:
-                smtp.login(email, password)
-                smtp.send_message(msg)
-            logger.info(f"Email sent successfully to {to_email}")
-            return True
-        except SMTPAuthenticationError:
-            # If SSL fails, try STARTTLS (port 587) as fallback
-            logger.info("SMTP_SSL failed, trying STARTTLS on port 587...")
+            if smtp.is_connected:
+                await smtp.quit()
+        except Exception:
+            smtp.close()
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connected client, opening a new one only if none is idle."""
+        if self._closed:
+            raise RuntimeError("SMTP connection pool is closed")
+        async with self._slots:
+            smtp = None
+            while not self._idle.empty():
+                candidate = self._idle.get_nowait()
+                if candidate.is_connected:
+                    smtp = candidate
+                    break
+            if smtp is None:
+                smtp = await self._connect()
             try:
-                with smtplib.SMTP("smtp.gmail.com", 587, timeout=10) as smtp:
-                    smtp.starttls()
-                    smtp.login(email, password)
-                    smtp.send_message(msg)
-                logger.info(f"Email sent successfully to {to_email} via STARTTLS")
-                return True
-            except SMTPAuthenticationError as e2:
-                logger.error(f"SMTP Authentication failed on both SSL and STARTTLS: {e2}")
-                logger.error("=" * 60)
-                logger.error("TROUBLESHOOTING GMAIL SMTP:")
-                logger.error("1. Make sure you're using a Gmail App Password (16 characters)")
-                logger.error("2. Generate a new App Password at: https://myaccount.google.com/apppasswords")
-                logger.error("3. Select 'Mail' as the app and 'Other' as the device")
-                logger.error("4. Copy the 16-character password (no spaces) to your .env file")
-                logger.error("5. Make sure 2-Step Verification is enabled on your Google account")
-                logger.error("6. Check that your .env file has no quotes around the password")
-                logger.error(f"7. Current email: {email}, password length: {len(password)}")
-                logger.error("=" * 60)
-                return False
-            except Exception as e2:
-                logger.error(f"STARTTLS connection failed: {e2}")
-                return False
-        
-    except SMTPException as e:
-        logger.error(f"SMTP error: {e}")
-        return False
-    except Exception as e:
-        logger.error(f"Failed to send email to {to_email}: {e}")
-        return False
+                yield smtp
+            except Exception:
+                await self._quietly_close(smtp)
+                raise
+            else:
+                if smtp.is_connected and not self._closed:
+                    self._idle.put_nowait(smtp)
+                else:
+                    await self._quietly_close(smtp)
+
+    async def send(self, msg: EmailMessage):
+        """
+        Send a message over a pooled connection.
+        A connection dropped by the server is reopened and the send retried once.
+        """
+        try:
+            async with self.connection() as smtp:
+                return await smtp.send_message(msg)
+        except SMTPServerDisconnected:
+            logger.info("Pooled SMTP connection was dropped, reconnecting")
+            async with self.connection() as smtp:
+                return await smtp.send_message(msg)
+
+    async def close(self):
+        self._closed = True
+        while not self._idle.empty():
+            await self._quietly_close(self._idle.get_nowait())
@@ -0,0 +1,172 @@
+"""
+Extractive pre-filter for long documents.
+
+Before any LLM call, a document's sentences are scored on the CPU and only
+the most informative ones, up to a token budget, are kept (in their
+original order). Scores come from TF-IDF vectors (NumPy), kept sparse since
+a sentence uses a handful of the MAX_VOCABULARY terms: TextRank over the
+sentence similarity graph for documents up to TEXTRANK_MAX_SENTENCES, and
+similarity to the document's TF-IDF centroid above that, where an n x n
+graph would cost too much. Near-duplicate sentences (repeated slide titles,
+footers) are skipped while selecting. Runs of text without sentence breaks
+are cut into MAX_SENTENCE_WORDS pieces so every part of the document can be
+chosen.
+"""
+import re
+from collections import Counter
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+TEXTRANK_MAX_SENTENCES = 2000
+MAX_VOCABULARY = 4096
+DAMPING = 0.85
+DUPLICATE_SIMILARITY = 0.9
+MIN_SENTENCE_WORDS = 4
+MAX_SENTENCE_WORDS = 80
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n{2,}|\n(?=\s*(?:[-*•]|\d+[.)])\s)")
+_WORD = re.compile(r"[a-z][a-z0-9'-]+")
+_STOPWORDS = frozenset("""
+a about above after again all also an and any are as at be because been before being between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him
+his how i if in into is it its itself just me more most my no nor not now of off on once only or other our
+ours out over own same she should so some such than that the their theirs them then there these they this
+those through to too under until up very was we were what when where which while who whom why will with
+would you your yours
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (~4 characters per token for English)."""
+    return (len(text) + 3) // 4
+
+
+def split_sentences(text: str) -> List[str]:
+    sentences = []
+    for part in _SENTENCE_END.split(text):
+        words = part.split()
+        if len(words) < MIN_SENTENCE_WORDS:
+            continue
+        # Table dumps and unpunctuated slide text would otherwise be one "sentence"
+        # too long for any budget; a short tail joins the piece before it
+        starts = list(range(0, len(words), MAX_SENTENCE_WORDS))
+        if len(starts) > 1 and len(words) - starts[-1] < MIN_SENTENCE_WORDS:
+            starts.pop()
+        ends = starts[1:] + [len(words)]
+        sentences.extend(" ".join(words[a:b]) for a, b in zip(starts, ends))
+    return sentences
+
+
+class SparseRows(NamedTuple):
+    """CSR rows: row i has values data[indptr[i]:indptr[i + 1]] at columns indices[...]."""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    width: int
+
+    @property
+    def row_ids(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]], self.data[self.indptr[i]:self.indptr[i + 1]]
+
+    def dense(self) -> np.ndarray:
+        matrix = np.zeros((len(self.indptr) - 1, self.width), dtype=np.float32)
+        matrix[self.row_ids, self.indices] = self.data
+        return matrix
+
+
+def tfidf_matrix(sentences: List[str]) -> SparseRows:
+    """L2-normalized TF-IDF rows (float32), over the MAX_VOCABULARY most widespread terms."""
+    tokenized = [[w for w in _WORD.findall(s.lower()) if w not in _STOPWORDS] for s in sentences]
+    df = Counter(term for words in tokenized for term in set(words))
+    vocabulary = {term: i for i, (term, _) in enumerate(df.most_common(MAX_VOCABULARY))}
+    indptr, cols, counts = [0], [], []
+    for words in tokenized:
+        for term, count in Counter(w for w in words if w in vocabulary).items():
+            cols.append(vocabulary[term])
+            counts.append(count)
+        indptr.append(len(cols))
+    indices = np.array(cols, dtype=np.int32)
+    rows = SparseRows(np.array(indptr, dtype=np.int64), indices, np.array(counts, dtype=np.float32), len(vocabulary))
+    # Each (sentence, term) pair appears once, so column counts are document frequencies
+    idf = np.log((1 + len(sentences)) / (1 + np.bincount(indices, minlength=rows.width))) + 1
+    data = np.log1p(rows.data) * idf[indices].astype(np.float32)
+    norms = np.sqrt(np.bincount(rows.row_ids, weights=data * data, minlength=len(sentences)))
+    data /= np.where(norms == 0, 1, norms)[rows.row_ids].astype(np.float32)
+    return rows._replace(data=data)
+
+
+def textrank(matrix: np.ndarray, iterations: int = 50, tolerance: float = 1e-6) -> np.ndarray:
+    """PageRank over the cosine-similarity graph of the (normalized) sentence vectors."""
+    n = matrix.shape[0]
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = similarity / np.where(out_weight == 0, 1, out_weight)
+    scores = np.full(n, 1 / n, dtype=np.float32)
+    for _ in range(iterations):
+        updated = (1 - DAMPING) / n + DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tolerance:
+            return updated
+        scores = updated
+    return scores
+
+
+def centroid_scores(matrix: SparseRows) -> np.ndarray:
+    n = len(matrix.indptr) - 1
+    centroid = np.bincount(matrix.indices, weights=matrix.data, minlength=matrix.width) / n
+    norm = np.linalg.norm(centroid)
+    if not norm:
+        return np.zeros(n, dtype=np.float32)
+    return np.bincount(matrix.row_ids, weights=matrix.data * (centroid / norm)[matrix.indices], minlength=n)
+
+
+def select_sentences(text: str, token_budget: int) -> Tuple[str, dict]:
+    """
+    The highest-scoring sentences of `text` that fit `token_budget`, in
+    document order, and stats about the cut. Text already within budget is
+    returned unchanged; if no sentence fits, the text is cut to the budget.
+    """
+    tokens_in = estimate_tokens(text)
+    stats = {"tokens_in": tokens_in, "tokens_out": tokens_in, "sentences_in": None, "sentences_out": None}
+    if tokens_in <= token_budget:
+        return text, stats
+    sentences = split_sentences(text)
+    stats["sentences_in"] = len(sentences)
+    if not sentences:
+        return _truncate(text, token_budget, stats)
+
+    matrix = tfidf_matrix(sentences)
+    scores = textrank(matrix.dense()) if len(sentences) <= TEXTRANK_MAX_SENTENCES else centroid_scores(matrix)
+    chosen: List[int] = []
+    # Dense copies of the chosen rows only, for the duplicate check
+    chosen_rows = np.zeros((16, matrix.width), dtype=np.float32)
+    used = 0
+    for index in np.argsort(-scores, kind="stable"):
+        cost = estimate_tokens(sentences[index]) + 1
+        if used + cost > token_budget:
+            continue
+        cols, values = matrix.row(index)
+        if chosen and float((chosen_rows[: len(chosen), cols] @ values).max()) >= DUPLICATE_SIMILARITY:
+            continue
+        if len(chosen) == len(chosen_rows):
+            chosen_rows = np.concatenate([chosen_rows, np.zeros_like(chosen_rows)])
+        chosen_rows[len(chosen), cols] = values
+        chosen.append(int(index))
+        used += cost
+    if not chosen:
+        return _truncate(text, token_budget, stats)
+    chosen.sort()
+    selected = "\n".join(sentences[i] for i in chosen)
+    stats.update(tokens_out=estimate_tokens(selected), sentences_out=len(chosen))
+    return selected, stats
+
+
+def _truncate(text: str, token_budget: int, stats: dict) -> Tuple[str, dict]:
+    selected = text[: token_budget * 4]
+    stats.update(tokens_out=estimate_tokens(selected), sentences_out=0)
+    return selected, stats
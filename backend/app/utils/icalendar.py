@@ -0,0 +1,92 @@
+"""
+Minimal RFC 5545 (iCalendar) serialization for read-only slot feeds.
+
+Only what subscription feeds need: a VCALENDAR wrapper and VEVENTs with UTC
+times, TEXT escaping and 75-octet line folding. Lines end in CRLF.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from app.utils.datetime_utils import to_utc_naive
+
+PRODID = "-//Benny//Slots//EN"
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """Split a content line into <=75-octet pieces without breaking UTF-8 characters."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    pieces, current, size, limit = [], [], 0, 75
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            pieces.append("".join(current))
+            # Continuation lines start with a space, which counts toward the limit
+            current, size, limit = [], 0, 74
+        current.append(char)
+        size += width
+    pieces.append("".join(current))
+    return "\r\n ".join(pieces) + "\r\n"
+
+
+def format_datetime(value) -> str:
+    return to_utc_naive(value).strftime("%Y%m%dT%H%M%SZ")
+
+
+def calendar_header(name: str) -> str:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+        # Hint for clients that honour it; ETag revalidation makes frequent polls cheap
+        "X-PUBLISHED-TTL:PT15M",
+        "REFRESH-INTERVAL;VALUE=DURATION:PT15M",
+    ]
+    return "".join(fold(line) for line in lines)
+
+
+def calendar_footer() -> str:
+    return "END:VCALENDAR\r\n"
+
+
+def vevent(
+    uid: str,
+    start: datetime,
+    end: datetime,
+    summary: str,
+    stamp: Optional[datetime] = None,
+    location: Optional[str] = None,
+    description: Optional[str] = None,
+) -> str:
+    """
+    One VEVENT. `stamp` should come from the stored document (not the clock)
+    so that serializing unchanged data yields identical bytes.
+    """
+    lines: List[str] = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_datetime(stamp or start)}",
+        f"DTSTART:{format_datetime(start)}",
+        f"DTEND:{format_datetime(end)}",
+        f"SUMMARY:{escape_text(summary)}",
+    ]
+    if location:
+        lines.append(f"LOCATION:{escape_text(location)}")
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    lines.append("END:VEVENT")
+    return "".join(fold(line) for line in lines)
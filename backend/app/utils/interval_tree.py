@@ -0,0 +1,56 @@
+"""
+Static interval tree for overlap queries.
+
+Built once from a list of half-open intervals [start, end): the intervals are
+sorted by start and laid out as an implicit balanced BST over that array,
+each node remembering the largest end in its subtree. A query skips every
+subtree whose max end is <= the query start or whose starts are all >= the
+query end, so it costs O(log n + k) for k overlaps.
+"""
+from typing import Any, Generic, List, Tuple, TypeVar
+
+K = TypeVar("K")
+
+
+class IntervalTree(Generic[K]):
+    def __init__(self, intervals: List[Tuple[K, K, Any]]):
+        """`intervals` are (start, end, payload) triples with start < end."""
+        self._items = sorted(intervals, key=lambda item: item[0])
+        self._max_end: List[Any] = [None] * len(self._items)
+        self._build(0, len(self._items))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _build(self, lo: int, hi: int):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        max_end = self._items[mid][1]
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > max_end:
+                max_end = child
+        self._max_end[mid] = max_end
+        return max_end
+
+    def overlapping(self, start: K, end: K) -> List[Tuple[K, K, Any]]:
+        """Stored intervals overlapping [start, end), in start order."""
+        found: List[Tuple[K, K, Any]] = []
+        self._query(0, len(self._items), start, end, found)
+        return found
+
+    def _query(self, lo: int, hi: int, start: K, end: K, found: list):
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self._max_end[mid] <= start:
+            # Nothing in this subtree ends after the query starts
+            return
+        self._query(lo, mid, start, end, found)
+        item = self._items[mid]
+        if item[0] >= end:
+            # This and everything to the right starts too late
+            return
+        if item[1] > start:
+            found.append(item)
+        self._query(mid + 1, hi, start, end, found)
@@ -0,0 +1,190 @@
+"""
+Process-wide registry of AI models.
+
+The summarizer, the chatbot and assignment grading ask the registry for a
+model by use case instead of building their own. Each use case maps to a
+configured model name; use cases configured with the same embedding model,
+or the same LLM and temperature, share one instance. Embedding models are
+loaded once per process (and their weights counted); LLM clients are shared,
+so their HTTP connection pools are reused across requests.
+
+Summaries run in a process pool, so each pool process has its own registry.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# use case -> settings attribute naming the model (and temperature for LLMs)
+EMBEDDING_USE_CASES = {
+    "chatbot": "CHATBOT_EMBEDDING_MODEL",
+}
+LLM_USE_CASES = {
+    "summary": ("SUMMARY_LLM_MODEL", "SUMMARY_LLM_TEMPERATURE"),
+    "chatbot": ("CHATBOT_LLM_MODEL", "CHATBOT_LLM_TEMPERATURE"),
+    "grading": ("GRADING_LLM_MODEL", "GRADING_LLM_TEMPERATURE"),
+}
+
+
+class ModelState:
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident memory of this process (Linux only)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _parameter_bytes(embeddings) -> Optional[int]:
+    """Size of an embedding model's weights, if its backend exposes them."""
+    client = getattr(embeddings, "_client", None) or getattr(embeddings, "client", None)
+    try:
+        return sum(p.numel() * p.element_size() for p in client.parameters())
+    except Exception:
+        return None
+
+
+class _Entry:
+    def __init__(self, kind: str, model: str):
+        self.kind = kind
+        self.model = model
+        self.use_cases: List[str] = []
+        self.lock = threading.Lock()
+        self.instance = None
+        self.state: Optional[str] = None
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.memory_bytes: Optional[int] = None
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._entries: Dict[Tuple, _Entry] = {}
+        self._entries_lock = threading.Lock()
+        self._warming = False
+
+    def _entry(self, key: Tuple, kind: str, model: str, use_case: str) -> _Entry:
+        with self._entries_lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(kind, model)
+            if use_case not in entry.use_cases:
+                entry.use_cases.append(use_case)
+            return entry
+
+    def _load(self, entry: _Entry, factory, measure):
+        """Build the entry's instance once; concurrent callers wait for the first build."""
+        if entry.instance is not None:
+            return entry.instance
+        with entry.lock:
+            if entry.instance is None:
+                entry.state, entry.error = ModelState.LOADING, None
+                rss_before = _rss_bytes()
+                started = time.perf_counter()
+                try:
+                    instance = factory()
+                except Exception as e:
+                    entry.state, entry.error = ModelState.FAILED, str(e)
+                    logger.error(f"Loading {entry.kind} model {entry.model} failed: {e}")
+                    raise
+                entry.load_seconds = time.perf_counter() - started
+                rss_after = _rss_bytes()
+                entry.memory_bytes = measure(instance)
+                if entry.memory_bytes is None and rss_before is not None and rss_after is not None:
+                    entry.memory_bytes = max(rss_after - rss_before, 0)
+                entry.instance, entry.state = instance, ModelState.READY
+                logger.info(f"Loaded {entry.kind} model {entry.model} in {entry.load_seconds:.1f}s")
+        return entry.instance
+
+    def embeddings(self, use_case: str):
+        model = getattr(settings, EMBEDDING_USE_CASES[use_case])
+        entry = self._entry(("embeddings", model), "embeddings", model, use_case)
+
+        def build():
+            from langchain_huggingface import HuggingFaceEmbeddings
+
+            return HuggingFaceEmbeddings(model_name=model, encode_kwargs={"normalize_embeddings": True})
+
+        return self._load(entry, build, _parameter_bytes)
+
+    def llm(self, use_case: str):
+        model_setting, temperature_setting = LLM_USE_CASES[use_case]
+        model = getattr(settings, model_setting)
+        temperature = getattr(settings, temperature_setting)
+        entry = self._entry(("llm", model, temperature), "llm", model, use_case)
+
+        def build():
+            from langchain_groq import ChatGroq
+
+            return ChatGroq(model=model, temperature=temperature, api_key=settings.GROQ_API_KEY or None)
+
+        # Remote models: the client itself is small, nothing worth measuring
+        return self._load(entry, build, lambda _: 0)
+
+    def warmup(self, embeddings: List[str] = (), llms: List[str] = ()):
+        """Load the given use cases' models now; failures are logged and show up in status()."""
+        self._warming = True
+        try:
+            for use_case in embeddings:
+                try:
+                    self.embeddings(use_case).embed_query("warmup")
+                except Exception:
+                    pass
+            for use_case in llms:
+                try:
+                    self.llm(use_case)
+                except Exception:
+                    pass
+        finally:
+            self._warming = False
+
+    def status(self) -> dict:
+        """Readiness for health checks: not ready while warming up or if any model failed to load."""
+        with self._entries_lock:
+            entries = list(self._entries.values())
+        models = [
+            {
+                "kind": e.kind,
+                "model": e.model,
+                "use_cases": list(e.use_cases),
+                "state": e.state or "not_loaded",
+                "error": e.error,
+                "load_seconds": e.load_seconds,
+                "memory_bytes": e.memory_bytes,
+            }
+            for e in entries
+        ]
+        ready = not self._warming and all(m["state"] in (ModelState.READY, "not_loaded") for m in models)
+        return {
+            "ready": ready,
+            "warming_up": self._warming,
+            "models": models,
+            "model_memory_bytes": sum(m["memory_bytes"] or 0 for m in models),
+            "process_rss_bytes": _rss_bytes(),
+        }
+
+
+# Global registry (one per process)
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
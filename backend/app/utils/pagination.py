@@ -0,0 +1,163 @@
+"""
+Keyset (cursor) pagination shared by list endpoints.
+
+Pages are ordered by (sort key, _id) and a cursor is the opaque, URL-safe
+encoding of the last item's pair, so fetching page N costs the same index
+seek as page 1 no matter how much data precedes it.
+"""
+import base64
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bson import json_util
+from fastapi import HTTPException, Query
+
+from app.core.config import settings
+
+
+class PageParams:
+    """FastAPI dependency for `?limit=&cursor=` on list endpoints."""
+
+    def __init__(
+        self,
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def encode_cursor(sort_value: Any, item_id: Any, tier: int = 0) -> str:
+    data = {"k": sort_value, "id": item_id}
+    if tier:
+        data["t"] = tier
+    raw = json_util.dumps(data)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _load_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        data = None
+    if not isinstance(data, dict) or "k" not in data or "id" not in data:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return data
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    data = _load_cursor(cursor)
+    return data["k"], data["id"]
+
+
+def cursor_tier(cursor: Optional[str]) -> int:
+    """Index of the collection tier (see paginate_tiers) the cursor points into."""
+    return int(_load_cursor(cursor).get("t", 0)) if cursor else 0
+
+
+def keyset_filter(sort_field: str, direction: int, cursor: Optional[str]) -> dict:
+    """
+    Filter selecting items strictly after the cursor in (sort_field, _id) order.
+    The top-level range on sort_field keeps the index bounds tight; the $or
+    breaks ties on _id.
+    """
+    if not cursor:
+        return {}
+    sort_value, last_id = decode_cursor(cursor)
+    op, inclusive = ("$lt", "$lte") if direction < 0 else ("$gt", "$gte")
+    return {
+        sort_field: {inclusive: sort_value},
+        "$or": [{sort_field: {op: sort_value}}, {"_id": {op: last_id}}],
+    }
+
+
+def keyset_query(query: dict, sort_field: str, direction: int, cursor: Optional[str]) -> dict:
+    """`query` restricted to the items after `cursor` (unchanged on the first page)."""
+    keyset = keyset_filter(sort_field, direction, cursor)
+    if not keyset:
+        return query
+    return {"$and": [query, keyset]} if query else keyset
+
+
+def page_envelope(items: List[Any], next_cursor: Optional[str], limit: int) -> Dict[str, Any]:
+    return {"items": items, "next_cursor": next_cursor, "limit": limit}
+
+
+async def paginate(
+    collection,
+    query: dict,
+    sort_field: str,
+    direction: int,
+    params: PageParams,
+    normalize: Callable[[dict], Any],
+    projection: Optional[dict] = None,
+) -> Dict[str, Any]:
+    """
+    Repository helper: one page of `query` ordered by (sort_field, _id).
+    Fetches limit + 1 documents to know whether another page exists.
+    """
+    return await paginate_tiers([collection], query, sort_field, direction, params, normalize, projection)
+
+
+async def paginate_tiers(
+    collections: List[Any],
+    query: dict,
+    sort_field: str,
+    direction: int,
+    params: PageParams,
+    normalize: Callable[[dict], Any],
+    projection: Optional[dict] = None,
+) -> Dict[str, Any]:
+    """
+    Like paginate, over several collections read one after another (e.g. hot
+    then archive). Each tier is walked in (sort_field, _id) order and the
+    cursor records which tier it stopped in, so no item is skipped even when
+    the tiers' key ranges overlap.
+    """
+    start_tier = cursor_tier(params.cursor)
+    tagged = []
+    for tier in range(start_tier, len(collections)):
+        page_query = keyset_query(query, sort_field, direction, params.cursor if tier == start_tier else None)
+        want = params.limit + 1 - len(tagged)
+        cursor = (
+            collections[tier].find(page_query, projection)
+            .sort([(sort_field, direction), ("_id", direction)])
+            .limit(want)
+        )
+        tagged += [(tier, doc) for doc in await cursor.to_list(length=want)]
+        if len(tagged) > params.limit:
+            break
+    next_cursor = None
+    if len(tagged) > params.limit:
+        tagged = tagged[: params.limit]
+        tier, last = tagged[-1]
+        next_cursor = encode_cursor(last.get(sort_field), last["_id"], tier)
+    return page_envelope([normalize(doc) for _, doc in tagged], next_cursor, params.limit)
+
+
+def paginate_list(
+    items: List[dict],
+    sort_key: str,
+    id_key: str,
+    direction: int,
+    params: PageParams,
+) -> Dict[str, Any]:
+    """
+    Same cursor contract for sources that are not Mongo collections (e.g. JSON
+    storage): items are ordered by (sort_key, id_key) and sliced after the cursor.
+    """
+    reverse = direction < 0
+    ordered = sorted(items, key=lambda x: (x.get(sort_key) or "", x.get(id_key) or ""), reverse=reverse)
+    if params.cursor:
+        sort_value, last_id = decode_cursor(params.cursor)
+        boundary = (sort_value or "", last_id or "")
+        if reverse:
+            ordered = [x for x in ordered if (x.get(sort_key) or "", x.get(id_key) or "") < boundary]
+        else:
+            ordered = [x for x in ordered if (x.get(sort_key) or "", x.get(id_key) or "") > boundary]
+    page = ordered[: params.limit]
+    next_cursor = None
+    if len(ordered) > params.limit:
+        last = page[-1]
+        next_cursor = encode_cursor(last.get(sort_key), last.get(id_key))
+    return page_envelope(page, next_cursor, params.limit)
@@ -1,87 +1,126 @@
-import os
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader, UnstructuredPowerPointLoader
-from langchain_community.vectorstores import FAISS
-from langchain_core.documents import Document
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-from dotenv import load_dotenv
+import asyncio
+import logging
 import warnings
+from typing import List
+
+from dotenv import load_dotenv
+
+from app.core.config import settings
+from app.utils.model_registry import get_model_registry
+from app.utils.extractive import select_sentences
+from app.utils.summary_map_reduce import reduce_to_text
+
 warnings.filterwarnings("ignore")
 
+logger = logging.getLogger(__name__)
+
+# Models come from the model registry and langchain is imported where used,
+# so importing this module (as the API does) is cheap.
 load_dotenv()
 
-HF_TOKEN = os.getenv("HF_TOKEN")
-os.environ["HF_TOKEN"] = HF_TOKEN
-
-embed = HuggingFaceEmbeddings(
-    model_name="BAAI/bge-m3",
-    encode_kwargs={"normalize_embeddings": True}
-)
-
-llm = ChatGroq(
-    model="llama-3.3-70b-versatile",
-    groq_api_key=os.getenv("GROQ_API_KEY"),
-    temperature=0
-)
-
-def load_any_document(path: str):
-    ext = os.path.splitext(path)[1].lower()
-    if ext == ".pdf":
-        return PyPDFLoader(path).load()
-    elif ext in [".ppt", ".pptx"]:
-        return UnstructuredPowerPointLoader(path).load()
-    else:
-        raise ValueError("Unsupported file type")
-
-def docs_to_chunks(docs, chunk_size=800, chunk_overlap=100):
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap
-    )
-    return splitter.split_documents(docs)
+SUMMARY_TYPES = ("short", "medium", "long")
 
-summary_prompt = PromptTemplate.from_template("""
+# Stored summaries are valid only for the model and prompts that produced them
+SUMMARY_VERSION = f"{settings.SUMMARY_LLM_MODEL}|p{settings.SUMMARY_PROMPT_VERSION}"
+
+SUMMARY_PROMPT = """
 You are an expert summarizer. Write a {summary_type} summary of the text:
 
 {text}
-""")
+"""
 
+# Map-reduce stages (see app/utils/summary_map_reduce.py)
+MAP_PROMPT = """
+Summarize the following part of a longer document. Keep its key facts,
+definitions, arguments and conclusions, in order:
 
-summarizer = summary_prompt | llm | StrOutputParser()
+{text}
+"""
 
+REDUCE_PROMPT = """
+The following are summaries of consecutive parts of one document. Combine
+them into a single summary that keeps the key points, in order:
 
-def summarize_file(path: str, summary_type="short"):
-    docs = load_any_document(path)
-    if not docs:
-        raise ValueError("Could not extract text")
+{text}
+"""
+
+# Text per chunk handed to the splitter; chunks are then packed into map groups
+CHUNK_SIZE = 1500
+
+
+def _chain(template: str):
+    from langchain_core.output_parsers import StrOutputParser
+    from langchain_core.prompts import PromptTemplate
 
-    if summary_type == "short":
-        chunk_size = 400
-    elif summary_type == "medium":
-        chunk_size = 800
-    else:
-        chunk_size = 1500
+    return PromptTemplate.from_template(template) | get_model_registry().llm("summary") | StrOutputParser()
 
-    chunks = docs_to_chunks(docs, chunk_size=chunk_size)
-    docs_clean = [Document(page_content=c.page_content) for c in chunks]
 
-    vectorstore = FAISS.from_documents(docs_clean, embed)
+def get_summarizer():
+    """The final `summary_prompt | llm` chain (inputs: text, summary_type)."""
+    return _chain(SUMMARY_PROMPT)
 
-    retriever = vectorstore.as_retriever(
-        search_type="similarity",
-        search_kwargs={"k": 6}
+
+def warmup():
+    """Create the LLM client now so the first summary does not pay for it."""
+    get_model_registry().warmup(llms=["summary"])
+
+
+# One event loop per process, reused across summaries: the LLM client's
+# async HTTP pool stays bound to it
+_loop = None
+
+
+def _run(coro):
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+async def reduce_chunks(chunks: List[str]) -> str:
+    """Map-reduce the chunks down to the text the final summary prompt gets."""
+    map_chain, reduce_chain = _chain(MAP_PROMPT), _chain(REDUCE_PROMPT)
+    return await reduce_to_text(
+        chunks,
+        map_fn=lambda text: map_chain.ainvoke({"text": text}),
+        reduce_fn=lambda text: reduce_chain.ainvoke({"text": text}),
+        group_chars=settings.SUMMARY_MAP_GROUP_CHARS,
+        max_concurrency=settings.SUMMARY_LLM_CONCURRENCY,
     )
 
-    retrieved_docs = retriever.invoke("summary") or docs_clean
 
-    combined_text = "\n\n".join([d.page_content for d in retrieved_docs])
+def input_token_budget(summary_type: str) -> int:
+    return {
+        "short": settings.SUMMARY_INPUT_TOKENS_SHORT,
+        "medium": settings.SUMMARY_INPUT_TOKENS_MEDIUM,
+    }.get(summary_type, settings.SUMMARY_INPUT_TOKENS_LONG)
+
+
+def prepare_summary_input(pages: List[str], summary_type: str = "short") -> str:
+    """
+    Everything before the final prompt (blocking; runs in the summary job
+    pool): the extractive pre-filter cuts the document's page texts down to
+    the summary type's token budget, then map-reduce shrinks what is left to
+    one text.
+    """
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    text = "\n\n".join(pages)
+    if not text.strip():
+        raise ValueError("Could not extract text")
+
+    selected, stats = select_sentences(text, input_token_budget(summary_type))
+    if stats["tokens_out"] < stats["tokens_in"]:
+        logger.info(f"Pre-filter kept {stats['tokens_out']}/{stats['tokens_in']} tokens ({summary_type})")
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=100)
+    chunks = splitter.split_text(selected)
+    if not chunks:
+        raise ValueError("Could not extract text")
+    return _run(reduce_chunks(chunks))
 
-    summary = summarizer.invoke({
-        "text": combined_text,
-        "summary_type": summary_type
-    })
 
-    return summary
\ No newline at end of file
+def summarize_pages(pages: List[str], summary_type="short"):
+    """Summarize a document's page texts (blocking; runs in the summary job pool)."""
+    text = prepare_summary_input(pages, summary_type)
+    return _run(get_summarizer().ainvoke({"text": text, "summary_type": summary_type}))
@@ -1,57 +1,46 @@
 # file: app/utils/rag_chatbot.py
-import os
 import re
 from dotenv import load_dotenv
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain_groq import ChatGroq
+
+from app.core.config import settings
+from app.utils.model_registry import get_model_registry
+
+# langchain (and torch behind it) is imported inside the functions that need
+# it, so importing this module does not slow down API startup
 
 # =========================
 # Load environment variables
 # =========================
 load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
-# =========================
-# Model configuration
-# =========================
-EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
-LLM_MODEL_NAME = "openai/gpt-oss-20b"
 
 # =========================
-# Load embeddings (using local model, no API required)
+# Models (shared through the model registry; names set in config
+# as CHATBOT_EMBEDDING_MODEL / CHATBOT_LLM_MODEL)
 # =========================
 def get_embeddings():
     """
-    Initialize local embeddings model.
-    This runs locally and doesn't require HuggingFace API access.
-    The model will be downloaded automatically on first use.
+    The chatbot's local embeddings model, loaded once per process.
+    It must be the model vector_db was built with.
     """
     try:
-        return HuggingFaceEmbeddings(
-            model_name=EMBEDDING_MODEL,
-            encode_kwargs={"normalize_embeddings": True}
-        )
+        return get_model_registry().embeddings("chatbot")
     except Exception as e:
         raise RuntimeError(
-            f"Failed to load embeddings model '{EMBEDDING_MODEL}'. "
+            f"Failed to load embeddings model '{settings.CHATBOT_EMBEDDING_MODEL}'. "
             f"Make sure sentence-transformers is installed. Error: {str(e)}"
         )
 
-# =========================
-# Load LLM
-# =========================
-def get_llm():
-    return ChatGroq(
-        model=LLM_MODEL_NAME,
-        temperature=0.2,
-        api_key=GROQ_API_KEY
-    )
+
+def get_llm(use_case: str = "chatbot"):
+    """Shared LLM client for a use case ("chatbot", "grading", ...)."""
+    return get_model_registry().llm(use_case)
 
 # =========================
 # Load FAISS vector DB
 # =========================
 def load_vector_db(path=None, embeddings=None):
+    from langchain_community.vectorstores import FAISS
+
     if path is None:
         # Use vector_db in backend directory, fallback to chabot_2 if not found
         import os
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import uuid
 from fastapi import UploadFile
@@ -18,3 +19,12 @@ async def save_resource_file(file: UploadFile) -> str:
         f.write(content)
 
     return path
+
+
+def file_sha256(path: str) -> str:
+    """Content hash of a stored file (blocking; run it in a thread from async code)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
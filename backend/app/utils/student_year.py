@@ -0,0 +1,39 @@
+import re
+from datetime import datetime
+from typing import Optional
+
+# Bennett student emails look like s24cseu123@bennett.edu.in: 's' + two-digit admission year
+_ADMISSION_YEAR_RE = re.compile(r"s(\d{2})")
+
+
+def extract_admission_year(email: str) -> int:
+    """
+    Return the full admission year encoded in a student email (s24... -> 2024).
+    Raises ValueError if the pattern is not present.
+    """
+    lower = email.lower()
+    idx = lower.find("@")
+    local = lower if idx == -1 else lower[:idx]
+    m = _ADMISSION_YEAR_RE.search(local)
+    if not m:
+        raise ValueError("Admission year not found in email")
+    return 2000 + int(m.group(1))
+
+
+def student_year_for_admission(admission_year: int, current_year: Optional[int] = None) -> int:
+    """Student year (>= 1) for a cohort admitted in `admission_year`."""
+    current_year = current_year or datetime.utcnow().year
+    return max(current_year - admission_year + 1, 1)
+
+
+def admission_year_filter(student_year: int, current_year: Optional[int] = None):
+    """
+    Mongo filter value on `admission_year` selecting exactly the students that
+    student_year_for_admission() maps to `student_year`. Year 1 also covers
+    admission years in the future, which are clamped to 1.
+    """
+    current_year = current_year or datetime.utcnow().year
+    admission_year = current_year - student_year + 1
+    if student_year <= 1:
+        return {"$gte": admission_year}
+    return admission_year
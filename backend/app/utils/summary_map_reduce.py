@@ -0,0 +1,70 @@
+"""
+Map-reduce summarization.
+
+The document's chunks are packed into groups of at most `group_chars`
+characters; each group is summarized independently (map), then the partial
+summaries are packed and combined level by level (reduce) until one text
+remains, which gets the final summary prompt. Every call at a level runs
+concurrently, bounded by a semaphore, so wall time grows with the depth of
+the tree (log of the document length), not with the page count, and every
+part of the document is read.
+
+The engine only needs async callables taking a text, so it does not depend
+on a particular LLM client.
+"""
+import asyncio
+from typing import Awaitable, Callable, List
+
+Summarize = Callable[[str], Awaitable[str]]
+
+
+def pack(texts: List[str], group_chars: int, separator: str = "\n\n") -> List[str]:
+    """Concatenate consecutive texts into groups of at most group_chars (a longer text stays on its own)."""
+    groups: List[str] = []
+    current: List[str] = []
+    size = 0
+    for text in texts:
+        extra = len(text) + (len(separator) if current else 0)
+        if current and size + extra > group_chars:
+            groups.append(separator.join(current))
+            current, size = [], 0
+            extra = len(text)
+        current.append(text)
+        size += extra
+    if current:
+        groups.append(separator.join(current))
+    return groups
+
+
+async def reduce_to_text(
+    chunks: List[str],
+    map_fn: Summarize,
+    reduce_fn: Summarize,
+    group_chars: int,
+    max_concurrency: int,
+) -> str:
+    """
+    The map and reduce levels: shrink `chunks` (in document order) to one
+    text of at most group_chars (unless a single summary is longer), ready
+    for the final prompt.
+    """
+    if not chunks:
+        raise ValueError("Nothing to summarize")
+    limit = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(fn: Summarize, text: str) -> str:
+        async with limit:
+            return await fn(text)
+
+    level = pack(chunks, group_chars)
+    # A short document needs no map level: it goes straight to the final prompt
+    fn = map_fn
+    while len(level) > 1:
+        summaries = list(await asyncio.gather(*(bounded(fn, text) for text in level)))
+        packed = pack(summaries, group_chars)
+        if len(packed) >= len(level):
+            # Summaries came back too long to pack; merge pairwise so the tree still shrinks
+            packed = ["\n\n".join(summaries[i:i + 2]) for i in range(0, len(summaries), 2)]
+        level, fn = packed, reduce_fn
+    return level[0]
+
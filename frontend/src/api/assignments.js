@@ -33,10 +33,11 @@ export const assignmentsAPI = {
   },
 
   /**
-   * Get list of all assignments
+   * Get a page of assignments ({ items, next_cursor, limit })
+   * @param {Object} params - Optional { limit, cursor }
    */
-  listAssignments: async () => {
-    return apiClient.get('/assignments/');
+  listAssignments: async (params = {}) => {
+    return apiClient.get('/assignments/', { params });
   },
 
   /**
@@ -4,8 +4,11 @@ export const noticesAPI = {
   // Create notice (Faculty only)
   createNotice: (data) => apiClient.post('/notices/', data),
 
-  // Get all notices
-  getAllNotices: () => apiClient.get('/notices/all'),
+  // Get all notices (paginated: { items, next_cursor, limit }; optional category)
+  getAllNotices: (params = {}) => apiClient.get('/notices/all', { params }),
+
+  // Full-text search, best match first (paginated: { items, next_cursor, limit })
+  searchNotices: (q, params = {}) => apiClient.get('/notices/search', { params: { q, ...params } }),
 
   // Get notices by faculty
   getFacultyNotices: (facultyId) => apiClient.get(`/notices/faculty/${facultyId}`),
@@ -17,8 +20,16 @@ export const noticesAPI = {
   getNoticesByCategoryAndYear: (category, year) => 
     apiClient.get(`/notices/category/${category}/year/${year}`),
 
-  // Get student feed
-  getStudentFeed: () => apiClient.get('/notices/student-feed'),
+  // Student feed for the caller's year (paginated: { items, next_cursor, limit }; optional category)
+  getStudentFeed: (params = {}) => apiClient.get('/notices/student-feed', { params }),
+
+  // Live notice events (server-sent events). EventSource cannot send headers,
+  // so the token travels as a query parameter.
+  openNoticeStream: (categories = []) => {
+    const params = new URLSearchParams({ access_token: localStorage.getItem('token') || '' });
+    categories.forEach((c) => params.append('category', c));
+    return new EventSource(`${apiClient.defaults.baseURL}/notices/stream?${params}`);
+  },
 
   // Delete notice (Faculty only)
   deleteNotice: (noticeId) => apiClient.delete(`/notices/${noticeId}`),
@@ -7,13 +7,20 @@ export const resourcesAPI = {
     return apiClient.post('/resources/upload', formData);
   },
 
-  // Get all resources
-  getAllResources: () => apiClient.get('/resources/all'),
+  // Get all resources (paginated: { items, next_cursor, limit })
+  getAllResources: (params = {}) => apiClient.get('/resources/all', { params }),
 
   // Summarize an uploaded resource
   summarizeResource: (resourceId, summaryType = 'short') =>
     apiClient.get(`/resources/${resourceId}/summarize?summary_type=${summaryType}`),
 
+  // Stream an uploaded resource's summary as server-sent events:
+  // `token` ({ text }) as it is written, then `done` or `error` ({ detail })
+  streamSummary: (resourceId, summaryType = 'short') => {
+    const params = new URLSearchParams({ summary_type: summaryType });
+    return new EventSource(`${apiClient.defaults.baseURL}/resources/${resourceId}/summarize/stream?${params}`);
+  },
+
   // Summarize local file (student upload)
   summarizeLocalFile: (file, summaryType = 'short') => {
     const data = new FormData();
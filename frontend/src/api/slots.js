@@ -4,21 +4,36 @@ export const slotsAPI = {
   // Create slot (Faculty only)
   createSlot: (data) => apiClient.post('/slots/', data),
 
+  // Create a weekly series of slots (Faculty only): { created, skipped }
+  createRecurringSlots: (rule) => apiClient.post('/slots/recurring', rule),
+
   // Get slot by ID
   getSlot: (slotId) => apiClient.get(`/slots/${slotId}`),
 
   // Get my slots (Faculty only)
   getMySlots: () => apiClient.get('/slots/me'),
 
-  // Get slots by faculty
-  getSlotsByFaculty: (facultyId) => apiClient.get(`/slots/faculty/${facultyId}`),
+  // Get slots by faculty (paginated: { items, next_cursor, limit })
+  getSlotsByFaculty: (facultyId, params = {}) =>
+    apiClient.get(`/slots/faculty/${facultyId}`, { params }),
+
+  // Get available slots (paginated: { items, next_cursor, limit })
+  getAvailableSlots: (params = {}) => apiClient.get('/slots/available', { params }),
 
-  // Get available slots
-  getAvailableSlots: () => apiClient.get('/slots/available'),
+  // My bookings (Student only; paginated: { items, next_cursor, limit })
+  getMyBookings: (params = {}) => apiClient.get('/slots/my-bookings', { params }),
 
   // Book slot (Student only)
   bookSlot: (slotId) => apiClient.post(`/slots/${slotId}/book`),
 
+  // Waitlist for a full slot (Student only); the first waiter is booked when a seat frees up
+  joinWaitlist: (slotId) => apiClient.post(`/slots/${slotId}/waitlist`),
+  getWaitlistPosition: (slotId) => apiClient.get(`/slots/${slotId}/waitlist`),
+  leaveWaitlist: (slotId) => apiClient.delete(`/slots/${slotId}/waitlist`),
+
+  // .ics subscription URLs for calendar apps ({ token, faculty_feed | bookings_feed })
+  getCalendarLinks: () => apiClient.get('/slots/calendar/links'),
+
   // Cancel booking (Student only)
   cancelBooking: (slotId) => apiClient.post(`/slots/${slotId}/cancel`),
 
@@ -0,0 +1,16 @@
+import React from 'react';
+
+// Shown under a cursor-paginated list while the last page had a next_cursor
+const LoadMoreButton = ({ onClick, loading }) => (
+  <div className="flex justify-center mt-6">
+    <button
+      onClick={onClick}
+      disabled={loading}
+      className="bg-white border border-gray-300 text-gray-700 hover:bg-gray-50 px-6 py-2 rounded-md font-medium disabled:opacity-50"
+    >
+      {loading ? 'Loading...' : 'Load more'}
+    </button>
+  </div>
+);
+
+export default LoadMoreButton;
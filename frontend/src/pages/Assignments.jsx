@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import { assignmentsAPI } from '../api/assignments';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const Assignments = () => {
   const { user, isFaculty, isStudent } = useAuth();
@@ -9,6 +10,8 @@ const Assignments = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [assignments, setAssignments] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchAssignments();
@@ -18,7 +21,8 @@ const Assignments = () => {
     try {
       setLoading(true);
       const res = await assignmentsAPI.listAssignments();
-      setAssignments(res.data.assignments || []);
+      setAssignments(res.data.items || []);
+      setNextCursor(res.data.next_cursor || null);
     } catch (err) {
       setError(err.response?.data?.detail || 'Failed to load assignments');
     } finally {
@@ -26,6 +30,20 @@ const Assignments = () => {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const res = await assignmentsAPI.listAssignments({ cursor: nextCursor });
+      setAssignments((prev) => [...prev, ...(res.data.items || [])]);
+      setNextCursor(res.data.next_cursor || null);
+    } catch (err) {
+      setError(err.response?.data?.detail || 'Failed to load assignments');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const formatDate = (dateString) => {
     if (!dateString) return 'N/A';
     return new Date(dateString).toLocaleString();
@@ -143,6 +161,7 @@ const Assignments = () => {
             ))}
           </div>
         )}
+        {nextCursor && <LoadMoreButton onClick={loadMore} loading={loadingMore} />}
       </div>
     </div>
   );
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { noticesAPI } from '../api/notices';
 import { useAuth } from '../context/AuthContext';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const NOTICE_CATEGORIES = {
   school_of_cset: 'School of CSET',
@@ -20,6 +21,8 @@ const Notices = () => {
   const [error, setError] = useState('');
   const [showCreateModal, setShowCreateModal] = useState(false);
   const [filterCategory, setFilterCategory] = useState('all');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [formData, setFormData] = useState({
     title: '',
     content: '',
@@ -31,22 +34,37 @@ const Notices = () => {
     fetchNotices();
   }, [filterCategory]);
 
+  // New and deleted notices are pushed by the server instead of re-fetching
+  useEffect(() => {
+    const categories = filterCategory !== 'all' ? [filterCategory] : [];
+    const stream = noticesAPI.openNoticeStream(categories);
+    stream.addEventListener('notice_created', (e) => {
+      const notice = JSON.parse(e.data);
+      setNotices((prev) => (prev.some((n) => n.id === notice.id) ? prev : [notice, ...prev]));
+    });
+    stream.addEventListener('notice_deleted', (e) => {
+      const notice = JSON.parse(e.data);
+      setNotices((prev) => prev.filter((n) => n.id !== notice.id));
+    });
+    // The server could not resume from our last event; reload the list
+    stream.addEventListener('reset', () => fetchNotices());
+    return () => stream.close();
+  }, [filterCategory]);
+
+  // One page of the feed; the category filter is applied by the server
+  const fetchPage = (cursor) => {
+    const params = {};
+    if (filterCategory !== 'all') params.category = filterCategory;
+    if (cursor) params.cursor = cursor;
+    return isStudent ? noticesAPI.getStudentFeed(params) : noticesAPI.getAllNotices(params);
+  };
+
   const fetchNotices = async () => {
     try {
       setLoading(true);
-      let response;
-      if (isStudent) {
-        response = await noticesAPI.getStudentFeed();
-      } else {
-        response = await noticesAPI.getAllNotices();
-      }
-      let fetchedNotices = response.data;
-      
-      if (filterCategory !== 'all') {
-        fetchedNotices = fetchedNotices.filter(n => n.category === filterCategory);
-      }
-      
-      setNotices(fetchedNotices);
+      const response = await fetchPage(null);
+      setNotices(response.data.items || []);
+      setNextCursor(response.data.next_cursor || null);
     } catch (err) {
       setError('Failed to load notices');
       console.error(err);
@@ -55,6 +73,25 @@ const Notices = () => {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const response = await fetchPage(nextCursor);
+      // Skip any notice already shown (e.g. pushed over the stream)
+      setNotices((prev) => [
+        ...prev,
+        ...(response.data.items || []).filter((n) => !prev.some((p) => p.id === n.id)),
+      ]);
+      setNextCursor(response.data.next_cursor || null);
+    } catch (err) {
+      setError('Failed to load notices');
+      console.error(err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleCreateNotice = async (e) => {
     e.preventDefault();
     try {
@@ -179,6 +216,7 @@ const Notices = () => {
           ))
         )}
       </div>
+      {nextCursor && <LoadMoreButton onClick={loadMore} loading={loadingMore} />}
 
       {/* Create Notice Modal */}
       {showCreateModal && (
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { resourcesAPI } from '../api/resources';
 import { useAuth } from '../context/AuthContext';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const Resources = () => {
   const { isStudent } = useAuth();
@@ -9,6 +10,8 @@ const Resources = () => {
   const [error, setError] = useState('');
   const [summarizing, setSummarizing] = useState({});
   const [summaries, setSummaries] = useState({});
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchResources();
@@ -18,7 +21,8 @@ const Resources = () => {
     try {
       setLoading(true);
       const response = await resourcesAPI.getAllResources();
-      setResources(response.data || []);
+      setResources(response.data?.items || []);
+      setNextCursor(response.data?.next_cursor || null);
     } catch (err) {
       setError('Failed to load resources');
       console.error(err);
@@ -27,20 +31,44 @@ const Resources = () => {
     }
   };
 
-  const handleSummarize = async (resourceId, summaryType = 'short') => {
-    if (summarizing[resourceId]) return;
-
-    setSummarizing({ ...summarizing, [resourceId]: true });
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
     try {
-      const response = await resourcesAPI.summarizeResource(resourceId, summaryType);
-      setSummaries({ ...summaries, [resourceId]: response.data.summary });
+      const response = await resourcesAPI.getAllResources({ cursor: nextCursor });
+      setResources((prev) => [...prev, ...(response.data?.items || [])]);
+      setNextCursor(response.data?.next_cursor || null);
     } catch (err) {
-      setError(err.response?.data?.detail || 'Failed to generate summary');
+      setError('Failed to load resources');
+      console.error(err);
     } finally {
-      setSummarizing({ ...summarizing, [resourceId]: false });
+      setLoadingMore(false);
     }
   };
 
+  const handleSummarize = (resourceId, summaryType = 'short') => {
+    if (summarizing[resourceId]) return;
+
+    setSummarizing((prev) => ({ ...prev, [resourceId]: true }));
+    setSummaries((prev) => ({ ...prev, [resourceId]: '' }));
+    // Tokens are shown as the model writes them; a stored summary arrives at once
+    const stream = resourcesAPI.streamSummary(resourceId, summaryType);
+    const finish = () => {
+      stream.close();
+      setSummarizing((prev) => ({ ...prev, [resourceId]: false }));
+    };
+    stream.addEventListener('token', (e) => {
+      const { text } = JSON.parse(e.data);
+      setSummaries((prev) => ({ ...prev, [resourceId]: (prev[resourceId] || '') + text }));
+    });
+    stream.addEventListener('done', finish);
+    // Sent by the server with a detail, or fired by the browser when the connection fails
+    stream.addEventListener('error', (e) => {
+      setError((e.data && JSON.parse(e.data).detail) || 'Failed to generate summary');
+      finish();
+    });
+  };
+
   const formatDate = (dateString) => {
     return new Date(dateString).toLocaleDateString();
   };
@@ -137,6 +165,7 @@ const Resources = () => {
           ))}
         </div>
       )}
+      {nextCursor && <LoadMoreButton onClick={loadMore} loading={loadingMore} />}
     </div>
   );
 };
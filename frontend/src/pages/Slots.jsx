@@ -1,13 +1,17 @@
 import React, { useState, useEffect } from 'react';
 import { slotsAPI } from '../api/slots';
 import { useAuth } from '../context/AuthContext';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const Slots = () => {
   const { isStudent } = useAuth();
   const [slots, setSlots] = useState([]);
+  const [myBookedSlotIds, setMyBookedSlotIds] = useState(new Set());
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchSlots();
@@ -17,8 +21,22 @@ const Slots = () => {
     try {
       setLoading(true);
       setError('');
-      const response = await slotsAPI.getAvailableSlots();
-      setSlots(response.data || []);
+      // Full slots too, so students can join their waitlist
+      const response = await slotsAPI.getAvailableSlots({ include_full: true });
+      // Paginated: { items, next_cursor, limit }
+      setSlots(response.data?.items || []);
+      setNextCursor(response.data?.next_cursor || null);
+      if (isStudent) {
+        // Every upcoming booking, so "Cancel Booking" shows on later pages too
+        const bookedIds = new Set();
+        let cursor = null;
+        do {
+          const bookings = await slotsAPI.getMyBookings({ limit: 100, ...(cursor && { cursor }) });
+          (bookings.data?.items || []).forEach((b) => bookedIds.add(b.slot_id));
+          cursor = bookings.data?.next_cursor;
+        } while (cursor);
+        setMyBookedSlotIds(bookedIds);
+      }
     } catch (err) {
       const errorMessage = err.response?.data?.detail || err.message || 'Failed to load slots';
       setError(errorMessage);
@@ -28,6 +46,20 @@ const Slots = () => {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const response = await slotsAPI.getAvailableSlots({ include_full: true, cursor: nextCursor });
+      setSlots((prev) => [...prev, ...(response.data?.items || [])]);
+      setNextCursor(response.data?.next_cursor || null);
+    } catch (err) {
+      setError(err.response?.data?.detail || 'Failed to load slots');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleBookSlot = async (slotId) => {
     try {
       await slotsAPI.bookSlot(slotId);
@@ -40,6 +72,19 @@ const Slots = () => {
     }
   };
 
+  const handleJoinWaitlist = async (slotId) => {
+    try {
+      const response = await slotsAPI.joinWaitlist(slotId);
+      const { position } = response.data;
+      setSuccess(position ? `Added to waitlist (position ${position}). We'll email you if a seat opens up.` : response.data.message);
+      setTimeout(() => setSuccess(''), 3000);
+      fetchSlots();
+    } catch (err) {
+      setError(err.response?.data?.detail || 'Failed to join waitlist');
+      setTimeout(() => setError(''), 3000);
+    }
+  };
+
   const handleCancelBooking = async (slotId) => {
     if (!window.confirm('Are you sure you want to cancel this booking?')) return;
     
@@ -58,12 +103,7 @@ const Slots = () => {
     return new Date(dateString).toLocaleString();
   };
 
-  const isBookedByMe = (slot) => {
-    // Check if current user is in booked_by list
-    // Note: This requires checking user ID, which we'd need from auth context
-    // For now, we'll show all available slots
-    return false;
-  };
+  const isBookedByMe = (slot) => myBookedSlotIds.has(slot.id);
 
   if (loading) {
     return (
@@ -96,8 +136,7 @@ const Slots = () => {
           </div>
         ) : (
           slots.map((slot) => {
-            const isAvailable = slot.booked_count < slot.max_students;
-            const isFull = slot.booked_count >= slot.max_students;
+            const isFull = slot.is_full;
 
             return (
               <div
@@ -205,12 +244,19 @@ const Slots = () => {
                 </div>
                 {isStudent && (
                   <div>
-                    {isFull ? (
+                    {isBookedByMe(slot) ? (
+                      <button
+                        onClick={() => handleCancelBooking(slot.id)}
+                        className="w-full bg-red-600 hover:bg-red-700 text-white px-4 py-2 rounded-md font-medium"
+                      >
+                        Cancel Booking
+                      </button>
+                    ) : isFull ? (
                       <button
-                        disabled
-                        className="w-full bg-gray-300 text-gray-500 px-4 py-2 rounded-md cursor-not-allowed"
+                        onClick={() => handleJoinWaitlist(slot.id)}
+                        className="w-full bg-gray-600 hover:bg-gray-700 text-white px-4 py-2 rounded-md font-medium"
                       >
-                        Full
+                        Full: Join Waitlist
                       </button>
                     ) : (
                       <button
@@ -227,6 +273,7 @@ const Slots = () => {
           })
         )}
       </div>
+      {nextCursor && <LoadMoreButton onClick={loadMore} loading={loadingMore} />}
     </div>
   );
 };